@@ -0,0 +1,15 @@
+"""
+Discord Puppy Benchmarks - How Fast Is This Puppy, Really? 🐕⏱️
+
+Offline benchmarks against synthetic data - no Discord, no model calls.
+
+Modules:
+- synthetic.py: Realistic synthetic guilds, users and messages at any scale
+- fakes.py: Fake Discord users, messages, channels and guilds
+- bench_memory.py: Times the memory layer and every memory tool query
+- gateway_replay.py: Replays a message stream through the bot's reply path
+
+Run from the repo root:
+    python -m benchmarks.bench_memory --scale 10k --output bench-10k.json
+    python -m benchmarks.gateway_replay --rate 20 --speed 10 --output replay.json
+"""
@@ -0,0 +1,302 @@
+"""
+Memory Benchmarks - Timing the Brain at 10k, 1M and 10M Messages 🐕⏱️🧠
+
+Builds a synthetic brain per scale and times:
+- init_database on a brand new file and on the populated brain (restart)
+- ensure_user_exists for known and brand new users
+- index_message (hash + insert + commit, one message at a time)
+- index_channel_history against fake channels, cold and resumed
+- every memory tool query (benchmarks/scenarios.py)
+
+Per-operation latencies are reported as count / mean / p50 / p95 / p99 /
+max in milliseconds, plus throughput where it means something.
+
+Results are JSON on stdout (progress goes to stderr), or --output FILE:
+    python -m benchmarks.bench_memory --scale 10k
+    python -m benchmarks.bench_memory --scale 1m --scale 10m --reuse --output bench.json
+
+Big brains take a while to seed - --reuse keeps them in --db-dir and
+skips seeding on the next run.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from benchmarks.fakes import FakeChannel, FakeGuild, FakeMessage, FakeUser, fake_guild
+from benchmarks.scenarios import collect_memory_tools, tool_scenarios
+from benchmarks.synthetic import (
+    GUILD_ID_BASE,
+    SCALES,
+    USER_ID_BASE,
+    WorldSpec,
+    seed_world,
+    snowflake,
+    synthetic_content,
+)
+from discord_puppy.memory.database import (
+    ConnectionConfig,
+    ConnectionManager,
+    close_connection_manager,
+    configure_connection_manager,
+    ensure_user_exists,
+    init_database,
+)
+from discord_puppy.memory.message_indexer import (
+    compute_message_hash,
+    index_channel_history,
+    index_message,
+)
+
+
+@dataclass
+class Timing:
+    """Latency samples for one benchmarked operation."""
+    name: str
+    samples: list[float] = field(default_factory=list)  # Seconds per operation
+    items: int = 0                                      # Rows handled, for throughput
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self) -> dict:
+        total = sum(self.samples)
+        result: dict[str, Any] = {"name": self.name, "count": len(self.samples), "total_s": total}
+        if self.samples:
+            result.update(
+                mean_ms=total / len(self.samples) * 1000,
+                p50_ms=self.percentile(0.50) * 1000,
+                p95_ms=self.percentile(0.95) * 1000,
+                p99_ms=self.percentile(0.99) * 1000,
+                max_ms=max(self.samples) * 1000,
+            )
+        if self.items and total:
+            result.update(items=self.items, items_per_s=self.items / total)
+        return result
+
+
+async def timed(name: str, run: Callable[[], Awaitable[Any]], repeat: int = 1, warmup: int = 0) -> Timing:
+    """Time `repeat` sequential calls of run() after `warmup` untimed ones."""
+    timing = Timing(name)
+    for _ in range(warmup):
+        await run()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timing.samples.append(time.perf_counter() - started)
+    return timing
+
+
+def log(text: str) -> None:
+    print(text, file=sys.stderr, flush=True)
+
+
+async def bench_users(manager: ConnectionManager, spec: WorldSpec, samples: int) -> list[Timing]:
+    rng = random.Random(spec.seed + 10)
+
+    async def known() -> None:
+        i = rng.randrange(spec.users)
+        async with manager.writer() as conn:
+            await ensure_user_exists(conn, str(USER_ID_BASE + i), f"user{i}", f"User Number {i}")
+
+    # Past every user so far - earlier --reuse runs added some
+    async with manager.reader() as conn:
+        cursor = await conn.execute("SELECT COUNT(*) FROM user_notes")
+        first_new = (await cursor.fetchone())[0]
+    fresh = iter(range(first_new, first_new + samples + 1))
+
+    async def new() -> None:
+        i = next(fresh)
+        async with manager.writer() as conn:
+            await ensure_user_exists(conn, str(USER_ID_BASE + i), f"user{i}", f"User Number {i}", "benchmarking")
+
+    return [
+        await timed("ensure_user_exists: known user", known, repeat=samples, warmup=1),
+        await timed("ensure_user_exists: new user", new, repeat=samples, warmup=1),
+    ]
+
+
+async def bench_index_message(manager: ConnectionManager, spec: WorldSpec, samples: int) -> Timing:
+    rng = random.Random(spec.seed + 11)
+    guild = FakeGuild(0, "bench")
+    channel = FakeChannel(int(spec.channel_ids[0]), "bench", guild)
+    when = datetime.now(timezone.utc)
+    counter = iter(range(samples + 1))
+
+    async def one() -> None:
+        i = rng.randrange(spec.users)
+        message = FakeMessage(
+            id=snowflake(when, next(counter)),
+            content=synthetic_content(rng),
+            author=FakeUser(id=USER_ID_BASE + i, name=f"user{i}", display_name=f"User Number {i}"),
+            channel=channel,
+            created_at=when,
+        )
+        async with manager.writer() as conn:
+            await index_message(conn, message, compute_message_hash(message))
+
+    return await timed("index_message", one, repeat=samples, warmup=1)
+
+
+async def bench_channel_history(spec: WorldSpec, messages_per_channel: int, channels: int) -> list[Timing]:
+    # A guild no earlier --reuse run has seen, so "cold" really is cold
+    guild_id = GUILD_ID_BASE + 1000 + time.time_ns() // 1000 % 1_000_000
+    guild = fake_guild(spec, messages_per_channel, channels=channels, guild_id=guild_id)
+    results = []
+    for label in ("cold", "resumed"):
+        timing = Timing(f"index_channel_history: {label}")
+        for channel in guild.text_channels:
+            started = time.perf_counter()
+            stats = await index_channel_history(channel, limit=None, days_back=30)
+            timing.samples.append(time.perf_counter() - started)
+            timing.items += stats["total_processed"]
+        results.append(timing)
+    return results
+
+
+async def bench_tools(spec: WorldSpec, repeat: int) -> list[Timing]:
+    tools = collect_memory_tools()
+    results = []
+    for name, run in tool_scenarios(tools, channel_id=spec.channel_ids[0]):
+        async def checked(run=run, name=name) -> None:
+            result = await run()
+            if isinstance(result, dict) and result.get("success") is False:
+                raise RuntimeError(f"{name}: {result.get('error')}")
+        results.append(await timed(name, checked, repeat=repeat, warmup=1))
+    return results
+
+
+async def run_scale(
+    scale: str,
+    db_dir: Path,
+    reuse: bool = False,
+    samples: int = 200,
+    tool_repeat: int = 20,
+    history_messages: int = 2000,
+    history_channels: int = 4,
+) -> dict:
+    """Benchmark one scale.
+
+    Args:
+        scale: Named scale (see synthetic.SCALES)
+        db_dir: Where the brain file lives
+        reuse: Keep an existing brain for this scale instead of reseeding
+        samples: Calls per single-row operation
+        tool_repeat: Calls per tool scenario
+        history_messages: Messages per fake channel
+        history_channels: Fake channels to backfill
+
+    Returns:
+        JSON-ready dict for this scale
+    """
+    spec = WorldSpec.for_scale(scale)
+    db_path = db_dir / f"brain-{scale}.db"
+    reused = reuse and db_path.exists()
+    if not reused:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    manager = await configure_connection_manager(ConnectionConfig(db_path=db_path))
+    results: list[Timing] = []
+    seeded: Optional[dict] = None
+    try:
+        if not reused:
+            results.append(await timed("init_database: new brain", init_database))
+            log(f"🏗️  Seeding {scale}: {spec.messages:,} messages, {spec.users:,} users")
+            seeded = await seed_world(
+                manager, spec,
+                progress=lambda what, done, total: log(f"   {what}: {done:,}/{total:,}"),
+            )
+        results.append(await timed("init_database: existing brain", init_database, repeat=3))
+
+        log(f"⏱️  {scale}: users and single messages")
+        results.extend(await bench_users(manager, spec, samples))
+        results.append(await bench_index_message(manager, spec, samples))
+
+        log(f"⏱️  {scale}: channel history")
+        results.extend(await bench_channel_history(spec, history_messages, history_channels))
+
+        log(f"⏱️  {scale}: memory tools")
+        results.extend(await bench_tools(spec, tool_repeat))
+    finally:
+        await close_connection_manager()
+
+    return {
+        "scale": scale,
+        "spec": spec.as_dict(),
+        "db_path": str(db_path),
+        "db_bytes": db_path.stat().st_size,
+        "reused_brain": reused,
+        "seed": seeded,
+        "results": [timing.as_dict() for timing in results],
+    }
+
+
+async def run_benchmarks(scales: list[str], db_dir: Path, **options) -> dict:
+    """Benchmark every requested scale, smallest first."""
+    runs = []
+    for scale in sorted(scales, key=SCALES.get):
+        runs.append(await run_scale(scale, db_dir, **options))
+    return {
+        "suite": "memory",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "runs": runs,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the puppy's memory layer.")
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES, key=SCALES.get),
+                        help="Message rows to seed (repeatable, default 10k)")
+    parser.add_argument("--db-dir", type=Path, help="Where to keep the brains (temp dir if omitted)")
+    parser.add_argument("--reuse", action="store_true", help="Reuse brains already in --db-dir")
+    parser.add_argument("--samples", type=int, default=200, help="Calls per single-row operation")
+    parser.add_argument("--tool-repeat", type=int, default=20, help="Calls per tool scenario")
+    parser.add_argument("--history-messages", type=int, default=2000, help="Messages per fake channel")
+    parser.add_argument("--history-channels", type=int, default=4, help="Fake channels to backfill")
+    parser.add_argument("--output", type=Path, help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    db_dir = args.db_dir or Path(tempfile.mkdtemp(prefix="puppy-bench-"))
+    db_dir.mkdir(parents=True, exist_ok=True)
+
+    # The brain prints as it works - keep stdout for the JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        report = asyncio.run(run_benchmarks(
+            args.scale or ["10k"],
+            db_dir,
+            reuse=args.reuse,
+            samples=args.samples,
+            tool_repeat=args.tool_repeat,
+            history_messages=args.history_messages,
+            history_channels=args.history_channels,
+        ))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+        log(f"📊 Results written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Fake Discord - Just Enough discord.py to Fool the Puppy 🐕🎭
+
+Stand-ins for the discord.py objects the puppy touches: a client,
+users, messages, text channels (with an async history()) and guilds.
+History behaves like discord.py's: `after` may be a datetime or anything
+with an .id, results are capped by `limit`, and fetching pauses
+page_latency seconds every 100 messages the way Discord's paged API would.
+
+Sending (channel.send / message.reply / message.edit) takes send_latency
+seconds. New messages are echoed back through the channel's `gateway`
+callback, like the real gateway - so the bot sees its own replies.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from benchmarks.synthetic import (
+    CHANNEL_ID_BASE,
+    GUILD_ID_BASE,
+    USER_ID_BASE,
+    WorldSpec,
+    snowflake,
+    synthetic_content,
+    zipf_weights,
+)
+
+HISTORY_PAGE = 100  # Messages per Discord history request
+
+
+@dataclass(eq=False)
+class FakeUser:
+    """A Discord user (or member)."""
+    id: int
+    name: str
+    display_name: str
+    bot: bool = False
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def mentioned_in(self, message: "FakeMessage") -> bool:
+        return any(user.id == self.id for user in message.mentions)
+
+
+@dataclass(eq=False)
+class FakeMessage:
+    """A Discord message."""
+    id: int
+    content: str
+    author: FakeUser
+    channel: "FakeChannel"
+    created_at: datetime
+    mentions: list[FakeUser] = field(default_factory=list)
+    reference: Optional[SimpleNamespace] = None
+
+    @property
+    def guild(self) -> Optional["FakeGuild"]:
+        return self.channel.guild
+
+    async def reply(self, content: str) -> "FakeMessage":
+        return await self.channel.send(content, reference=self)
+
+    async def edit(self, content: str) -> "FakeMessage":
+        await asyncio.sleep(self.channel.send_latency)
+        self.content = content
+        self.channel.edited += 1
+        return self
+
+
+class FakeChannel:
+    """A text channel with a fixed message history."""
+
+    def __init__(
+        self,
+        channel_id: int,
+        name: str,
+        guild: Optional["FakeGuild"] = None,
+        page_latency: float = 0.0,
+        send_latency: float = 0.0,
+    ):
+        self.id = channel_id
+        self.name = name
+        self.guild = guild
+        self.page_latency = page_latency
+        self.send_latency = send_latency
+        self.messages: list[FakeMessage] = []  # Oldest first
+
+        # Who sends, and where sent messages are echoed (see FakeClient)
+        self.me: Optional[FakeUser] = None
+        self.gateway: Optional[Callable[[FakeMessage], Awaitable[None]]] = None
+        self.sent = 0
+        self.edited = 0
+
+    async def send(self, content: str, reference: Optional[FakeMessage] = None) -> FakeMessage:
+        await asyncio.sleep(self.send_latency)
+        now = datetime.now(timezone.utc)
+        message = FakeMessage(
+            id=snowflake(now, self.sent),
+            content=content,
+            author=self.me or FakeUser(id=1, name="discord-puppy", display_name="Discord Puppy", bot=True),
+            channel=self,
+            created_at=now,
+        )
+        if reference is not None:
+            message.reference = SimpleNamespace(
+                resolved=reference, message_id=reference.id, channel_id=self.id,
+            )
+        self.sent += 1
+        self.messages.append(message)
+        if self.gateway is not None:
+            asyncio.create_task(self.gateway(message))
+        return message
+
+    def permissions_for(self, member) -> SimpleNamespace:
+        return SimpleNamespace(read_message_history=True, send_messages=True)
+
+    async def history(
+        self,
+        limit: Optional[int] = 100,
+        after=None,
+        before=None,
+        oldest_first: Optional[bool] = None,
+    ) -> AsyncIterator[FakeMessage]:
+        after_id = _snowflake_of(after, default=0)
+        before_id = _snowflake_of(before, default=None)
+        if oldest_first is None:
+            oldest_first = after is not None
+
+        found = [
+            message for message in self.messages
+            if message.id > after_id and (before_id is None or message.id < before_id)
+        ]
+        if not oldest_first:
+            found.reverse()
+        if limit is not None:
+            found = found[:limit]
+
+        for i, message in enumerate(found):
+            if i % HISTORY_PAGE == 0:
+                await asyncio.sleep(self.page_latency)
+            yield message
+
+
+class FakeGuild:
+    """A guild with some text channels."""
+
+    def __init__(self, guild_id: int, name: str):
+        self.id = guild_id
+        self.name = name
+        self.me = FakeUser(id=1, name="discord-puppy", display_name="Discord Puppy", bot=True)
+        self.text_channels: list[FakeChannel] = []
+
+
+class FakeClient:
+    """A logged-in client: who we are and which guilds we're in.
+
+    Channels added with add_channel() send as the client's user and echo
+    what they send to on_message.
+    """
+
+    def __init__(self, on_message: Optional[Callable[[FakeMessage], Awaitable[None]]] = None):
+        self.user = FakeUser(id=1, name="discord-puppy", display_name="Discord Puppy", bot=True)
+        self.guilds: list[FakeGuild] = []
+        self.on_message = on_message
+
+    def add_channel(self, channel: FakeChannel) -> FakeChannel:
+        channel.me = self.user
+        channel.gateway = self.on_message
+        guild = channel.guild
+        if guild is not None and guild not in self.guilds:
+            guild.me = self.user
+            self.guilds.append(guild)
+        if guild is not None and channel not in guild.text_channels:
+            guild.text_channels.append(channel)
+        return channel
+
+
+def _snowflake_of(value, default):
+    if value is None:
+        return default
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)  # discord.py treats naive as UTC
+        return snowflake(value)
+    return value.id
+
+
+def fake_guild(
+    spec: WorldSpec,
+    messages_per_channel: int,
+    channels: int = 4,
+    end: Optional[datetime] = None,
+    span: timedelta = timedelta(days=7),
+    page_latency: float = 0.0,
+    guild_id: int = GUILD_ID_BASE + 999,
+) -> FakeGuild:
+    """A guild whose channels have synthetic recent history.
+
+    Authors are drawn from the spec's users (same IDs as a seeded world),
+    and about 5% of messages come from a bot.
+
+    Args:
+        spec: World the authors belong to
+        messages_per_channel: History length of each channel
+        channels: Number of text channels
+        end: Newest message time (now if None)
+        span: How far back history goes from end
+        page_latency: Seconds per 100-message history page
+        guild_id: Guild ID (channel IDs are derived from it)
+
+    Returns:
+        FakeGuild with populated channels
+    """
+    rng = random.Random(spec.seed + 3)
+    end = end or datetime.now(timezone.utc)
+    start = end - span
+    user_weights = zipf_weights(spec.users)
+    bot = FakeUser(id=2, name="other-bot", display_name="Other Bot", bot=True)
+    users: dict[int, FakeUser] = {}
+
+    guild = FakeGuild(guild_id, "benchmark guild")
+    for c in range(channels):
+        channel_id = CHANNEL_ID_BASE + (guild_id - GUILD_ID_BASE) * 1000 + c
+        channel = FakeChannel(channel_id, f"bench-{c}", guild, page_latency)
+        step = span / max(1, messages_per_channel)
+        for i in range(messages_per_channel):
+            when = start + step * i
+            if rng.random() < 0.05:
+                author = bot
+            else:
+                index = rng.choices(range(spec.users), cum_weights=user_weights)[0]
+                author = users.setdefault(index, FakeUser(
+                    id=USER_ID_BASE + index, name=f"user{index}", display_name=f"User Number {index}",
+                ))
+            channel.messages.append(FakeMessage(
+                id=snowflake(when, c * messages_per_channel + i),
+                content=synthetic_content(rng),
+                author=author,
+                channel=channel,
+                created_at=when,
+            ))
+        guild.text_channels.append(channel)
+    return guild
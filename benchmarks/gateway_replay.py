@@ -0,0 +1,553 @@
+"""
+Gateway Replay - Load-Testing the Puppy Without Discord 🐕📼
+
+Replays a message stream through the bot's real on_message,
+HeartbeatEngine, ResponseExecutor and handle_should_respond, with a fake
+client and channels standing in for Discord and a stub agent standing in
+for the model. Everything else is real, including the write-behind
+ingestion into a (temporary) brain, the prompt builder and the user
+memory cache.
+
+Time runs N× faster than the recording (--speed). Stream gaps, the
+heartbeat interval, executor deadlines, agent latency and send latency
+are all divided by N. Latencies are reported in stream time (wall
+seconds × N). Ingestion throughput is reported per wall second, because
+the brain doesn't get faster.
+
+Reported:
+- gateway: messages replayed, on_message cost, replay lag
+- ingestion: rows written per second, batches, drops
+- queue depth (sampled): heartbeat pending, executor queue, in flight,
+  ingestion backlog
+- replies: latency percentiles (arrival -> reply sent) by kind,
+  mentions left unanswered
+- drops: full pending queues, stale or evicted executor jobs, ingestion
+- outbound: send-queue latency by kind, merged/edited status updates,
+  time spent waiting for rate limit budget (--status-updates N makes
+  the stub agent post N status updates per run)
+
+Streams are synthetic (Poisson arrivals, Zipf-skewed channels and users)
+or recorded JSONL, one message per line:
+    {"t": 12.5, "channel_id": 1, "author_id": 42, "author_name": "dave",
+     "content": "hi", "mention": false, "bot": false}
+
+    python -m benchmarks.gateway_replay --rate 20 --duration 300 --speed 10
+    python -m benchmarks.gateway_replay --stream recorded.jsonl --agent-latency 4 --output replay.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import discord_puppy.__main__ as bot
+from benchmarks.bench_memory import Timing, log
+from benchmarks.fakes import FakeChannel, FakeClient, FakeGuild, FakeMessage, FakeUser
+from benchmarks.synthetic import (
+    CHANNEL_ID_BASE,
+    GUILD_ID_BASE,
+    USER_ID_BASE,
+    VOCABULARY,
+    snowflake,
+    zipf_weights,
+)
+from discord_puppy.agents.agent_pool import AgentPool, AgentPoolConfig
+from discord_puppy.heartbeat import HeartbeatConfig, HeartbeatEngine, PendingMessage
+from discord_puppy.logging_setup import LoggingConfig, setup_logging
+from discord_puppy.memory.database import (
+    ConnectionConfig,
+    close_connection_manager,
+    configure_connection_manager,
+    init_database,
+)
+from discord_puppy.outbound import OutboundConfig, OutboundScheduler, set_outbound_scheduler
+from discord_puppy.response_executor import ExecutorConfig, ResponseExecutor
+from discord_puppy.tools.discord_send import post_status
+
+
+@dataclass
+class StreamEvent:
+    """One message in a replayed stream."""
+    t: float                # Seconds since the stream started
+    channel_id: int
+    author_id: int
+    author_name: str
+    content: str
+    mention: bool = False   # Pings the puppy
+    bot: bool = False       # Sent by some other bot
+
+
+def load_stream(path: Path) -> list[StreamEvent]:
+    """Read a recorded JSONL stream, sorted by time."""
+    with path.open() as f:
+        events = [StreamEvent(**json.loads(line)) for line in f if line.strip()]
+    return sorted(events, key=lambda event: event.t)
+
+
+def save_stream(path: Path, events: list[StreamEvent]) -> None:
+    """Write a stream as JSONL (replayable with --stream)."""
+    with path.open("w") as f:
+        for event in events:
+            f.write(json.dumps(asdict(event)) + "\n")
+
+
+def synthetic_stream(
+    rate: float,
+    duration: float,
+    channels: int = 20,
+    users: int = 500,
+    mention_rate: float = 0.05,
+    bot_rate: float = 0.02,
+    seed: int = 42,
+) -> list[StreamEvent]:
+    """Poisson arrivals spread over Zipf-skewed channels and users.
+
+    Args:
+        rate: Average messages per (stream) second
+        duration: Stream length in seconds
+        channels: Number of channels
+        users: Number of distinct authors
+        mention_rate: Fraction of messages that ping the puppy
+        bot_rate: Fraction of messages from other bots
+        seed: RNG seed
+
+    Returns:
+        Events in time order
+    """
+    rng = random.Random(seed)
+    channel_weights = zipf_weights(channels, exponent=0.8)
+    user_weights = zipf_weights(users)
+    events = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        user = rng.choices(range(users), cum_weights=user_weights)[0]
+        events.append(StreamEvent(
+            t=round(t, 4),
+            channel_id=rng.choices(range(channels), cum_weights=channel_weights)[0],
+            author_id=user,
+            author_name=f"user{user}",
+            content=" ".join(rng.choices(VOCABULARY, k=rng.randint(2, 25))),
+            mention=rng.random() < mention_rate,
+            bot=rng.random() < bot_rate,
+        ))
+        t += rng.expovariate(rate)
+    return events
+
+
+class StubAgent:
+    """Stands in for DiscordPuppyAgent: sleeps, then says something.
+
+    With status_updates, it posts that many discord_send_message updates
+    spread over the run, the way a tool-using run would.
+    """
+
+    def __init__(
+        self,
+        latency: float,
+        jitter: float = 0.0,
+        rng: Optional[random.Random] = None,
+        status_updates: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.status_updates = status_updates
+        self.runs = 0
+
+    def reload_code_generation_agent(self) -> None:
+        pass
+
+    def clear_message_history(self) -> None:
+        pass
+
+    async def run_with_mcp(self, prompt: str) -> SimpleNamespace:
+        self.runs += 1
+        step = max(0.0, self.rng.gauss(self.latency, self.jitter)) / (self.status_updates + 1)
+        for i in range(self.status_updates):
+            await asyncio.sleep(step)
+            await post_status(f"🔍 sniffing around... (step {i + 1})")
+        await asyncio.sleep(step)
+        return SimpleNamespace(output=f"*wags tail* ({len(prompt)} chars of context) 🐕")
+
+
+@dataclass
+class ReplayConfig:
+    """Knobs for a replay run. Durations are in stream seconds unless noted."""
+    speed: float = 10.0                 # Stream seconds per wall second
+    agent_latency_seconds: float = 3.0  # Mean model run time
+    agent_jitter_seconds: float = 1.0   # ...and its standard deviation
+    send_latency_seconds: float = 0.15  # Discord REST round trip
+    status_updates: int = 0             # discord_send_message calls per agent run
+
+    # Mirrors __main__.on_ready - override to explore
+    heartbeat: HeartbeatConfig = field(default_factory=lambda: HeartbeatConfig(
+        interval_seconds=5.0,
+        spontaneous_chance=0.04,
+        response_chance=0.20,
+        mention_chance=1.0,
+    ))
+    executor: ExecutorConfig = field(default_factory=lambda: ExecutorConfig(
+        max_concurrency=8,
+        per_channel_concurrency=1,
+    ))
+    pool: AgentPoolConfig = field(default_factory=lambda: AgentPoolConfig(size=4, max_size=8))
+    outbound: OutboundConfig = field(default_factory=lambda: OutboundConfig(
+        channel_burst=5,
+        channel_window_seconds=5.0,
+        status_merge_seconds=5.0,
+    ))
+
+    sample_interval_seconds: float = 0.05  # Wall seconds between queue depth samples
+    drain_timeout_seconds: float = 30.0    # Wall seconds to let replies finish
+    db_path: Optional[Path] = None         # Brain to ingest into (temp if None)
+    seed: int = 42
+
+
+class _ReplayHeartbeat(HeartbeatEngine):
+    """HeartbeatEngine that also tells the harness which messages got answered."""
+
+    def __init__(self, *args, on_reply, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_reply = on_reply
+
+    def record_reply(self, pending_messages: list[PendingMessage]) -> None:
+        super().record_reply(pending_messages)
+        self._on_reply(pending_messages)
+
+
+def _scaled(config: Any, speed: float, *names: str) -> Any:
+    """A copy of a config dataclass with the named durations divided by speed."""
+    values = asdict(config)
+    for name in names:
+        values[name] = values[name] / speed
+    return type(config)(**values)
+
+
+def _depth_summary(samples: list[int]) -> dict:
+    if not samples:
+        return {"max": 0, "mean": 0.0, "p95": 0}
+    ordered = sorted(samples)
+    return {
+        "max": ordered[-1],
+        "mean": sum(ordered) / len(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+    }
+
+
+class GatewayReplay:
+    """Replays a stream through the bot's real message path."""
+
+    def __init__(self, config: Optional[ReplayConfig] = None):
+        """Initialize the replay.
+
+        Args:
+            config: Replay configuration (uses defaults if None)
+        """
+        self.config = config or ReplayConfig()
+        self.client = FakeClient(on_message=self._gateway)
+        self.guild = FakeGuild(GUILD_ID_BASE + 500, "replay guild")
+        self._channels: dict[int, FakeChannel] = {}
+        self._users: dict[int, FakeUser] = {}
+
+        self._arrived: dict[int, float] = {}    # message id -> wall arrival
+        self._unanswered_mentions: set[int] = set()
+        self._on_message = Timing("on_message")
+        self._reply_latency = {"mention": Timing("mention"), "response": Timing("response")}
+        self._depths: dict[str, list[int]] = {
+            "heartbeat_pending": [], "executor_queue": [], "executor_in_flight": [], "ingestion_backlog": [],
+        }
+        self._max_lag = 0.0
+        self._replayed = 0
+        self._replies_sent = 0
+
+    def _channel(self, index: int) -> FakeChannel:
+        channel = self._channels.get(index)
+        if channel is None:
+            channel = FakeChannel(
+                CHANNEL_ID_BASE + 500_000 + index, f"replay-{index}", self.guild,
+                send_latency=self.config.send_latency_seconds / self.config.speed,
+            )
+            self._channels[index] = self.client.add_channel(channel)
+        return channel
+
+    def _author(self, event: StreamEvent) -> FakeUser:
+        user = self._users.get(event.author_id)
+        if user is None:
+            user = FakeUser(
+                id=USER_ID_BASE + event.author_id, name=event.author_name,
+                display_name=event.author_name, bot=event.bot,
+            )
+            self._users[event.author_id] = user
+        return user
+
+    def _message(self, event: StreamEvent, sequence: int) -> FakeMessage:
+        channel = self._channel(event.channel_id)
+        now = datetime.now(timezone.utc)
+        content = f"{self.client.user.mention} {event.content}" if event.mention else event.content
+        message = FakeMessage(
+            id=snowflake(now, sequence),
+            content=content,
+            author=self._author(event),
+            channel=channel,
+            created_at=now,
+            mentions=[self.client.user] if event.mention else [],
+        )
+        channel.messages.append(message)
+        return message
+
+    async def _gateway(self, message: FakeMessage) -> None:
+        """What discord.py does on MESSAGE_CREATE: call on_message."""
+        if message.author is self.client.user:
+            # Spontaneous barks and status updates are counted by the outbound scheduler
+            if message.reference is not None:
+                self._replies_sent += 1
+        else:
+            self._arrived[message.id] = time.perf_counter()
+        started = time.perf_counter()
+        await bot.on_message(message)
+        self._on_message.samples.append(time.perf_counter() - started)
+
+    def _replied(self, pending_messages: list[PendingMessage]) -> None:
+        now = time.perf_counter()
+        kind = "mention" if any(pm.is_mention for pm in pending_messages) else "response"
+        for pm in pending_messages:
+            arrived = self._arrived.get(pm.message.id)
+            if arrived is not None:
+                self._reply_latency[kind].samples.append((now - arrived) * self.config.speed)
+            self._unanswered_mentions.discard(pm.message.id)
+
+    async def _sample_depths(self) -> None:
+        while True:
+            executor = bot.heartbeat.executor
+            self._depths["heartbeat_pending"].append(sum(bot.heartbeat.pending_depths().values()))
+            self._depths["executor_queue"].append(executor.queue_depth)
+            self._depths["executor_in_flight"].append(executor.in_flight)
+            self._depths["ingestion_backlog"].append(bot.ingestion.backlog)
+            await asyncio.sleep(self.config.sample_interval_seconds)
+
+    async def _replay(self, events: list[StreamEvent]) -> float:
+        loop = asyncio.get_running_loop()
+        speed = self.config.speed
+        started = loop.time()
+        for sequence, event in enumerate(events):
+            due = started + event.t / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self._max_lag = max(self._max_lag, -delay)
+            message = self._message(event, sequence)
+            if event.mention and not event.bot:
+                self._unanswered_mentions.add(message.id)
+            await self._gateway(message)
+            self._replayed += 1
+        return loop.time() - started
+
+    async def run(self, events: list[StreamEvent]) -> dict:
+        """Replay a stream and report what happened.
+
+        Swaps the bot's client, heartbeat, agent pool and outbound
+        scheduler for fakes/stubs
+        (restored afterwards) and points the brain at config.db_path.
+
+        Args:
+            events: The stream, in time order
+
+        Returns:
+            JSON-ready report
+        """
+        config = self.config
+        speed = config.speed
+        db_path = config.db_path or Path(tempfile.mkdtemp(prefix="puppy-replay-")) / "brain.db"
+        rng = random.Random(config.seed)
+
+        saved = (bot.client, bot.heartbeat, bot.agent_pool, bot.outbound)
+        await configure_connection_manager(ConnectionConfig(db_path=db_path))
+        sampler: Optional[asyncio.Task] = None
+        try:
+            await init_database()
+            bot.client = self.client
+            bot.agent_pool = AgentPool(config.pool, factory=functools.partial(
+                StubAgent,
+                config.agent_latency_seconds / speed,
+                config.agent_jitter_seconds / speed,
+                rng,
+                config.status_updates,
+            ))
+            await bot.agent_pool.warmup()
+            bot.heartbeat = _ReplayHeartbeat(
+                client=self.client,
+                config=_scaled(
+                    config.heartbeat, speed,
+                    "interval_seconds", "engagement_decay_seconds", "spontaneous_window_seconds",
+                ),
+                on_should_respond=bot.handle_should_respond,
+                on_spontaneous=bot.handle_spontaneous,
+                executor=ResponseExecutor(_scaled(
+                    config.executor, speed,
+                    "max_run_seconds", "mention_deadline_seconds",
+                    "response_deadline_seconds", "spontaneous_deadline_seconds",
+                )),
+                on_reply=self._replied,
+            )
+            bot.outbound = OutboundScheduler(_scaled(
+                config.outbound, speed,
+                "channel_window_seconds", "global_window_seconds", "send_timeout_seconds",
+                "status_merge_seconds", "status_deadline_seconds",
+            ))
+            set_outbound_scheduler(bot.outbound)
+            bot.outbound.start()
+            bot.ingestion.start()
+            bot.heartbeat.start()
+            sampler = asyncio.create_task(self._sample_depths())
+
+            replay_seconds = await self._replay(events)
+
+            # One more beat so the last chatter gets decided, then let replies finish
+            await asyncio.sleep(bot.heartbeat.config.interval_seconds)
+            await bot.heartbeat.stop(drain=True, timeout=config.drain_timeout_seconds)
+            await bot.outbound.stop(drain=True, timeout=config.drain_timeout_seconds)
+            await bot.ingestion.stop()
+        finally:
+            if sampler:
+                sampler.cancel()
+            heartbeat, pool, outbound = bot.heartbeat, bot.agent_pool, bot.outbound
+            bot.client, bot.heartbeat, bot.agent_pool, bot.outbound = saved
+            set_outbound_scheduler(bot.outbound)
+            await close_connection_manager()
+
+        ingestion = bot.ingestion.stats()
+        executor = heartbeat.executor.stats()
+        sends = outbound.stats()
+        wall_seconds = replay_seconds
+        return {
+            "suite": "gateway_replay",
+            "config": {
+                "speed": speed,
+                "agent_latency_seconds": config.agent_latency_seconds,
+                "agent_jitter_seconds": config.agent_jitter_seconds,
+                "send_latency_seconds": config.send_latency_seconds,
+                "heartbeat": asdict(config.heartbeat),
+                "executor": asdict(config.executor),
+                "pool": asdict(config.pool),
+                "outbound": asdict(config.outbound),
+                "status_updates": config.status_updates,
+            },
+            "stream": {
+                "messages": len(events),
+                "duration_seconds": events[-1].t if events else 0.0,
+                "channels": len(self._channels),
+                "mentions": sum(1 for event in events if event.mention and not event.bot),
+                "from_bots": sum(1 for event in events if event.bot),
+            },
+            "wall_seconds": wall_seconds,
+            "gateway": {
+                "replayed": self._replayed,
+                "messages_per_wall_second": self._replayed / wall_seconds if wall_seconds else 0.0,
+                "max_replay_lag_ms": self._max_lag * 1000,
+                "on_message": self._on_message.as_dict(),
+            },
+            "ingestion": {
+                **ingestion,
+                "written_per_wall_second": ingestion["written"] / wall_seconds if wall_seconds else 0.0,
+            },
+            "queue_depth": {name: _depth_summary(samples) for name, samples in self._depths.items()},
+            "replies": {
+                "sent": self._replies_sent,
+                "spontaneous": sends["kinds"]["spontaneous"]["sent"],
+                "latency_stream_seconds": {
+                    kind: {k.replace("_ms", "_s"): v / 1000 if k.endswith("_ms") else v
+                           for k, v in timing.as_dict().items() if k != "name"}
+                    for kind, timing in self._reply_latency.items()
+                },
+                "unanswered_mentions": len(self._unanswered_mentions),
+            },
+            "dropped": {
+                "heartbeat_pending": heartbeat.dropped_messages,
+                "executor_expired": executor["dropped_expired"],
+                "executor_full": executor["dropped_full"],
+                "ingestion": ingestion["dropped"],
+            },
+            "executor": executor,
+            "outbound": {
+                **sends,
+                "messages_sent": sum(channel.sent for channel in self._channels.values()),
+                "messages_edited": sum(channel.edited for channel in self._channels.values()),
+            },
+            "agent_pool": pool.stats(),
+        }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Replay a message stream through the puppy, offline.")
+    parser.add_argument("--stream", type=Path, help="Recorded JSONL stream (synthetic if omitted)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Synthetic: messages per second")
+    parser.add_argument("--duration", type=float, default=120.0, help="Synthetic: stream seconds")
+    parser.add_argument("--channels", type=int, default=20, help="Synthetic: channels")
+    parser.add_argument("--users", type=int, default=500, help="Synthetic: distinct authors")
+    parser.add_argument("--mention-rate", type=float, default=0.05, help="Synthetic: fraction pinging the puppy")
+    parser.add_argument("--save-stream", type=Path, help="Also write the stream as JSONL")
+    parser.add_argument("--speed", type=float, default=10.0, help="Replay N× faster than real time")
+    parser.add_argument("--agent-latency", type=float, default=3.0, help="Stub agent mean seconds per run")
+    parser.add_argument("--agent-jitter", type=float, default=1.0, help="Stub agent latency std dev")
+    parser.add_argument("--send-latency", type=float, default=0.15, help="Seconds per Discord send")
+    parser.add_argument("--status-updates", type=int, default=0, help="Stub agent status updates per run")
+    parser.add_argument("--response-chance", type=float, default=0.20, help="Heartbeat base response chance")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Executor LLM runs in flight")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="Show the bot's own output on stderr")
+    parser.add_argument("--output", type=Path, help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    if args.stream:
+        events = load_stream(args.stream)
+    else:
+        events = synthetic_stream(
+            args.rate, args.duration, args.channels, args.users, args.mention_rate, seed=args.seed,
+        )
+    if args.save_stream:
+        save_stream(args.save_stream, events)
+
+    config = ReplayConfig(
+        speed=args.speed,
+        agent_latency_seconds=args.agent_latency,
+        agent_jitter_seconds=args.agent_jitter,
+        send_latency_seconds=args.send_latency,
+        status_updates=args.status_updates,
+        seed=args.seed,
+    )
+    config.heartbeat.response_chance = args.response_chance
+    config.executor.max_concurrency = args.max_concurrency
+    random.seed(args.seed)  # The heartbeat's dice
+
+    log(f"📼 Replaying {len(events):,} messages at {args.speed:g}× ...")
+    sink = sys.stderr if args.verbose else open(os.devnull, "w")
+    log_pipeline = setup_logging(LoggingConfig(level="INFO" if args.verbose else "WARNING"))
+    try:
+        with contextlib.redirect_stdout(sink):
+            report = asyncio.run(GatewayReplay(config).run(events))
+    finally:
+        log_pipeline.stop()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+        log(f"📊 Results written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Tool Scenarios - Every Memory Tool Query, Ready to Run 🐕🎬
+
+The memory tools are registered on an agent, so they can't be called
+directly. collect_memory_tools() hands register_* a stand-in agent and
+keeps the tool functions; tool_scenarios() pairs each query shape worth
+measuring with a zero-argument call.
+
+Shared by bench_memory (timing) and tests/test_query_plans.py (index
+checks), so both cover the same queries.
+"""
+
+from typing import Any, Awaitable, Callable
+
+from benchmarks.synthetic import USER_ID_BASE
+
+
+class _ToolCollector:
+    """Stands in for the agent so register_* functions hand us their tools."""
+
+    def __init__(self):
+        self.tools: dict[str, Callable[..., Awaitable[dict[str, Any]]]] = {}
+
+    def tool(self, func):
+        self.tools[func.__name__] = func
+        return func
+
+
+def collect_memory_tools() -> dict[str, Callable[..., Awaitable[dict[str, Any]]]]:
+    """Every memory tool, keyed by name, callable as tool(None, **kwargs)."""
+    from discord_puppy.tools import memory_tools
+
+    collector = _ToolCollector()
+    for name in dir(memory_tools):
+        if name.startswith("register_"):
+            getattr(memory_tools, name)(collector)
+    return collector.tools
+
+
+def tool_scenarios(tools: dict, channel_id: str = "3") -> list[tuple[str, Callable[[], Awaitable[Any]]]]:
+    """Every tool query shape worth planning (and benchmarking).
+
+    Assumes the synthetic naming scheme: user{i} / "User Number {i}" with
+    IDs USER_ID_BASE + i.
+
+    Args:
+        tools: collect_memory_tools() output
+        channel_id: A channel that has messages
+
+    Returns:
+        (name, zero-argument coroutine factory) pairs
+    """
+    some_user = str(USER_ID_BASE + 5)
+    return [
+        ("search_messages: terms", lambda: tools["search_messages"](None, query="puppies")),
+        ("search_messages: phrase + channel", lambda: tools["search_messages"](
+            None, query='"about puppies"', channel_id=channel_id)),
+        ("search_messages: terms + user + dates", lambda: tools["search_messages"](
+            None, query="cats", user="user5", since="2024-03-01", until="2024-06-01")),
+        ("search_messages: recent", lambda: tools["search_messages"](None)),
+        ("search_messages: recent in channel", lambda: tools["search_messages"](None, channel_id=channel_id)),
+        ("search_messages: recent by user", lambda: tools["search_messages"](None, user=some_user)),
+        ("search_messages: recent since", lambda: tools["search_messages"](None, since="2024-11-01")),
+        ("get_user_notes: id", lambda: tools["get_user_notes"](None, username=some_user)),
+        ("get_user_notes: mention", lambda: tools["get_user_notes"](None, username=f"<@{some_user}>")),
+        ("get_user_notes: exact name", lambda: tools["get_user_notes"](None, username="USER5")),
+        ("get_user_notes: fuzzy", lambda: tools["get_user_notes"](None, username="usr12")),
+        ("get_user_notes: short prefix", lambda: tools["get_user_notes"](None, username="Us")),
+        ("record_user_note", lambda: tools["record_user_note"](
+            None, username=some_user, note="plan check", importance=2)),
+        ("list_users", lambda: tools["list_users"](None, limit=20)),
+        ("get_recent_messages", lambda: tools["get_recent_messages"](None, limit=10)),
+        ("get_indexing_status", lambda: tools["get_indexing_status"](None)),
+    ]
@@ -0,0 +1,235 @@
+"""
+Synthetic Worlds - A Discord Full of Pretend Puppies 🐕🏗️
+
+Generates guilds, users and messages that look like a real server as far
+as the brain's indexes are concerned:
+- A few chatty users and a long tail of lurkers (Zipf-ish activity)
+- A few busy channels and many quiet ones
+- Message IDs are real snowflakes, increasing with their timestamps
+- Content comes from a small vocabulary, so FTS terms repeat the way
+  real chat does ("puppies" is common, "cucumber" is rare)
+
+Users are named user{i} / "User Number {i}" with IDs USER_ID_BASE + i,
+the scheme the tool scenarios (benchmarks/scenarios.py) look users up by.
+
+Everything is deterministic for a given WorldSpec (seeded RNG).
+"""
+
+import hashlib
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, Optional
+
+from discord_puppy.memory.database import ConnectionManager, upsert_users
+from discord_puppy.memory.user_notes import add_user_note
+
+# Named scales -> message rows
+SCALES = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+DISCORD_EPOCH_MS = 1_420_070_400_000
+USER_ID_BASE = 100_000_000_000_000_000  # Snowflake-sized
+GUILD_ID_BASE = 300_000_000_000_000_000
+CHANNEL_ID_BASE = 400_000_000_000_000_000
+
+VOCABULARY = (
+    "puppies dogs cats treats walk ball fetch squirrel bark zoomies nap couch "
+    "bone park vet bath leash sniff tail wag good boy girl friend food dinner "
+    "breakfast snack cheese cucumber game server bot code python bug deploy "
+    "release test docs help question answer thanks lol yes no maybe today "
+    "tomorrow weekend morning night coffee tea music movie book meme cursed "
+    "chaos energy memory brain index search hello hi bye again please why how"
+).split()
+MOODS = ("curious", "excited", "sleepy", "chaotic", "friendly")
+
+
+def snowflake(when: datetime, sequence: int = 0) -> int:
+    """A Discord snowflake for a timestamp (worker/process bits zero)."""
+    ms = int(when.timestamp() * 1000)
+    return ((ms - DISCORD_EPOCH_MS) << 22) | (sequence & 0xFFF)
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> list[float]:
+    """Cumulative Zipf weights - rank 0 is the most active."""
+    return list(itertools.accumulate(1.0 / (rank + 1) ** exponent for rank in range(count)))
+
+
+@dataclass
+class WorldSpec:
+    """Shape of a synthetic Discord."""
+    messages: int = 10_000
+    users: int = 100
+    guilds: int = 1
+    channels_per_guild: int = 8
+    days: int = 365                 # Messages spread over this many days...
+    end: datetime = field(default_factory=lambda: datetime(2024, 12, 31, tzinfo=timezone.utc))  # ...ending here
+    notes_every: int = 5            # Every Nth user has notes
+    seed: int = 42
+
+    @classmethod
+    def for_scale(cls, scale: str, **overrides) -> "WorldSpec":
+        """A spec sized for a named scale (10k, 1m, 10m)."""
+        messages = SCALES[scale]
+        spec = cls(
+            messages=messages,
+            users=max(100, messages // 100),
+            guilds=max(1, min(25, messages // 400_000)),
+        )
+        for name, value in overrides.items():
+            setattr(spec, name, value)
+        return spec
+
+    @property
+    def channel_ids(self) -> list[str]:
+        """Every channel, busiest first."""
+        return [
+            str(CHANNEL_ID_BASE + guild * 1000 + channel)
+            for channel in range(self.channels_per_guild)
+            for guild in range(self.guilds)
+        ]
+
+    def guild_of(self, channel_id: str) -> str:
+        return str(GUILD_ID_BASE + (int(channel_id) - CHANNEL_ID_BASE) // 1000)
+
+    def as_dict(self) -> dict:
+        return {
+            "messages": self.messages,
+            "users": self.users,
+            "guilds": self.guilds,
+            "channels_per_guild": self.channels_per_guild,
+            "days": self.days,
+            "end": self.end.isoformat(),
+            "notes_every": self.notes_every,
+            "seed": self.seed,
+        }
+
+
+def synthetic_content(rng: random.Random) -> str:
+    """One chat message worth of words."""
+    words = rng.choices(VOCABULARY, k=rng.randint(2, 30))
+    if rng.random() < 0.1:
+        at = rng.randrange(len(words))
+        words[at:at] = ["about", "puppies"]
+    return " ".join(words)
+
+
+def user_rows(spec: WorldSpec) -> list[tuple]:
+    """upsert_users() rows for every synthetic user."""
+    rng = random.Random(spec.seed)
+    return [
+        (
+            str(USER_ID_BASE + i), f"user{i}", f"User Number {i}", rng.choice(MOODS),
+            1 + rng.randrange(50),
+            (spec.end - timedelta(seconds=rng.randrange(spec.days * 86400))).isoformat(),
+        )
+        for i in range(spec.users)
+    ]
+
+
+def message_rows(spec: WorldSpec) -> Iterator[tuple]:
+    """indexed_messages rows, oldest first.
+
+    Yields:
+        (message_hash, message_id, channel_id, guild_id, user_id, content_preview, message_timestamp)
+    """
+    rng = random.Random(spec.seed + 1)
+    channels = spec.channel_ids
+    channel_weights = zipf_weights(len(channels), exponent=0.8)
+    user_weights = zipf_weights(spec.users)
+    start = spec.end - timedelta(days=spec.days)
+    step = spec.days * 86400 / max(1, spec.messages)
+
+    for i in range(spec.messages):
+        when = start + timedelta(seconds=i * step + rng.random() * step)
+        channel_id = rng.choices(channels, cum_weights=channel_weights)[0]
+        user_id = str(USER_ID_BASE + rng.choices(range(spec.users), cum_weights=user_weights)[0])
+        content = synthetic_content(rng)
+        message_id = str(snowflake(when, i))
+        fingerprint = f"{message_id}:{channel_id}:{content}:{user_id}"
+        yield (
+            hashlib.sha256(fingerprint.encode("utf-8")).hexdigest(),
+            message_id,
+            channel_id,
+            spec.guild_of(channel_id),
+            user_id,
+            content[:200],
+            when.isoformat(),
+        )
+
+
+def note_rows(spec: WorldSpec) -> Iterator[tuple[str, str, int]]:
+    """(user_id, note, importance) for every Nth user - one to six notes each."""
+    rng = random.Random(spec.seed + 2)
+    for i in range(0, spec.users, spec.notes_every):
+        for _ in range(rng.randint(1, 6)):
+            note = "likes " + " and ".join(rng.sample(VOCABULARY, 2))
+            yield str(USER_ID_BASE + i), note, rng.randint(1, 5)
+
+
+def chunked(rows, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+async def seed_world(
+    manager: ConnectionManager,
+    spec: WorldSpec,
+    chunk_size: int = 50_000,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+) -> dict:
+    """Write a synthetic world into an initialized brain.
+
+    One write transaction per chunk, so big worlds don't build one
+    enormous WAL.
+
+    Args:
+        manager: Connection manager of the target brain
+        spec: What to generate
+        chunk_size: Rows per transaction
+        progress: Called with (what, done, total) after every chunk
+
+    Returns:
+        Dict with row counts and seconds spent per table
+    """
+    report: dict = {}
+
+    started = time.perf_counter()
+    users = user_rows(spec)
+    for done, chunk in enumerate(chunked(users, chunk_size), start=1):
+        async with manager.writer() as conn:
+            await upsert_users(conn, chunk)
+        if progress:
+            progress("users", min(done * chunk_size, spec.users), spec.users)
+    report["users"] = {"rows": spec.users, "seconds": time.perf_counter() - started}
+
+    started = time.perf_counter()
+    for done, chunk in enumerate(chunked(message_rows(spec), chunk_size), start=1):
+        async with manager.writer() as conn:
+            await conn.executemany("""
+                INSERT INTO indexed_messages (
+                    message_hash, message_id, channel_id, guild_id, user_id,
+                    content_preview, message_timestamp
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, chunk)
+        if progress:
+            progress("messages", min(done * chunk_size, spec.messages), spec.messages)
+    report["messages"] = {"rows": spec.messages, "seconds": time.perf_counter() - started}
+
+    started = time.perf_counter()
+    notes = 0
+    for chunk in chunked(note_rows(spec), chunk_size):
+        async with manager.writer() as conn:
+            for user_id, note, importance in chunk:
+                await add_user_note(conn, user_id, note, importance)
+        notes += len(chunk)
+    report["notes"] = {"rows": notes, "seconds": time.perf_counter() - started}
+
+    return report
@@ -10,19 +10,35 @@ Requires DISCORD_TOKEN environment variable.
 """
 
 import asyncio
+import logging
 import os
 import random
 import sys
+import time
 from typing import Optional
 
 import discord
 from dotenv import load_dotenv
 
-from discord_puppy.memory.database import init_database, get_connection, ensure_user_exists
-from discord_puppy.memory.message_indexer import index_all_guilds, index_message, compute_message_hash
+from discord_puppy.memory.database import init_database, close_connection_manager
+from discord_puppy.memory.ingestion import IngestionQueue
+from discord_puppy.memory.user_cache import UserMemoryCache, UserCacheConfig, set_user_memory_cache
+from discord_puppy.memory.user_notes import NoteRollup, NotesBudget
+from discord_puppy.memory.retention import RetentionEngine, RetentionConfig, RetentionPolicy
+from discord_puppy.memory.backfill import BackfillSupervisor, set_backfill_supervisor
+from discord_puppy.memory.message_indexer import BackfillConfig
+from discord_puppy.channel_cache import ChannelMessageCache, ChannelCacheConfig
 from discord_puppy.heartbeat import HeartbeatEngine, HeartbeatConfig, PendingMessage
-from discord_puppy.agents.puppy_agent import create_puppy_agent
-from discord_puppy.tools.discord_send import set_current_channel
+from discord_puppy.response_executor import ResponseExecutor, ExecutorConfig
+from discord_puppy.outbound import OutboundScheduler, OutboundConfig, SendKind, set_outbound_scheduler
+from discord_puppy.prompting import PromptBuilder, PromptBudget, PromptMessage
+from discord_puppy.agents.agent_pool import AgentPool, AgentPoolConfig, set_agent_pool
+from discord_puppy.tools.discord_send import bind_channel
+from discord_puppy import metrics
+from discord_puppy.metrics import MetricsServer, count_discord_rate_limits
+from discord_puppy.logging_setup import LoggingConfig, setup_logging
+
+logger = logging.getLogger("discord_puppy.bot")
 
 # Load .env file if present
 load_dotenv()
@@ -38,33 +54,216 @@ client = discord.Client(intents=intents)
 # Heartbeat engine (initialized on ready)
 heartbeat: Optional[HeartbeatEngine] = None
 
+# Recent messages per channel, fed by the gateway (no REST on the reply path)
+channel_cache = ChannelMessageCache(ChannelCacheConfig(
+    per_channel=50,             # Ring buffer per channel
+    max_total_messages=20_000,  # Global cap across all channels
+))
+
+# Write-behind queue for live messages (started on ready)
+ingestion = IngestionQueue()
+
+# Who we're talking to, prefetched into every prompt (saves a get_user_notes turn)
+user_memory = UserMemoryCache(UserCacheConfig(
+    max_entries=10_000,  # LRU cap
+    ttl_seconds=300.0,   # Refetch after 5 minutes
+))
+set_user_memory_cache(user_memory)
+
+# Keeps every user's notes within budget (started on ready)
+note_rollup = NoteRollup(NotesBudget(
+    max_notes=40,             # Rows per user before rolling up
+    max_chars=4000,           # Note text per user before rolling up
+    interval_seconds=3600.0,  # Hourly
+))
+
+
+def live_traffic_is_busy() -> bool:
+    """Whether background work should step aside for live messages."""
+    if heartbeat and heartbeat.has_pending_mention:
+        return True
+    return ingestion.backlog >= ingestion.config.max_batch_size // 2
+
+
+# History backfill runs in the background, at lower priority than live traffic
+backfill = BackfillSupervisor(
+    limit_per_channel=500,  # Reasonable default
+    days_back=30,  # Last month of messages (new channels only)
+    config=BackfillConfig(
+        max_concurrency=4,        # Channels in flight across all guilds
+        per_guild_concurrency=1,  # ...and within any one guild
+    ),
+    busy=live_traffic_is_busy,
+)
+set_backfill_supervisor(backfill)
+
+# Keeps the online brain bounded - old messages move to a compressed archive
+retention = RetentionEngine(
+    config=RetentionConfig(
+        default=RetentionPolicy(
+            max_age_days=90,   # Must stay >= the backfill's days_back
+            max_rows=50_000,   # Per channel
+        ),
+        batch_size=500,           # Rows moved per transaction
+        interval_seconds=600.0,   # Every 10 minutes
+    ),
+    busy=live_traffic_is_busy,
+)
+
+# Pre-warmed agents - no agent construction on the reply path (warmed on ready)
+agent_pool = AgentPool(AgentPoolConfig(
+    size=4,      # Warm agents kept ready
+    max_size=8,  # Matches the executor's max_concurrency
+))
+set_agent_pool(agent_pool)
+
+# Every reply prompt is filled to a token budget, mention first
+prompt_builder = PromptBuilder(PromptBudget(
+    max_tokens=2000,         # Whole prompt
+    max_message_tokens=150,  # Any single message
+    history_limit=10,        # Recent messages considered
+))
+
+# Every send to Discord - replies first, paced per channel (started on ready)
+outbound = OutboundScheduler(OutboundConfig(
+    channel_burst=5,              # Discord: 5 messages...
+    channel_window_seconds=5.0,   # ...per 5 seconds per channel
+    status_merge_seconds=5.0,     # Status updates this close together become one message
+))
+set_outbound_scheduler(outbound)
+
+# Prometheus metrics on localhost (PUPPY_METRICS_PORT, "off" to disable; started on ready)
+metrics_port = os.getenv("PUPPY_METRICS_PORT", "9108")
+metrics_server = MetricsServer(port=int(metrics_port)) if metrics_port.isdigit() else None
+
+GATEWAY_MESSAGES = metrics.counter("puppy_gateway_messages_total", "Messages received from the gateway")
+AGENT_RUN_SECONDS = metrics.histogram(
+    "puppy_agent_run_seconds", "run_with_mcp latency", ["kind"], buckets=metrics.AGENT_BUCKETS,
+)
+AGENT_RUNS = metrics.counter("puppy_agent_runs_total", "Agent runs by outcome", ["kind", "outcome"])
+AGENT_TOOL_CALLS = metrics.counter("puppy_agent_tool_calls_total", "Tool calls made during agent runs", ["tool"])
+PENDING_MESSAGES = metrics.gauge(
+    "puppy_heartbeat_pending_messages", "Messages waiting for the next heartbeat, per channel", ["channel"],
+)
+QUEUE_DEPTH = metrics.gauge("puppy_queue_depth", "Items waiting in each internal queue", ["queue"])
+AGENTS = metrics.gauge("puppy_agent_pool_agents", "Pooled agents by state", ["state"])
+CACHED_MESSAGES = metrics.gauge("puppy_channel_cache_messages", "Messages held in the channel cache")
+
+
+@metrics.on_collect
+def collect_queue_metrics() -> None:
+    """Read queue depths and pool sizes at scrape time - nothing on the hot path."""
+    PENDING_MESSAGES.clear()
+    if heartbeat:
+        for channel_id, depth in heartbeat.pending_depths().items():
+            PENDING_MESSAGES.labels(channel_id).set(depth)
+        QUEUE_DEPTH.labels("executor").set(heartbeat.executor.queue_depth)
+        QUEUE_DEPTH.labels("executor_in_flight").set(heartbeat.executor.in_flight)
+    QUEUE_DEPTH.labels("ingestion").set(ingestion.backlog)
+    QUEUE_DEPTH.labels("outbound").set(outbound.queue_depth)
+    pool = agent_pool.stats()
+    AGENTS.labels("idle").set(pool["idle"])
+    AGENTS.labels("total").set(pool["total"])
+    CACHED_MESSAGES.set(channel_cache.stats()["messages"])
+
+
+def count_tool_calls(result) -> None:
+    """Count the tool calls a finished run made (from its new messages)."""
+    try:
+        messages = result.new_messages()
+    except Exception:
+        return
+    for message in messages:
+        for part in getattr(message, "parts", ()):
+            if getattr(part, "part_kind", None) == "tool-call":
+                AGENT_TOOL_CALLS.labels(part.tool_name).inc()
+
 
-async def build_channel_context(channel: discord.abc.Messageable, limit: int = 10) -> str:
-    """Build context string with channel info and recent messages."""
-    lines = []
-    
+async def run_agent(prompt: str, kind: str) -> Optional[str]:
+    """One pooled agent run, timed and counted. Returns the output (None if empty)."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        async with agent_pool.acquire() as agent:
+            result = await agent.run_with_mcp(prompt)
+        outcome = "ok" if result else "empty"
+    finally:
+        AGENT_RUN_SECONDS.labels(kind).observe(time.perf_counter() - started)
+        AGENT_RUNS.labels(kind, outcome).inc()
+    count_tool_calls(result)
+    return result.output if result else None
+
+
+async def timed_send(kind: str, send) -> None:
+    """Await a Discord send, recording its latency and any HTTP error."""
+    started = time.perf_counter()
+    try:
+        await send
+    except discord.HTTPException as e:
+        metrics.DISCORD_SEND_ERRORS.labels(kind, e.status).inc()
+        raise
+    except asyncio.TimeoutError:
+        metrics.DISCORD_SEND_ERRORS.labels(kind, "timeout").inc()
+        raise
+    finally:
+        metrics.DISCORD_SEND_SECONDS.labels(kind).observe(time.perf_counter() - started)
+
+
+async def build_prompt(
+    channel: discord.abc.Messageable,
+    instruction: str,
+    pending_messages: list[PendingMessage] = (),
+) -> str:
+    """Build a token-budgeted prompt: channel info, user memory, recent + pending messages."""
     # Channel info
     channel_name = getattr(channel, 'name', 'DM')
     channel_id = getattr(channel, 'id', 'unknown')
-    lines.append(f"[Channel: #{channel_name} (ID: {channel_id})]")
-    lines.append("")
-    lines.append("Recent messages:")
+    header = f"[Channel: #{channel_name} (ID: {channel_id})]"
     
-    # Fetch last N messages from Discord
+    # Last N messages - from memory when warm, REST only when cold.
+    # Pending messages are in there too (and get skipped), so ask for extra.
+    limit = min(
+        prompt_builder.budget.history_limit + len(pending_messages),
+        channel_cache.config.per_channel,
+    )
     try:
-        messages = []
-        async for msg in channel.history(limit=limit):
-            messages.append(msg)
-        
-        # Reverse to get chronological order
-        for msg in reversed(messages):
-            author = msg.author.display_name
-            content = msg.content[:200] + "..." if len(msg.content) > 200 else msg.content
-            lines.append(f"{author}: {content}")
+        history = [
+            PromptMessage.from_cached(msg)
+            for msg in await channel_cache.get_recent(channel, limit=limit)
+        ]
     except Exception as e:
-        lines.append(f"(couldn't fetch history: {e})")
+        logger.warning("⚠️ Couldn't fetch history for #%s: %s", channel_name, e)
+        history = []
     
-    return "\n".join(lines)
+    pending = [
+        PromptMessage(
+            id=pm.message.id,
+            author=pm.message.author.display_name,
+            content=pm.message.content,
+            is_mention=pm.is_mention,
+        )
+        for pm in pending_messages
+    ]
+    
+    # What we remember about the authors - the mention's author first, then newest
+    authors = [
+        str(pm.message.author.id)
+        for pm in sorted(reversed(pending_messages), key=lambda pm: not pm.is_mention)
+    ]
+    try:
+        memories = await user_memory.get_many(authors)
+    except Exception as e:
+        logger.warning("⚠️ Couldn't load user memory: %s", e)
+        memories = {}
+    
+    built = prompt_builder.build(
+        header,
+        instruction,
+        pending=pending,
+        history=history,
+        user_memory=[memory.render() for memory in memories.values()],
+    )
+    return built.text
 
 
 async def handle_should_respond(pending_messages: list[PendingMessage]) -> None:
@@ -72,25 +271,15 @@ async def handle_should_respond(pending_messages: list[PendingMessage]) -> None:
     if not pending_messages:
         return
     
-    # Create a fresh agent for this task (allows concurrent responses!)
-    agent = create_puppy_agent()
-    
-    # Set current channel so discord_send_message tool works
+    # Bind this run's channel so discord_send_message posts here (per
+    # task - concurrent runs in other channels keep their own)
     channel = pending_messages[-1].message.channel
-    set_current_channel(channel, asyncio.get_event_loop())
-    
-    # Build context with channel info and recent messages
-    context = await build_channel_context(channel, limit=10)
-    
-    # Build prompt from pending messages
-    prompt_parts = [f"{pm.message.author.display_name}: {pm.message.content}" for pm in pending_messages]
-    new_messages = "\n".join(prompt_parts)
-    
-    prompt = f"{context}\n\n---\nRespond to:\n{new_messages}"
-    
-    # Generate response via run_with_mcp
-    result = await agent.run_with_mcp(prompt)
-    response = result.output if result else "*tilts head confused* 🐕"
+    with bind_channel(channel) as binding:
+        # Mention first, then the pending burst, then history - within budget
+        prompt = await build_prompt(channel, "Respond to:", pending_messages)
+        
+        # Generate response via run_with_mcp (pooled agent - one run per checkout)
+        response = await run_agent(prompt, "reply") or "*tilts head confused* 🐕"
     
     # Reply to the most recent message (or the mention if there is one)
     target_message = pending_messages[-1].message
@@ -100,40 +289,35 @@ async def handle_should_respond(pending_messages: list[PendingMessage]) -> None:
             break
     
     try:
-        await target_message.reply(response)
-        print(f"🐕 Responded to {target_message.author.display_name}!")
-    except discord.HTTPException as e:
-        print(f"❌ Failed to send response: {e}")
-
-
-async def handle_spontaneous() -> None:
+        await timed_send("reply", outbound.send(
+            target_message.channel, response, SendKind.REPLY,
+            reference=target_message, run_id=binding.run_id,
+        ))
+        if heartbeat:
+            heartbeat.record_reply(pending_messages)
+        logger.info("🐕 Responded to %s!", target_message.author.display_name)
+    except (discord.HTTPException, asyncio.TimeoutError, RuntimeError) as e:
+        logger.warning("❌ Failed to send response: %r", e)
+
+
+async def handle_spontaneous(channel: discord.abc.Messageable) -> None:
     """Callback when the heartbeat decides we should say something random."""
-    global heartbeat
-    
-    if not heartbeat or not heartbeat.last_active_channel:
-        return
-    
-    channel = heartbeat.last_active_channel
-    
-    # Create a fresh agent for this task (allows concurrent responses!)
-    agent = create_puppy_agent()
-    
-    # Set current channel so discord_send_message tool works
-    set_current_channel(channel, asyncio.get_event_loop())
-    
-    # Build context with channel info and recent messages
-    context = await build_channel_context(channel, limit=10)
-    
-    # Generate spontaneous message based on chat history
-    prompt = f"{context}\n\n---\n*wakes up* say something relevant to the recent chat, or a chill random thought. ONE line max."
-    result = await agent.run_with_mcp(prompt)
-    message = result.output if result else "*yawns* 🐕"
+    # Bind this run's channel so discord_send_message posts here
+    with bind_channel(channel) as binding:
+        # Generate spontaneous message based on chat history
+        prompt = await build_prompt(
+            channel,
+            "*wakes up* say something relevant to the recent chat, or a chill random thought. ONE line max.",
+        )
+        message = await run_agent(prompt, "spontaneous") or "*yawns* 🐕"
     
     try:
-        await channel.send(message)
-        print(f"✨ Spontaneous message sent to #{channel.name}!")
-    except discord.HTTPException as e:
-        print(f"❌ Failed to send spontaneous message: {e}")
+        await timed_send("spontaneous", outbound.send(
+            channel, message, SendKind.SPONTANEOUS, run_id=binding.run_id,
+        ))
+        logger.info("✨ Spontaneous message sent to #%s!", getattr(channel, "name", "DM"))
+    except (discord.HTTPException, asyncio.TimeoutError, RuntimeError) as e:
+        logger.warning("❌ Failed to send spontaneous message: %r", e)
 
 
 @client.event
@@ -144,44 +328,74 @@ async def on_ready() -> None:
     print(f"🐕 WOOF! Discord Puppy is online as {client.user}!")
     print(f"🧠 Initializing brain...")
     await init_database()
-
-    # Index message history from all guilds!
-    print(f"📚 Indexing message history (this might take a bit)...")
-    stats = await index_all_guilds(
-        client,
-        limit_per_channel=500,  # Reasonable default
-        days_back=30,  # Last month of messages
-    )
-
-    print(f"📊 Indexing complete!")
-    print(f"   🏠 Guilds: {stats['guilds_processed']}")
-    print(f"   📺 Channels: {stats['channels_processed']}")
-    print(f"   ✨ New messages: {stats['new_messages']}")
-    print(f"   ⏭️  Skipped (already indexed): {stats['skipped_messages']}")
-    print(f"   📨 Total processed: {stats['total_processed']}")
-
-    # Initialize and start the heartbeat engine!
-    heartbeat = HeartbeatEngine(
-        client=client,
-        config=HeartbeatConfig(
-            interval_seconds=5.0,      # 5-second heartbeat
-            spontaneous_chance=0.04,   # 4% when quiet
-            response_chance=0.20,      # 20% when there are messages
-            mention_chance=1.0,        # 100% when mentioned
-        ),
-        on_should_respond=handle_should_respond,
-        on_spontaneous=handle_spontaneous,
-    )
+    ingestion.start()
+    outbound.start()
+    note_rollup.start()
+    retention.start()
+
+    # Build the agents now, before anyone is waiting on a reply
+    await agent_pool.warmup()
+
+    if metrics_server and not metrics_server.is_running:
+        try:
+            await metrics_server.start()
+            print(f"📊 Metrics at http://{metrics_server.host}:{metrics_server.port}/metrics")
+        except OSError as e:
+            print(f"⚠️ Couldn't start the metrics endpoint: {e}")
+
+    # Initialize and start the heartbeat engine! (on_ready fires again on
+    # every reconnect - keep the one we already have)
+    if heartbeat is None:
+        heartbeat = HeartbeatEngine(
+            client=client,
+            config=HeartbeatConfig(
+                interval_seconds=5.0,      # 5-second heartbeat
+                spontaneous_chance=0.04,   # 4% when quiet
+                response_chance=0.20,      # 20% when there are messages
+                mention_chance=1.0,        # 100% when mentioned
+            ),
+            on_should_respond=handle_should_respond,
+            on_spontaneous=handle_spontaneous,
+            executor=ResponseExecutor(ExecutorConfig(
+                max_concurrency=8,          # LLM runs in flight at once
+                per_channel_concurrency=1,  # One reply at a time per channel
+            )),
+        )
     heartbeat.start()
 
+    # Backfill history in the background - we can bark while we read.
+    # A reconnect while a backfill is still running won't start another.
+    backfill.start(client)
+
     print(f"✨ Ready to cause chaos in {len(client.guilds)} server(s)!")
 
 
+def is_reply_to_puppy(message: discord.Message) -> bool:
+    """Check if a message is a reply to one of the puppy's messages."""
+    reference = message.reference
+    if reference is None or client.user is None:
+        return False
+    
+    if isinstance(reference.resolved, discord.Message):
+        return reference.resolved.author.id == client.user.id
+    
+    # Not resolved by Discord - maybe we remember it
+    if reference.message_id is not None:
+        cached = channel_cache.get(reference.channel_id, reference.message_id)
+        return cached is not None and cached.author_id == client.user.id
+    return False
+
+
 @client.event
 async def on_message(message: discord.Message) -> None:
     """Handle incoming messages with maximum chaos energy."""
     global heartbeat
     
+    GATEWAY_MESSAGES.inc()
+
+    # Remember everything for context - including our own replies
+    channel_cache.add(message)
+    
     # Don't respond to ourselves (infinite loop = bad puppy!)
     if message.author == client.user:
         return
@@ -190,32 +404,71 @@ async def on_message(message: discord.Message) -> None:
     if message.author.bot:
         return
 
-    # Track the user in our brain!
-    conn = await get_connection()
-    try:
-        await ensure_user_exists(
-            conn,
-            user_id=str(message.author.id),
-            username=message.author.name,
-            display_name=message.author.display_name,
-            mood="curious",  # We're always curious when meeting someone!
-        )
-        
-        # Index this message too!
-        message_hash = compute_message_hash(message)
-        await index_message(conn, message, message_hash)
-        await conn.commit()
-    finally:
-        await conn.close()
+    # Track the user + message in our brain (flushed in the background)
+    ingestion.submit(message, mood="curious")  # We're always curious when meeting someone!
 
-    # Check if we were mentioned
-    is_mention = client.user is not None and client.user.mentioned_in(message)
+    # Check if we were mentioned (a reply to the puppy counts too)
+    is_mention = client.user is not None and (
+        client.user.mentioned_in(message) or is_reply_to_puppy(message)
+    )
     
     # Queue the message for the heartbeat to consider
     if heartbeat:
         heartbeat.queue_message(message, is_mention=is_mention)
 
 
+@client.event
+async def on_raw_message_edit(payload: discord.RawMessageUpdateEvent) -> None:
+    """Keep cached context in sync with edits."""
+    if "content" in payload.data:
+        channel_cache.update(payload.channel_id, payload.message_id, payload.data["content"])
+
+
+@client.event
+async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent) -> None:
+    """Forget deleted messages."""
+    channel_cache.remove(payload.channel_id, [payload.message_id])
+
+
+@client.event
+async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent) -> None:
+    """Forget bulk-deleted messages."""
+    channel_cache.remove(payload.channel_id, payload.message_ids)
+
+
+async def shutdown() -> None:
+    """Release everything the puppy holds on to before exiting.
+
+    Every step runs even if an earlier one fails.
+    """
+    steps = [
+        ("heartbeat", lambda: heartbeat.stop(drain=True) if heartbeat else asyncio.sleep(0)),
+        # Let the last replies go out
+        ("outbound", lambda: outbound.stop(drain=True)),
+        ("backfill", backfill.stop),
+        ("note rollup", note_rollup.stop),
+        ("retention", retention.stop),
+        # Flush queued messages before the connections go away
+        ("ingestion", ingestion.stop),
+        ("brain connections", close_connection_manager),
+        ("metrics endpoint", lambda: metrics_server.stop() if metrics_server else asyncio.sleep(0)),
+    ]
+    for name, step in steps:
+        try:
+            await step()
+        except Exception:
+            logger.exception("❌ Shutdown step failed: %s", name)
+
+
+async def run_bot(token: str) -> None:
+    """Run the client until it disconnects, then shut down cleanly."""
+    try:
+        async with client:
+            await client.start(token)
+    finally:
+        await shutdown()
+
+
 def main() -> None:
     """Main entry point for the Discord Puppy bot."""
     token = os.getenv("DISCORD_TOKEN")
@@ -235,8 +488,15 @@ def main() -> None:
     print("🐕 Starting Discord Puppy...")
     print("🔑 Token found, connecting to Discord...")
 
+    # Queued logging - the event loop never waits on stderr
+    log_pipeline = setup_logging(LoggingConfig.from_env())
+    # discord.py retries 429s on its own and only logs them - count them
+    count_discord_rate_limits()
+
     try:
-        client.run(token)
+        asyncio.run(run_bot(token))
+    except KeyboardInterrupt:
+        print("💤 Puppy is going to sleep...")
     except discord.LoginFailure:
         print("❌ ERROR: Invalid Discord token!")
         print("Make sure your DISCORD_TOKEN is correct.")
@@ -249,6 +509,8 @@ def main() -> None:
         print("  2. Select your bot -> Bot -> Privileged Gateway Intents")
         print("  3. Enable 'MESSAGE CONTENT INTENT' and 'SERVER MEMBERS INTENT'")
         sys.exit(1)
+    finally:
+        log_pipeline.stop()
 
 
 if __name__ == "__main__":
@@ -6,8 +6,15 @@ Modules:
   - Chaotic personality
   - Fallback responses when AI not available
   - Spontaneous message generation
+- agent_pool.py: Pre-warmed, reusable agents
+  - Warmup at startup, size cap
+  - Recycled after N runs, max age, or a failed run
 """
 
 from discord_puppy.agents.puppy_agent import DiscordPuppyAgent, get_puppy_agent, create_puppy_agent
+from discord_puppy.agents.agent_pool import AgentPool, AgentPoolConfig, get_agent_pool, set_agent_pool
 
-__all__ = ["DiscordPuppyAgent", "get_puppy_agent", "create_puppy_agent"]
+__all__ = [
+    "DiscordPuppyAgent", "get_puppy_agent", "create_puppy_agent",
+    "AgentPool", "AgentPoolConfig", "get_agent_pool", "set_agent_pool",
+]
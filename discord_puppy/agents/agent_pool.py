@@ -0,0 +1,216 @@
+"""
+Agent Pool - A Kennel of Pre-Warmed Puppies 🐕🐕🐕
+
+Building a DiscordPuppyAgent isn't free: a fresh BaseAgent, tool
+resolution through TOOL_REGISTRY, and the pydantic-ai agent + model/MCP
+plumbing. Doing that on every reply put it squarely on the response path.
+
+Instead we keep a pool of agents that were built (and warmed) ahead of time:
+- warmup() builds `size` agents at startup
+- acquire() checks one out; a run never shares an agent with another run
+- Message history is cleared on check-in, so every run starts fresh
+- Agents are recycled after max_uses runs, max_age_seconds, or any
+  failed run - replacements are built in the background
+- Never more than max_size agents exist; extra callers wait their turn
+- Agents are built on a worker thread, outside the pool's lock - a
+  build never stalls the event loop or callers an idle agent could serve
+
+Usage:
+    async with get_agent_pool().acquire() as agent:
+        result = await agent.run_with_mcp(prompt)
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Optional
+
+from discord_puppy.agents.puppy_agent import DiscordPuppyAgent
+
+logger = logging.getLogger("discord_puppy.agent.pool")
+
+
+@dataclass
+class AgentPoolConfig:
+    """Configuration for the agent pool."""
+    size: int = 4                   # Warm agents kept ready
+    max_size: int = 8               # Hard cap on agents in existence
+    max_uses: int = 50              # Recycle after this many runs
+    max_age_seconds: float = 3600.0  # ...or after this long
+
+
+@dataclass
+class PooledAgent:
+    """An agent plus its bookkeeping."""
+    agent: DiscordPuppyAgent
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+
+class AgentPool:
+    """Pool of pre-initialized, reusable DiscordPuppyAgent instances."""
+
+    def __init__(
+        self,
+        config: Optional[AgentPoolConfig] = None,
+        factory: Callable[[], DiscordPuppyAgent] = DiscordPuppyAgent,
+    ):
+        """Initialize the agent pool.
+
+        Args:
+            config: Pool configuration (uses defaults if None)
+            factory: Builds a new (cold) agent
+        """
+        self.config = config or AgentPoolConfig()
+        self.factory = factory
+
+        self._idle: deque[PooledAgent] = deque()
+        self._total = 0  # idle + checked out + being built
+        self._available = asyncio.Condition()
+        self._replenishing: Optional[asyncio.Task] = None
+
+        # Stats
+        self._created = 0
+        self._recycled = 0
+        self._checkouts = 0
+        self._cold_checkouts = 0
+        self._total_wait_seconds = 0.0
+
+    def _build(self) -> PooledAgent:
+        """Build and warm one agent (the expensive part - runs on a worker thread)."""
+        agent = self.factory()
+        try:
+            # Resolves tools + builds the pydantic-ai agent now, not mid-reply
+            agent.reload_code_generation_agent()
+        except Exception as e:
+            # Still usable - run_with_mcp will build lazily
+            logger.warning("🐕 Agent warmup failed, will build on first run: %s", e)
+        return PooledAgent(agent=agent)
+
+    async def _build_reserved(self) -> PooledAgent:
+        """Build an agent whose slot in _total the caller already reserved.
+
+        The slot is given back if the build fails (or is cancelled).
+        """
+        try:
+            pooled = await asyncio.to_thread(self._build)
+        except BaseException:
+            async with self._available:
+                self._total -= 1
+                self._available.notify()
+            raise
+        self._created += 1
+        return pooled
+
+    def _is_expired(self, pooled: PooledAgent) -> bool:
+        return (
+            pooled.uses >= self.config.max_uses
+            or time.monotonic() - pooled.created_at >= self.config.max_age_seconds
+        )
+
+    async def warmup(self) -> None:
+        """Fill the pool up to `size` warm agents."""
+        while True:
+            async with self._available:
+                if self._total >= self.config.size:
+                    break
+                self._total += 1
+            pooled = await self._build_reserved()
+            async with self._available:
+                self._idle.append(pooled)
+                self._available.notify()
+        logger.info("🐕 Agent pool warm: %d agent(s) ready", len(self._idle))
+
+    def _schedule_replenish(self) -> None:
+        """Top the pool back up to `size` off the reply path."""
+        if self._replenishing is None or self._replenishing.done():
+            self._replenishing = asyncio.create_task(self.warmup())
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[DiscordPuppyAgent]:
+        """Check out an agent for exactly one run."""
+        started = time.perf_counter()
+        pooled: Optional[PooledAgent] = None
+        build = False
+
+        async with self._available:
+            while pooled is None and not build:
+                while self._idle:
+                    candidate = self._idle.popleft()
+                    if self._is_expired(candidate):
+                        self._total -= 1
+                        self._recycled += 1
+                        continue
+                    pooled = candidate
+                    break
+
+                if pooled is None and self._total < self.config.max_size:
+                    # Pool is dry but under the cap - reserve a slot, build below
+                    self._total += 1
+                    self._cold_checkouts += 1
+                    build = True
+                elif pooled is None:
+                    await self._available.wait()
+
+        if build:
+            pooled = await self._build_reserved()
+
+        self._checkouts += 1
+        self._total_wait_seconds += time.perf_counter() - started
+
+        healthy = True
+        try:
+            pooled.agent.clear_message_history()
+            yield pooled.agent
+        except BaseException:
+            healthy = False
+            raise
+        finally:
+            pooled.uses += 1
+            await self._release(pooled, healthy)
+
+    async def _release(self, pooled: PooledAgent, healthy: bool) -> None:
+        """Return an agent to the pool, or retire it."""
+        async with self._available:
+            if healthy and not self._is_expired(pooled):
+                pooled.agent.clear_message_history()
+                self._idle.append(pooled)
+            else:
+                self._total -= 1
+                self._recycled += 1
+                self._schedule_replenish()
+            self._available.notify()
+
+    def stats(self) -> dict:
+        """Pool statistics."""
+        avg_wait = self._total_wait_seconds / self._checkouts if self._checkouts else 0.0
+        return {
+            "idle": len(self._idle),
+            "total": self._total,
+            "created": self._created,
+            "recycled": self._recycled,
+            "checkouts": self._checkouts,
+            "cold_checkouts": self._cold_checkouts,
+            "avg_checkout_wait_ms": avg_wait * 1000,
+        }
+
+
+# Process-wide pool (created lazily)
+_agent_pool: Optional[AgentPool] = None
+
+
+def get_agent_pool() -> AgentPool:
+    """Get the process-wide agent pool, creating it if needed."""
+    global _agent_pool
+    if _agent_pool is None:
+        _agent_pool = AgentPool()
+    return _agent_pool
+
+
+def set_agent_pool(pool: AgentPool) -> None:
+    """Install a configured pool as the process-wide one."""
+    global _agent_pool
+    _agent_pool = pool
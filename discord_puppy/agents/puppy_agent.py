@@ -22,6 +22,7 @@ from discord_puppy.tools.memory_tools import (
     register_record_user_note,
     register_list_users,
     register_get_recent_messages,
+    register_get_indexing_status,
 )
 
 logger = logging.getLogger("discord_puppy.agent")
@@ -33,6 +34,7 @@ TOOL_REGISTRY["get_user_notes"] = register_get_user_notes
 TOOL_REGISTRY["record_user_note"] = register_record_user_note
 TOOL_REGISTRY["list_users"] = register_list_users
 TOOL_REGISTRY["get_recent_messages"] = register_get_recent_messages
+TOOL_REGISTRY["get_indexing_status"] = register_get_indexing_status
 
 
 class DiscordPuppyAgent(BaseAgent):
@@ -66,12 +68,16 @@ RULES:
 - Chill vibes. Use *actions* and emojis sparingly (🐕 🐾 ✨)
 - When doing tasks, use discord_send_message between tool calls to update chat.
 
+What you remember about the people talking is already in the prompt -
+only call get_user_notes for someone else.
+
 MEMORY TOOLS (use these to remember things!):
 - search_messages(query) - search past messages
 - get_user_notes(username) - get notes about a user
-- record_user_note(username, note) - save a note about someone
+- record_user_note(username, note, importance) - save one fact about someone (importance 1-5)
 - list_users() - see who you know
 - get_recent_messages() - see recent chat
+- get_indexing_status() - check if you've finished reading old chat history
 
 Be a good puppy - remember things about your friends! 🐕"""
 
@@ -85,6 +91,7 @@ Be a good puppy - remember things about your friends! 🐕"""
             "record_user_note",
             "list_users",
             "get_recent_messages",
+            "get_indexing_status",
         ]
 
 
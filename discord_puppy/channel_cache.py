@@ -0,0 +1,206 @@
+"""
+Channel Cache - The Puppy's Short-Term Memory 🐾💭
+
+build_channel_context used to ask Discord (over REST!) for the last few
+messages every single time the puppy opened its mouth. But the gateway
+already hands us every one of those messages in on_message - so we just
+remember them.
+
+How it works:
+- Each channel gets a bounded ring buffer (deque) of recent messages
+- on_message appends, edits update in place, deletes remove
+- A channel is "warm" once its buffer is known to be complete - either
+  seeded from REST once, or filled to capacity by live messages
+- Cold channels fall back to REST once, which seeds the buffer
+- A global cap evicts the least recently active channels, so memory
+  stays bounded no matter how many channels we're in
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+import discord
+
+
+@dataclass(slots=True)
+class CachedMessage:
+    """The bits of a message we need for context (not the whole object)."""
+    id: int
+    author_id: int
+    author_name: str
+    content: str
+    created_at: datetime
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> "CachedMessage":
+        return cls(
+            id=message.id,
+            author_id=message.author.id,
+            author_name=message.author.display_name,
+            content=message.content,
+            created_at=message.created_at,
+        )
+
+
+@dataclass
+class ChannelCacheConfig:
+    """Configuration for the channel message cache."""
+    per_channel: int = 50               # Ring buffer size per channel
+    max_total_messages: int = 20_000    # Global cap across all channels
+
+
+class ChannelMessageCache:
+    """Bounded per-channel ring buffers of recent messages."""
+
+    def __init__(self, config: Optional[ChannelCacheConfig] = None):
+        """Initialize the channel cache.
+
+        Args:
+            config: Cache configuration (uses defaults if None)
+        """
+        self.config = config or ChannelCacheConfig()
+
+        # channel_id -> ring buffer; ordered least -> most recently active
+        self._channels: OrderedDict[int, deque[CachedMessage]] = OrderedDict()
+        self._warm: set[int] = set()
+        self._total = 0
+
+        # Stats
+        self._hits = 0
+        self._misses = 0
+
+    def _buffer(self, channel_id: int) -> deque[CachedMessage]:
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            buffer = deque(maxlen=self.config.per_channel)
+            self._channels[channel_id] = buffer
+        else:
+            self._channels.move_to_end(channel_id)
+        return buffer
+
+    def _enforce_global_cap(self) -> None:
+        """Evict whole channels, least recently active first."""
+        while self._total > self.config.max_total_messages and len(self._channels) > 1:
+            channel_id, buffer = self._channels.popitem(last=False)
+            self._total -= len(buffer)
+            self._warm.discard(channel_id)
+
+    def add(self, message: discord.Message) -> None:
+        """Remember a message that just arrived on the gateway."""
+        buffer = self._buffer(message.channel.id)
+        if len(buffer) < buffer.maxlen:
+            self._total += 1
+        buffer.append(CachedMessage.from_message(message))
+
+        # A full buffer of live messages is complete by construction
+        if len(buffer) == buffer.maxlen:
+            self._warm.add(message.channel.id)
+
+        self._enforce_global_cap()
+
+    def update(self, channel_id: int, message_id: int, content: str) -> None:
+        """Apply an edit to a cached message (no-op if we don't have it)."""
+        cached = self.get(channel_id, message_id)
+        if cached is not None:
+            cached.content = content
+
+    def remove(self, channel_id: int, message_ids: Iterable[int]) -> None:
+        """Forget deleted messages."""
+        buffer = self._channels.get(channel_id)
+        if not buffer:
+            return
+
+        doomed = set(message_ids)
+        kept = [cached for cached in buffer if cached.id not in doomed]
+        self._total -= len(buffer) - len(kept)
+        buffer.clear()
+        buffer.extend(kept)
+
+    def seed(self, channel_id: int, messages: Iterable[discord.Message]) -> None:
+        """Fill a cold channel from a REST fetch and mark it warm.
+
+        Merges with anything that arrived live in the meantime.
+
+        Args:
+            channel_id: Channel the messages belong to
+            messages: Up to per_channel of the newest messages, any order
+        """
+        buffer = self._buffer(channel_id)
+        merged = {cached.id: cached for cached in buffer}
+        for message in messages:
+            merged.setdefault(message.id, CachedMessage.from_message(message))
+
+        self._total -= len(buffer)
+        buffer.clear()
+        buffer.extend(sorted(merged.values(), key=lambda cached: cached.id))
+        self._total += len(buffer)
+
+        self._warm.add(channel_id)
+        self._enforce_global_cap()
+
+    def get(self, channel_id: int, message_id: int) -> Optional[CachedMessage]:
+        """Look up a single cached message (None if we don't have it)."""
+        for cached in self._channels.get(channel_id, ()):
+            if cached.id == message_id:
+                return cached
+        return None
+
+    def recent(self, channel_id: int, limit: int) -> Optional[list[CachedMessage]]:
+        """Get the last `limit` messages, oldest first - if we can trust the cache.
+
+        Returns:
+            The messages, or None if the channel is cold (caller should
+            fall back to REST)
+        """
+        if limit > self.config.per_channel or channel_id not in self._warm:
+            return None
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            return None
+        return list(buffer)[-limit:] if limit > 0 else []
+
+    async def get_recent(
+        self,
+        channel: discord.abc.Messageable,
+        limit: int = 10,
+    ) -> list[CachedMessage]:
+        """Recent messages for a channel, oldest first.
+
+        Served from memory when warm; otherwise one REST history call,
+        which also warms the cache for next time.
+
+        Args:
+            channel: The channel to read
+            limit: How many messages
+
+        Returns:
+            Up to `limit` messages, oldest first
+        """
+        channel_id = getattr(channel, "id", None)
+        if channel_id is not None:
+            cached = self.recent(channel_id, limit)
+            if cached is not None:
+                self._hits += 1
+                return cached
+
+        self._misses += 1
+        fetch_limit = max(limit, self.config.per_channel) if channel_id is not None else limit
+        messages = [msg async for msg in channel.history(limit=fetch_limit)]
+
+        if channel_id is None or fetch_limit > self.config.per_channel:
+            return [CachedMessage.from_message(m) for m in reversed(messages)][-limit:]
+
+        self.seed(channel_id, messages)
+        return self.recent(channel_id, limit) or []
+
+    def stats(self) -> dict:
+        """Cache statistics."""
+        return {
+            "channels": len(self._channels),
+            "warm_channels": len(self._warm),
+            "messages": self._total,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
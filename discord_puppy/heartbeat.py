@@ -5,9 +5,15 @@ This module controls when the puppy speaks! It implements a heartbeat
 system that decides whether to bark based on:
 
 - 5-second heartbeat interval
-- 4% spontaneous message chance (if no one's talking)
+- 4% spontaneous message chance per beat - ONE roll for the whole bot,
+  not one per channel - in a quiet channel that was active recently
+  and hasn't had a spontaneous message within the cooldown
 - 20% base response chance (if there are new messages)
-- 100% response chance (if directly mentioned)
+- 100% response chance (if directly mentioned) - and mentions don't
+  wait for the next beat, they wake the heartbeat immediately
+
+Everything below is tracked PER CHANNEL - a busy channel can't crowd
+out a quiet one, and each channel gets its own dice roll.
 
 Engagement System 📈:
 - When a response roll fails, boost chance by +15% for next message
@@ -20,7 +26,9 @@ Pure chaos, but controlled chaos. Like a puppy on a leash.
 """
 
 import asyncio
+import logging
 import random
+import time
 from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -28,6 +36,32 @@ from typing import Optional, Callable, Awaitable
 
 import discord
 
+from discord_puppy import metrics
+from discord_puppy.response_executor import JobPriority, ResponseExecutor, WaitTimes
+
+logger = logging.getLogger("discord_puppy.heartbeat")
+# Per-channel chatter - rate limited by logging_setup
+engagement_logger = logging.getLogger("discord_puppy.heartbeat.engagement")
+rolls_logger = logging.getLogger("discord_puppy.heartbeat.rolls")
+
+TICK_SECONDS = metrics.histogram(
+    "puppy_heartbeat_tick_seconds", "Time spent deciding, per heartbeat (tick) or early mention wakeup",
+    ["kind"], buckets=metrics.DB_BUCKETS,
+)
+DECISIONS = metrics.counter(
+    "puppy_heartbeat_decisions_total", "Heartbeat decisions: mention, roll_won, roll_lost, spontaneous",
+    ["decision"],
+)
+DROPPED_PENDING = metrics.counter(
+    "puppy_heartbeat_dropped_messages_total", "Messages pushed out of a full per-channel pending queue",
+)
+_TICK = TICK_SECONDS.labels("tick")
+_MENTION_WAKEUP = TICK_SECONDS.labels("mentions")
+_DECIDED_MENTION = DECISIONS.labels("mention")
+_DECIDED_ROLL_WON = DECISIONS.labels("roll_won")
+_DECIDED_ROLL_LOST = DECISIONS.labels("roll_lost")
+_DECIDED_SPONTANEOUS = DECISIONS.labels("spontaneous")
+
 
 @dataclass
 class PendingMessage:
@@ -35,6 +69,7 @@ class PendingMessage:
     message: discord.Message
     is_mention: bool
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    queued_at: float = field(default_factory=time.monotonic)
 
 
 @dataclass
@@ -44,23 +79,48 @@ class HeartbeatConfig:
     spontaneous_chance: float = 0.04  # 4% when no messages
     response_chance: float = 0.20     # 20% when there are messages
     mention_chance: float = 1.0       # 100% when directly mentioned
-    
+
     # Engagement system - builds up when we stay quiet, decays over time
     engagement_boost_amount: float = 0.15   # +15% per failed roll
     engagement_decay_amount: float = 0.15   # -15% per decay tick
     engagement_decay_seconds: float = 30.0  # Decay every 30 seconds
     engagement_max_boost: float = 0.60      # Cap at +60% (so max 80% total)
 
+    # Per-channel bookkeeping
+    max_pending_per_channel: int = 100         # Oldest dropped beyond this
+    spontaneous_window_seconds: float = 600.0  # Quiet channels stay eligible this long
+    spontaneous_cooldown_seconds: float = 300.0  # Min gap between spontaneous messages in one channel
+
+
+@dataclass
+class ChannelState:
+    """Everything the heartbeat tracks for one channel."""
+    channel: discord.abc.Messageable
+    pending: deque[PendingMessage]
+    engagement_boost: float = 0.0
+    last_decay_time: datetime = field(default_factory=datetime.utcnow)
+    last_activity: datetime = field(default_factory=datetime.utcnow)
+    last_spontaneous: Optional[datetime] = None
+
+    @property
+    def name(self) -> str:
+        return getattr(self.channel, "name", "DM")
+
 
 class HeartbeatEngine:
     """The chaos pulse that controls when the puppy speaks.
-    
+
     This engine runs a background loop that checks every N seconds
-    whether the puppy should say something. The decision is based on:
-    
-    1. Were there any new messages since the last heartbeat?
+    whether the puppy should say something. Every channel is judged on
+    its own - its own pending messages, its own dice roll, its own
+    engagement boost:
+
+    1. Were there any new messages in this channel since the last heartbeat?
     2. Was the puppy directly mentioned?
     3. Roll the dice based on the configured chances!
+
+    Only channels with pending messages are rolled for responses, so a
+    tick costs O(active channels), not O(every channel we've ever seen).
     """
 
     def __init__(
@@ -68,150 +128,290 @@ class HeartbeatEngine:
         client: discord.Client,
         config: Optional[HeartbeatConfig] = None,
         on_should_respond: Optional[Callable[[list[PendingMessage]], Awaitable[None]]] = None,
-        on_spontaneous: Optional[Callable[[], Awaitable[None]]] = None,
+        on_spontaneous: Optional[Callable[[discord.abc.Messageable], Awaitable[None]]] = None,
+        executor: Optional[ResponseExecutor] = None,
     ):
         """Initialize the heartbeat engine.
-        
+
         Args:
             client: Discord client instance
             config: Heartbeat configuration (uses defaults if None)
             on_should_respond: Callback when puppy should respond to messages
+                (always messages from a single channel)
             on_spontaneous: Callback when puppy should say something random
+                in the given channel
+            executor: Runs the callbacks with bounded concurrency (a
+                default ResponseExecutor if None)
         """
         self.client = client
         self.config = config or HeartbeatConfig()
         self.on_should_respond = on_should_respond
         self.on_spontaneous = on_spontaneous
-        
-        # Message queue - messages seen since last heartbeat
-        self._pending_messages: deque[PendingMessage] = deque(maxlen=100)
-        
+        self.executor = executor or ResponseExecutor()
+
+        # Per-channel state, plus the set of channels with pending messages
+        self._channels: dict[int, ChannelState] = {}
+        self._dirty: set[int] = set()
+        self._mention_channels: set[int] = set()
+
+        # Mentions skip the wait for the next tick
+        self._wakeup = asyncio.Event()
+
+        # Messages pushed out of a full pending queue
+        self._dropped_pending = 0
+
+        # Latency from message arrival -> decision, and -> reply sent
+        self._decision_latency = {"mention": WaitTimes(), "response": WaitTimes()}
+        self._reply_latency = {"mention": WaitTimes(), "response": WaitTimes()}
+
         # State tracking
         self._running = False
         self._task: Optional[asyncio.Task] = None
         self._last_heartbeat: Optional[datetime] = None
-        
-        # Track the last channel we saw activity in (for spontaneous messages)
+
+        # Track the last channel we saw activity in (anywhere)
         self._last_active_channel: Optional[discord.TextChannel] = None
-        
-        # Engagement system - builds up when ignored, decays over time
-        self._engagement_boost: float = 0.0
-        self._last_decay_time: datetime = datetime.utcnow()
+
+    def _state_for(self, channel: discord.abc.Messageable) -> ChannelState:
+        state = self._channels.get(channel.id)
+        if state is None:
+            state = ChannelState(
+                channel=channel,
+                pending=deque(maxlen=self.config.max_pending_per_channel),
+            )
+            self._channels[channel.id] = state
+        return state
 
     def queue_message(self, message: discord.Message, is_mention: bool = False) -> None:
-        """Add a message to the pending queue.
-        
+        """Add a message to its channel's pending queue.
+
         Called by the message handler whenever a new message comes in.
-        
+        Mentions (and replies to the puppy) wake the heartbeat right away
+        instead of waiting up to interval_seconds for the next tick.
+
         Args:
             message: The Discord message
-            is_mention: Whether the puppy was directly mentioned
+            is_mention: Whether the puppy was directly mentioned (or replied to)
         """
-        self._pending_messages.append(PendingMessage(
+        state = self._state_for(message.channel)
+        if len(state.pending) == state.pending.maxlen:
+            self._dropped_pending += 1  # The oldest falls off the deque
+            DROPPED_PENDING.inc()
+        state.pending.append(PendingMessage(
             message=message,
             is_mention=is_mention,
         ))
+        state.channel = message.channel
+        state.last_activity = datetime.utcnow()
+
+        self._dirty.add(message.channel.id)
+        if is_mention:
+            self._mention_channels.add(message.channel.id)
+            self._wakeup.set()
         self._last_active_channel = message.channel
 
     def start(self) -> None:
         """Start the heartbeat loop."""
         if self._running:
             return
-        
+
         self._running = True
+        self.executor.start()
         self._task = asyncio.create_task(self._heartbeat_loop())
-        print(f"💓 Heartbeat started! Interval: {self.config.interval_seconds}s")
+        logger.info("💓 Heartbeat started! Interval: %ss", self.config.interval_seconds)
+
+    async def stop(self, drain: bool = True, timeout: float = 10.0) -> None:
+        """Stop the heartbeat loop and wind down in-flight responses.
 
-    def stop(self) -> None:
-        """Stop the heartbeat loop."""
+        Args:
+            drain: Let queued/in-flight responses finish (up to timeout)
+                instead of cancelling them
+            timeout: Max seconds to wait when draining
+        """
         self._running = False
         if self._task:
             self._task.cancel()
             self._task = None
-        print("💔 Heartbeat stopped.")
+        await self.executor.stop(drain=drain, timeout=timeout)
+        logger.info("💔 Heartbeat stopped.")
 
     async def _heartbeat_loop(self) -> None:
-        """The main heartbeat loop - runs every N seconds."""
+        """The main heartbeat loop - ticks every N seconds, wakes early for mentions."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.config.interval_seconds
         while self._running:
             try:
-                await asyncio.sleep(self.config.interval_seconds)
-                await self._process_heartbeat()
+                remaining = next_tick - loop.time()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                self._wakeup.clear()
+
+                if loop.time() >= next_tick:
+                    with _TICK.time():
+                        await self._process_heartbeat()
+                    next_tick = loop.time() + self.config.interval_seconds
+                else:
+                    # Woken early - only the channels with a mention
+                    with _MENTION_WAKEUP.time():
+                        self._process_mentions()
             except asyncio.CancelledError:
                 break
-            except Exception as e:
-                print(f"❌ Heartbeat error: {e}")
+            except Exception:
+                logger.exception("❌ Heartbeat error")
                 # Don't crash the loop on errors
                 continue
 
-    def _apply_engagement_decay(self) -> None:
-        """Decay the engagement boost over time."""
+    def _process_mentions(self) -> None:
+        """Decide right now for channels where the puppy was mentioned.
+
+        Ordinary chatter elsewhere keeps waiting for the regular tick.
+        """
         now = datetime.utcnow()
-        elapsed = (now - self._last_decay_time).total_seconds()
-        
+        channels = self._mention_channels
+        self._mention_channels = set()
+
+        for channel_id in channels:
+            self._dirty.discard(channel_id)
+            state = self._channels.get(channel_id)
+            if state is not None and state.pending:
+                self._process_channel(state, now)
+
+    def _apply_engagement_decay(self, state: ChannelState, now: datetime) -> None:
+        """Decay a channel's engagement boost over time."""
+        elapsed = (now - state.last_decay_time).total_seconds()
+
         # How many decay ticks have passed?
         decay_ticks = int(elapsed / self.config.engagement_decay_seconds)
-        
-        if decay_ticks > 0 and self._engagement_boost > 0:
-            old_boost = self._engagement_boost
+
+        if decay_ticks > 0 and state.engagement_boost > 0:
+            old_boost = state.engagement_boost
             decay_amount = decay_ticks * self.config.engagement_decay_amount
-            self._engagement_boost = max(0.0, self._engagement_boost - decay_amount)
-            self._last_decay_time = now
-            
-            if old_boost != self._engagement_boost:
-                print(f"📉 Engagement decayed: {old_boost:.0%} → {self._engagement_boost:.0%}")
-
-    def _boost_engagement(self) -> None:
-        """Increase engagement boost after a failed roll."""
-        old_boost = self._engagement_boost
-        self._engagement_boost = min(
+            state.engagement_boost = max(0.0, state.engagement_boost - decay_amount)
+            state.last_decay_time = now
+
+            if old_boost != state.engagement_boost:
+                engagement_logger.info(
+                    "📉 #%s engagement decayed: %.0f%% → %.0f%%",
+                    state.name, old_boost * 100, state.engagement_boost * 100,
+                )
+
+    def _boost_engagement(self, state: ChannelState) -> None:
+        """Increase a channel's engagement boost after a failed roll."""
+        old_boost = state.engagement_boost
+        state.engagement_boost = min(
             self.config.engagement_max_boost,
-            self._engagement_boost + self.config.engagement_boost_amount
+            state.engagement_boost + self.config.engagement_boost_amount
+        )
+        engagement_logger.info(
+            "📈 #%s engagement boosted: %.0f%% → %.0f%%",
+            state.name, old_boost * 100, state.engagement_boost * 100,
         )
-        print(f"📈 Engagement boosted: {old_boost:.0%} → {self._engagement_boost:.0%}")
 
-    def _reset_engagement(self) -> None:
-        """Reset engagement boost after responding."""
-        if self._engagement_boost > 0:
-            print(f"🔄 Engagement reset: {self._engagement_boost:.0%} → 0%")
-            self._engagement_boost = 0.0
+    def _reset_engagement(self, state: ChannelState) -> None:
+        """Reset a channel's engagement boost after responding."""
+        if state.engagement_boost > 0:
+            engagement_logger.info("🔄 #%s engagement reset: %.0f%% → 0%%", state.name, state.engagement_boost * 100)
+            state.engagement_boost = 0.0
 
-    @property
-    def effective_response_chance(self) -> float:
-        """Get the current response chance including engagement boost."""
-        return min(1.0, self.config.response_chance + self._engagement_boost)
+    def effective_response_chance(self, channel_id: int) -> float:
+        """Get a channel's current response chance including engagement boost."""
+        state = self._channels.get(channel_id)
+        boost = state.engagement_boost if state else 0.0
+        return min(1.0, self.config.response_chance + boost)
 
     async def _process_heartbeat(self) -> None:
-        """Process a single heartbeat - decide whether to speak!"""
-        self._last_heartbeat = datetime.utcnow()
-        
+        """Process a single heartbeat - decide, per channel, whether to speak!"""
+        now = datetime.utcnow()
+        self._last_heartbeat = now
+
+        # Grab the channels that have something pending and clear the set
+        active = self._dirty
+        self._dirty = set()
+        self._mention_channels.clear()
+
+        for channel_id in active:
+            state = self._channels.get(channel_id)
+            if state is not None and state.pending:
+                self._process_channel(state, now)
+
+        # Quiet channels: forget long-idle ones, the rest decay and may go spontaneous
+        window = self.config.spontaneous_window_seconds
+        cooldown = self.config.spontaneous_cooldown_seconds
+        quiet: list[tuple[int, ChannelState]] = []
+        for channel_id, state in list(self._channels.items()):
+            if channel_id in active:
+                continue
+
+            # Long idle = no longer spontaneous-eligible, and any boost has
+            # long since decayed away, so there's nothing left to track
+            if (now - state.last_activity).total_seconds() > window:
+                del self._channels[channel_id]
+                continue
+
+            self._apply_engagement_decay(state, now)
+
+            if state.last_spontaneous is None or (now - state.last_spontaneous).total_seconds() >= cooldown:
+                quiet.append((channel_id, state))
+
+        # Rule 3: No messages = 4% spontaneous chance - one roll per beat,
+        # however many channels are quiet
+        if not quiet:
+            return
+        roll = random.random()
+        if roll < self.config.spontaneous_chance:
+            channel_id, state = random.choice(quiet)
+            state.last_spontaneous = now
+            _DECIDED_SPONTANEOUS.inc()
+            logger.info(
+                "✨ Spontaneous message in #%s! (roll=%.2f, threshold=%s)",
+                state.name, roll, self.config.spontaneous_chance,
+            )
+            if self.on_spontaneous:
+                self.executor.submit(
+                    JobPriority.SPONTANEOUS,
+                    channel_id,
+                    lambda channel=state.channel: self.on_spontaneous(channel),
+                )
+
+    def _process_channel(self, state: ChannelState, now: datetime) -> None:
+        """Roll the dice for one channel's pending messages."""
         # Apply engagement decay first
-        self._apply_engagement_decay()
-        
-        # Grab all pending messages and clear the queue
-        pending = list(self._pending_messages)
-        self._pending_messages.clear()
-        
+        self._apply_engagement_decay(state, now)
+
+        # Grab this channel's pending messages and clear its queue
+        pending = list(state.pending)
+        state.pending.clear()
+
         # Check if we were directly mentioned in any message
         mentions = [m for m in pending if m.is_mention]
         non_mentions = [m for m in pending if not m.is_mention]
-        
+
         # Decision time! 🎲
         should_respond = False
         response_messages: list[PendingMessage] = []
-        
+        priority = JobPriority.RESPONSE
+
         # Rule 1: Direct mentions = 100% response
         if mentions:
             roll = random.random()
             if roll < self.config.mention_chance:
                 should_respond = True
                 response_messages = mentions  # Respond to all mentions
-                print(f"💬 Mention detected! (roll={roll:.2f}, threshold={self.config.mention_chance})")
-        
+                priority = JobPriority.MENTION  # ...and jump the queue
+                _DECIDED_MENTION.inc()
+                logger.info(
+                    "💬 Mention detected in #%s! (roll=%.2f, threshold=%s)",
+                    state.name, roll, self.config.mention_chance,
+                )
+
         # Rule 2: Non-mention messages = base chance + engagement boost
         if non_mentions and not should_respond:
             roll = random.random()
-            effective_chance = self.effective_response_chance
-            
+            effective_chance = min(1.0, self.config.response_chance + state.engagement_boost)
+
             if roll < effective_chance:
                 should_respond = True
                 # Pick a random subset of messages to respond to (max 3)
@@ -219,34 +419,86 @@ class HeartbeatEngine:
                     non_mentions, 
                     min(len(non_mentions), 3)
                 )
-                print(f"🎲 Response roll succeeded! (roll={roll:.2f}, threshold={effective_chance:.0%} [base={self.config.response_chance:.0%} + boost={self._engagement_boost:.0%}])")
+                _DECIDED_ROLL_WON.inc()
+                rolls_logger.info(
+                    "🎲 #%s response roll succeeded! (roll=%.2f, threshold=%.0f%% [base=%.0f%% + boost=%.0f%%])",
+                    state.name, roll, effective_chance * 100,
+                    self.config.response_chance * 100, state.engagement_boost * 100,
+                )
                 # Reset engagement on successful response
-                self._reset_engagement()
+                self._reset_engagement(state)
             else:
-                print(f"🎲 Response roll failed. (roll={roll:.2f}, threshold={effective_chance:.0%} [base={self.config.response_chance:.0%} + boost={self._engagement_boost:.0%}])")
+                rolls_logger.info(
+                    "🎲 #%s response roll failed. (roll=%.2f, threshold=%.0f%% [base=%.0f%% + boost=%.0f%%])",
+                    state.name, roll, effective_chance * 100,
+                    self.config.response_chance * 100, state.engagement_boost * 100,
+                )
+                _DECIDED_ROLL_LOST.inc()
                 # Boost engagement for next time!
-                self._boost_engagement()
-        
-        # Rule 3: No messages = 4% spontaneous chance
-        if not pending:
-            roll = random.random()
-            if roll < self.config.spontaneous_chance:
-                print(f"✨ Spontaneous message! (roll={roll:.2f}, threshold={self.config.spontaneous_chance})")
-                if self.on_spontaneous:
-                    # Fire-and-forget so multiple can be in-flight!
-                    asyncio.create_task(self.on_spontaneous())
-                return
-        
+                self._boost_engagement(state)
+
         # Execute the response if we should
         if should_respond and response_messages and self.on_should_respond:
-            # Fire-and-forget so multiple responses can be in-flight!
-            asyncio.create_task(self.on_should_respond(response_messages))
+            kind = "mention" if priority == JobPriority.MENTION else "response"
+            self._decision_latency[kind].record(time.monotonic() - response_messages[0].queued_at)
+
+            # Queued on the executor - bounded, prioritized, deadline-aware
+            self.executor.submit(
+                priority,
+                state.channel.id,
+                lambda: self.on_should_respond(response_messages),
+            )
+
+    def record_reply(self, pending_messages: list[PendingMessage]) -> None:
+        """Record time-to-reply once a response has actually been sent.
+
+        Measured from the earliest message being responded to.
+        """
+        if not pending_messages:
+            return
+        kind = "mention" if any(pm.is_mention for pm in pending_messages) else "response"
+        earliest = min(pm.queued_at for pm in pending_messages)
+        self._reply_latency[kind].record(time.monotonic() - earliest)
+
+    def latency_stats(self) -> dict:
+        """Arrival -> decision and arrival -> reply latency, by kind."""
+        return {
+            "decision": {kind: waits.as_dict() for kind, waits in self._decision_latency.items()},
+            "reply": {kind: waits.as_dict() for kind, waits in self._reply_latency.items()},
+        }
+
+    def pending_depths(self) -> dict[int, int]:
+        """Pending message count per channel (only channels with pending)."""
+        return {
+            channel_id: len(self._channels[channel_id].pending)
+            for channel_id in self._dirty
+            if channel_id in self._channels
+        }
+
+    @property
+    def dropped_messages(self) -> int:
+        """Messages pushed out of a full pending queue (never decided on)."""
+        return self._dropped_pending
+
+    @property
+    def channel_count(self) -> int:
+        """Number of channels currently tracked."""
+        return len(self._channels)
 
     @property
     def last_active_channel(self) -> Optional[discord.TextChannel]:
         """Get the last channel where activity was seen."""
         return self._last_active_channel
 
+    @property
+    def has_pending_mention(self) -> bool:
+        """Check if a mention is still waiting on its reply.
+
+        True from the moment a mention arrives until its reply has been
+        sent (or the job failed, timed out or was dropped).
+        """
+        return bool(self._mention_channels) or self.executor.outstanding(JobPriority.MENTION) > 0
+
     @property
     def is_running(self) -> bool:
         """Check if the heartbeat is running."""
@@ -0,0 +1,249 @@
+"""
+Logging Setup - Barking Without Blocking 🐕📝
+
+The heartbeat, the engagement system and the indexer used to print()
+straight to stdout from the event loop - every tick, every channel,
+every dice roll. A slow terminal or a full pipe stalled the whole bot.
+
+Now every record goes onto an in-memory queue and a background thread
+writes it:
+
+- The event loop only pays for a put_nowait() - if the writer falls
+  behind and the queue fills up, records are dropped (and counted)
+  rather than waited on
+- Per-subsystem levels: PUPPY_LOG_LEVELS="heartbeat=DEBUG,memory=WARNING"
+  (short names are under discord_puppy., "discord.*" is discord.py)
+- Chatty loggers (engagement changes, dice rolls) are rate limited - a
+  token bucket per message template, and the next record that gets
+  through says how many similar ones were suppressed
+
+Usage:
+    pipeline = setup_logging(LoggingConfig.from_env())
+    ...
+    pipeline.stop()     # Flush whatever is still queued
+"""
+
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+
+from discord_puppy import metrics
+
+DEFAULT_FORMAT = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+
+RECORDS_DROPPED = metrics.counter(
+    "puppy_log_records_dropped_total", "Log records dropped because the log queue was full",
+)
+RECORDS_SUPPRESSED = metrics.counter(
+    "puppy_log_records_suppressed_total", "Log records suppressed by a rate limit", ["logger"],
+)
+QUEUE_DEPTH = metrics.gauge(
+    "puppy_log_queue_depth", "Log records waiting for the background writer",
+)
+
+
+@dataclass
+class RateLimit:
+    """Token bucket for one logger - per message template."""
+    per_second: float = 1.0  # Sustained records per second
+    burst: int = 10          # Records allowed back to back before limiting
+
+
+def _default_rate_limits() -> dict[str, RateLimit]:
+    return {
+        "heartbeat.engagement": RateLimit(per_second=1.0, burst=10),
+        "heartbeat.rolls": RateLimit(per_second=2.0, burst=20),
+    }
+
+
+@dataclass
+class LoggingConfig:
+    """Configuration for the logging pipeline."""
+    level: str = "INFO"                                        # Root level
+    levels: dict[str, str] = field(default_factory=dict)       # Per-subsystem overrides
+    rate_limits: dict[str, RateLimit] = field(default_factory=_default_rate_limits)
+    format: str = DEFAULT_FORMAT
+    queue_size: int = 10_000                                   # Records buffered before dropping
+    stream: Optional[TextIO] = None                            # Defaults to stderr
+
+    @classmethod
+    def from_env(cls) -> "LoggingConfig":
+        """Read PUPPY_LOG_LEVEL and PUPPY_LOG_LEVELS ("name=LEVEL,...")."""
+        levels = {}
+        for item in os.getenv("PUPPY_LOG_LEVELS", "").split(","):
+            name, _, level = item.partition("=")
+            if name.strip() and level.strip():
+                levels[name.strip()] = level.strip().upper()
+        return cls(level=os.getenv("PUPPY_LOG_LEVEL", "INFO").upper(), levels=levels)
+
+
+def logger_name(name: str) -> str:
+    """Expand a short subsystem name ("heartbeat") to its logger name."""
+    if name == "discord" or name.startswith(("discord.", "discord_puppy")):
+        return name
+    return f"discord_puppy.{name}"
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that never waits on a full queue.
+
+    Like the stdlib handler, the message is rendered up front and the
+    args cleared, so the queued record holds no references to (possibly
+    mutable) caller objects. So is the traceback, which would otherwise
+    keep the failing frames alive while the record waits in the queue.
+    Timestamps, level names and the final line layout are still the
+    writer thread's job.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            RECORDS_DROPPED.inc()
+
+
+class RateLimitFilter(logging.Filter):
+    """Rate limits a logger, one token bucket per message template.
+
+    Templates rather than final messages, so "#general boosted 15%" and
+    "#random boosted 30%" share a bucket. Suppressed records are counted
+    and reported on the next record from the same template.
+    """
+
+    def __init__(self, limit: RateLimit):
+        super().__init__()
+        self.limit = limit
+        self.suppressed = 0
+        self._buckets: dict[object, list] = {}  # template -> [tokens, last refill, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.msg)
+            if bucket is None:
+                bucket = self._buckets[record.msg] = [float(self.limit.burst), now, 0]
+            tokens = min(self.limit.burst, bucket[0] + (now - bucket[1]) * self.limit.per_second)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.suppressed += 1
+                RECORDS_SUPPRESSED.labels(record.name).inc()
+                return False
+            bucket[0] = tokens - 1.0
+            skipped, bucket[2] = bucket[2], 0
+        if skipped:
+            record.msg = f"{record.msg} ({skipped} similar suppressed)"
+        return True
+
+
+class _Listener(QueueListener):
+    """QueueListener whose stop() waits for room instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class LoggingPipeline:
+    """The installed queue handler, its background writer and the filters."""
+
+    def __init__(self, config: LoggingConfig):
+        self.config = config
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, config.queue_size))
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.output = logging.StreamHandler(config.stream or sys.stderr)
+        self.output.setFormatter(logging.Formatter(config.format))
+        self.listener = _Listener(self.queue, self.output, respect_handler_level=True)
+        self.filters: dict[str, RateLimitFilter] = {}
+        self._running = False
+
+    def install(self) -> None:
+        """Route the root logger through the queue and apply levels and limits."""
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(self.config.level)
+
+        for name, level in self.config.levels.items():
+            logging.getLogger(logger_name(name)).setLevel(level)
+
+        for name, limit in self.config.rate_limits.items():
+            limited = RateLimitFilter(limit)
+            logging.getLogger(logger_name(name)).addFilter(limited)
+            self.filters[logger_name(name)] = limited
+
+        self.listener.start()
+        self._running = True
+
+    def stop(self) -> None:
+        """Flush queued records, stop the writer and detach from the root logger."""
+        root = logging.getLogger()
+        if self.handler in root.handlers:
+            root.removeHandler(self.handler)
+        for name, limited in self.filters.items():
+            logging.getLogger(name).removeFilter(limited)
+        self.filters.clear()
+        if self._running:
+            self._running = False
+            self.listener.stop()
+        self.output.flush()
+
+    def stats(self) -> dict:
+        """Queue depth, dropped and suppressed record counts."""
+        return {
+            "queued": self.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "suppressed": {name: f.suppressed for name, f in self.filters.items()},
+        }
+
+
+# Process-wide pipeline (installed by setup_logging)
+_pipeline: Optional[LoggingPipeline] = None
+
+
+def get_logging_pipeline() -> Optional[LoggingPipeline]:
+    """Get the installed logging pipeline, if any."""
+    return _pipeline
+
+
+def setup_logging(config: Optional[LoggingConfig] = None) -> LoggingPipeline:
+    """Install the queued logging pipeline, replacing any earlier one.
+
+    Args:
+        config: Levels, rate limits and output (uses defaults if None)
+
+    Returns:
+        The installed pipeline - stop() it on shutdown to flush
+    """
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+    _pipeline = LoggingPipeline(config or LoggingConfig())
+    _pipeline.install()
+    return _pipeline
+
+
+@metrics.on_collect
+def _collect_queue_depth() -> None:
+    QUEUE_DEPTH.set(_pipeline.queue.qsize() if _pipeline is not None else 0)
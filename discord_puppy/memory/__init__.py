@@ -2,36 +2,138 @@
 Memory subsystem - The SQLite brain that never forgets! 🧠
 
 Modules:
-- database.py: Schema and connection management
+- database.py: Schema and connection management (writer + reader pool)
 - message_indexer.py: Message history indexing with hash deduplication
-- user_notes.py: CRUD operations for user memories (TODO)
+- ingestion.py: Write-behind batching for live messages
+- search.py: FTS5 full-text message search
+- backfill.py: Background history backfill with progress/readiness
+- user_cache.py: LRU/TTL cache of user memories for prompt injection
+- users.py: Indexed user resolution (ID, mention, exact name, fuzzy)
+- user_notes.py: Per-note storage, top-N reads and budgeted rollups
+- retention.py: Age/row-count retention, compressed archive, incremental vacuum
 - memory_tools.py: LLM-callable tools for memory access (TODO)
 """
 
 from discord_puppy.memory.database import (
+    ConnectionConfig,
+    ConnectionManager,
     init_database,
     get_connection,
+    get_connection_manager,
+    configure_connection_manager,
+    close_connection_manager,
     ensure_user_exists,
+    upsert_users,
+    utc_timestamp,
 )
 from discord_puppy.memory.message_indexer import (
     compute_message_hash,
     is_message_indexed,
     index_message,
+    index_message_rows,
+    message_to_row,
+    index_message_page,
+    get_channel_watermark,
+    advance_channel_watermarks,
     index_channel_history,
     index_guild_history,
     index_all_guilds,
+    BackfillConfig,
+    ChannelProgress,
+)
+from discord_puppy.memory.ingestion import IngestionConfig, IngestionQueue
+from discord_puppy.memory.backfill import (
+    BackfillStatus,
+    BackfillSupervisor,
+    get_backfill_supervisor,
+    set_backfill_supervisor,
+    get_backfill_status,
+)
+from discord_puppy.memory.search import build_fts_query, search_indexed_messages
+from discord_puppy.memory.user_cache import (
+    UserCacheConfig,
+    UserMemory,
+    UserMemoryCache,
+    load_user_memories,
+    get_user_memory_cache,
+    set_user_memory_cache,
+)
+from discord_puppy.memory.users import UserResolution, resolve_user
+from discord_puppy.memory.user_notes import (
+    NotesBudget,
+    NoteRollup,
+    add_user_note,
+    top_user_notes,
+    rollup_user_notes,
+    users_over_budget,
+)
+from discord_puppy.memory.retention import (
+    RetentionPolicy,
+    RetentionConfig,
+    RetentionEngine,
+    compress_content,
+    decompress_content,
 )
 
 __all__ = [
     # Database
+    "ConnectionConfig",
+    "ConnectionManager",
     "init_database",
     "get_connection",
+    "get_connection_manager",
+    "configure_connection_manager",
+    "close_connection_manager",
     "ensure_user_exists",
+    "upsert_users",
+    "utc_timestamp",
     # Indexing
     "compute_message_hash",
     "is_message_indexed",
     "index_message",
+    "index_message_rows",
+    "message_to_row",
+    "index_message_page",
+    "get_channel_watermark",
+    "advance_channel_watermarks",
     "index_channel_history",
     "index_guild_history",
     "index_all_guilds",
+    "BackfillConfig",
+    "ChannelProgress",
+    # Ingestion
+    "IngestionConfig",
+    "IngestionQueue",
+    # Backfill
+    "BackfillStatus",
+    "BackfillSupervisor",
+    "get_backfill_supervisor",
+    "set_backfill_supervisor",
+    "get_backfill_status",
+    # Search
+    "build_fts_query",
+    "search_indexed_messages",
+    # User memory cache
+    "UserCacheConfig",
+    "UserMemory",
+    "UserMemoryCache",
+    "load_user_memories",
+    "get_user_memory_cache",
+    "set_user_memory_cache",
+    # User resolution
+    "UserResolution",
+    "resolve_user",
+    # User notes
+    "NotesBudget",
+    "NoteRollup",
+    "add_user_note",
+    "top_user_notes",
+    "rollup_user_notes",
+    "users_over_budget",
+    # Retention
+    "RetentionPolicy",
+    "RetentionConfig",
+    "RetentionEngine",
+    "compress_content",
+    "decompress_content",
 ]
@@ -0,0 +1,226 @@
+"""
+Backfill Supervisor - Reading the Archives in the Background 📚🐕
+
+History backfill used to block on_ready: the puppy was deaf to mentions
+until every channel had been walked. Now it runs as a supervised
+background task:
+
+- start() is idempotent - a gateway reconnect (which fires on_ready
+  again) never launches a second concurrent backfill
+- A finished backfill can be started again; watermarks make the
+  re-run cheap, so reconnects just catch up on what was missed
+- Low priority: few channels at a time, and every page write first
+  waits for live traffic (the busy() check) to calm down
+- Progress + readiness are exposed via status() for the agent tools
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Callable, Optional
+
+import discord
+
+from discord_puppy.memory.message_indexer import (
+    BackfillConfig,
+    ChannelProgress,
+    index_all_guilds,
+    log_channel_progress,
+)
+
+logger = logging.getLogger("discord_puppy.memory.backfill")
+
+
+@dataclass
+class BackfillStatus:
+    """Live progress of the background backfill."""
+    state: str = "idle"  # idle, running, complete, failed
+    runs_completed: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    channels_total: int = 0
+    channels_done: int = 0
+    channels_skipped: int = 0
+    channels_failed: int = 0
+    new_messages: int = 0
+    last_error: str = ""
+    last_stats: dict = field(default_factory=dict)
+
+    @property
+    def is_ready(self) -> bool:
+        """True once at least one full backfill has finished."""
+        return self.runs_completed > 0
+
+    def as_dict(self) -> dict:
+        finished = self.channels_done + self.channels_skipped + self.channels_failed
+        return {
+            "state": self.state,
+            "ready": self.is_ready,
+            "runs_completed": self.runs_completed,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "channels_total": self.channels_total,
+            "channels_done": self.channels_done,
+            "channels_skipped": self.channels_skipped,
+            "channels_failed": self.channels_failed,
+            "progress": finished / self.channels_total if self.channels_total else 0.0,
+            "new_messages": self.new_messages,
+            "last_error": self.last_error,
+        }
+
+
+class BackfillSupervisor:
+    """Runs history backfill as a single background task."""
+
+    def __init__(
+        self,
+        limit_per_channel: int = 500,
+        days_back: int = 30,
+        config: Optional[BackfillConfig] = None,
+        busy: Optional[Callable[[], bool]] = None,
+        max_yield_seconds: float = 5.0,
+    ):
+        """Initialize the backfill supervisor.
+
+        Args:
+            limit_per_channel: Max messages per channel per run
+            days_back: How far back new channels are indexed
+            config: Concurrency limits (low-priority defaults if None)
+            busy: Returns True while live traffic should go first
+            max_yield_seconds: Longest a single page waits on busy()
+        """
+        self.limit_per_channel = limit_per_channel
+        self.days_back = days_back
+        self.config = replace(
+            config or BackfillConfig(max_concurrency=4, per_guild_concurrency=1),
+            throttle=self._yield_to_live_traffic,
+        )
+        self.busy = busy
+        self.max_yield_seconds = max_yield_seconds
+
+        self._status = BackfillStatus()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Check if a backfill is in flight."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def is_ready(self) -> bool:
+        """True once at least one full backfill has finished."""
+        return self._status.is_ready
+
+    def status(self) -> dict:
+        """Snapshot of backfill progress and readiness."""
+        return self._status.as_dict()
+
+    def start(self, client: discord.Client) -> bool:
+        """Start a backfill run unless one is already in flight.
+
+        Args:
+            client: Discord client whose guilds should be backfilled
+
+        Returns:
+            True if a new run was started
+        """
+        if self.is_running:
+            logger.info("📚 Backfill already running - not starting another")
+            return False
+
+        self._task = asyncio.create_task(self._run(client))
+        return True
+
+    async def stop(self) -> None:
+        """Cancel an in-flight backfill (committed pages are kept)."""
+        if self.is_running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _yield_to_live_traffic(self) -> None:
+        """Wait (bounded) while live traffic is busy, then yield once."""
+        if self.busy:
+            waited = 0.0
+            while self.busy() and waited < self.max_yield_seconds:
+                await asyncio.sleep(0.1)
+                waited += 0.1
+        await asyncio.sleep(0)
+
+    def _on_progress(self, progress: ChannelProgress) -> None:
+        if progress.status == "skipped":
+            self._status.channels_skipped += 1
+        elif progress.status == "failed":
+            self._status.channels_failed += 1
+        else:
+            self._status.channels_done += 1
+            self._status.new_messages += progress.stats["new_messages"] if progress.stats else 0
+        log_channel_progress(progress)
+
+    async def _run(self, client: discord.Client) -> None:
+        status = self._status
+        status.state = "running"
+        status.started_at = datetime.utcnow()
+        status.finished_at = None
+        status.channels_total = sum(len(g.text_channels) for g in client.guilds)
+        status.channels_done = status.channels_skipped = status.channels_failed = 0
+        status.new_messages = 0
+        status.last_error = ""
+
+        logger.info("📚 Backfilling %d channel(s) in the background...", status.channels_total)
+        try:
+            stats = await index_all_guilds(
+                client,
+                limit_per_channel=self.limit_per_channel,
+                days_back=self.days_back,
+                config=self.config,
+                on_progress=self._on_progress,
+            )
+        except asyncio.CancelledError:
+            status.state = "idle"
+            raise
+        except Exception as e:
+            status.state = "failed"
+            status.last_error = str(e)
+            logger.exception("❌ Backfill failed")
+            return
+        finally:
+            status.finished_at = datetime.utcnow()
+
+        status.state = "complete"
+        status.runs_completed += 1
+        status.last_stats = stats
+
+        logger.info(
+            "📊 Indexing complete! 🏠 Guilds: %d, 📺 Channels: %d, ✨ New messages: %d, "
+            "⏭️  Skipped (already indexed): %d, 📨 Total processed: %d",
+            stats["guilds_processed"], stats["channels_processed"], stats["new_messages"],
+            stats["skipped_messages"], stats["total_processed"],
+        )
+
+
+# Process-wide supervisor (created lazily)
+_supervisor: Optional[BackfillSupervisor] = None
+
+
+def get_backfill_supervisor() -> BackfillSupervisor:
+    """Get the process-wide backfill supervisor, creating it if needed."""
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = BackfillSupervisor()
+    return _supervisor
+
+
+def set_backfill_supervisor(supervisor: BackfillSupervisor) -> None:
+    """Install a configured supervisor as the process-wide one."""
+    global _supervisor
+    _supervisor = supervisor
+
+
+def get_backfill_status() -> dict:
+    """Backfill progress/readiness (idle status if never started)."""
+    return get_backfill_supervisor().status()
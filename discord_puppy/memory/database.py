@@ -7,20 +7,54 @@ The brain of Discord Puppy! Stores:
 - Puppy's personal diary
 
 Uses aiosqlite for async operations.
+
+Connection Strategy:
+- One long-lived writer connection, serialized behind an asyncio.Lock
+- A bounded pool of read-only connections (WAL mode lets them read
+  while the writer writes)
+- Everything goes through the process-wide ConnectionManager, so the
+  hot paths never pay for a thread spawn + PRAGMAs per query
+- reader(op)/writer(op) name the operation - wait and hold times are
+  exported per op as metrics (puppy_db_*)
 """
 
+import asyncio
 import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import aiosqlite
 
+from discord_puppy import metrics
+
+logger = logging.getLogger("discord_puppy.memory")
+
+DB_WAIT_SECONDS = metrics.histogram(
+    "puppy_db_wait_seconds", "Time spent waiting for a brain connection",
+    ["mode"], buckets=metrics.DB_BUCKETS,
+)
+DB_OPERATION_SECONDS = metrics.histogram(
+    "puppy_db_operation_seconds", "Time a brain connection was held, per operation (writes include the commit)",
+    ["mode", "op"], buckets=metrics.DB_BUCKETS,
+)
+DB_ERRORS = metrics.counter("puppy_db_errors_total", "Brain operations that raised", ["mode", "op"])
+_WRITER_WAIT = DB_WAIT_SECONDS.labels("writer")
+_READER_WAIT = DB_WAIT_SECONDS.labels("reader")
+
 # Default database path
 DEFAULT_DB_PATH = Path.home() / ".discord_puppy" / "brain.db"
 
 
 async def get_connection(db_path: Optional[Path] = None) -> aiosqlite.Connection:
-    """Get an async database connection.
+    """Get a fresh, standalone async database connection.
+
+    Hot paths should use get_connection_manager() instead - this opens
+    (and the caller must close) a brand new connection every time.
 
     Args:
         db_path: Path to database file. Defaults to ~/.discord_puppy/brain.db
@@ -37,20 +71,268 @@ async def get_connection(db_path: Optional[Path] = None) -> aiosqlite.Connection
     return conn
 
 
+@dataclass
+class ConnectionConfig:
+    """Tuning knobs for the brain's connection manager."""
+    db_path: Optional[Path] = None
+    read_pool_size: int = 4             # Read-only connections in the pool
+    cache_size_kib: int = 16 * 1024     # Page cache per connection (16 MiB)
+    mmap_size_bytes: int = 256 * 1024 * 1024  # Memory-mapped I/O (256 MiB)
+    busy_timeout_ms: int = 5000         # How long to wait on a locked DB
+    synchronous: str = "NORMAL"         # NORMAL is safe in WAL mode
+
+    @property
+    def path(self) -> Path:
+        """Resolved database path."""
+        return self.db_path or DEFAULT_DB_PATH
+
+
+@dataclass
+class WaitStats:
+    """Running totals for how long callers waited on a connection."""
+    acquisitions: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def record(self, waited: float) -> None:
+        self.acquisitions += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def as_dict(self) -> dict:
+        avg = self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+        return {
+            "acquisitions": self.acquisitions,
+            "avg_wait_ms": avg * 1000,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+        }
+
+
+class ConnectionManager:
+    """Process-wide owner of the brain's SQLite connections.
+
+    Usage:
+        manager = get_connection_manager()
+        async with manager.reader("search") as conn:
+            cursor = await conn.execute("SELECT ...")
+        async with manager.writer("remember") as conn:
+            await conn.execute("INSERT ...")
+            # commits on exit, rolls back on error
+
+    Connections are opened lazily on first use and live until close().
+    """
+
+    def __init__(self, config: Optional[ConnectionConfig] = None):
+        """Initialize the connection manager.
+
+        Args:
+            config: Connection configuration (uses defaults if None)
+        """
+        self.config = config or ConnectionConfig()
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all_readers: list[aiosqlite.Connection] = []
+
+        self._open_lock = asyncio.Lock()
+        self._opened = False
+
+        self._writer_waits = WaitStats()
+        self._reader_waits = WaitStats()
+
+    @property
+    def path(self) -> Path:
+        """Path of the database this manager owns."""
+        return self.config.path
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the connections have been opened."""
+        return self._opened
+
+    async def _apply_pragmas(self, conn: aiosqlite.Connection) -> None:
+        """Apply the per-connection tuning PRAGMAs."""
+        conn.row_factory = aiosqlite.Row
+        await conn.execute(f"PRAGMA busy_timeout = {int(self.config.busy_timeout_ms)}")
+        await conn.execute(f"PRAGMA cache_size = -{int(self.config.cache_size_kib)}")
+        await conn.execute(f"PRAGMA mmap_size = {int(self.config.mmap_size_bytes)}")
+        await conn.execute("PRAGMA foreign_keys = ON")
+
+    async def open(self) -> None:
+        """Open the writer and the reader pool (no-op if already open)."""
+        async with self._open_lock:
+            if self._opened:
+                return
+
+            path = self.path
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # The writer goes first - it creates the file and flips on WAL,
+            # which the read-only connections depend on.
+            writer = await aiosqlite.connect(path)
+            await self._apply_pragmas(writer)
+            # Only takes effect on a brand new file - lets retention hand
+            # freed pages back to the OS in small slices (see retention.py)
+            await writer.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            await writer.execute("PRAGMA journal_mode = WAL")
+            await writer.execute(f"PRAGMA synchronous = {self.config.synchronous}")
+            await writer.commit()
+            self._writer = writer
+
+            for _ in range(max(1, self.config.read_pool_size)):
+                reader = await aiosqlite.connect(f"{path.as_uri()}?mode=ro", uri=True)
+                await self._apply_pragmas(reader)
+                await reader.execute("PRAGMA query_only = ON")
+                self._all_readers.append(reader)
+                self._readers.put_nowait(reader)
+
+            self._opened = True
+            logger.info(
+                "🧠 Brain connections open: 1 writer + %d readers (%s)",
+                len(self._all_readers), path,
+            )
+
+    async def close(self) -> None:
+        """Close every connection owned by the manager."""
+        async with self._open_lock:
+            if not self._opened:
+                return
+
+            async with self._write_lock:
+                if self._writer is not None:
+                    await self._writer.close()
+                    self._writer = None
+
+            for reader in self._all_readers:
+                await reader.close()
+            self._all_readers.clear()
+            self._readers = asyncio.Queue()
+            self._opened = False
+
+    @asynccontextmanager
+    async def writer(self, op: str = "other") -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow the single writer connection.
+
+        Only one task holds the writer at a time. The transaction is
+        committed when the block exits cleanly and rolled back on error.
+
+        Args:
+            op: Operation name for metrics
+        """
+        if not self._opened:
+            await self.open()
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            acquired = time.perf_counter()
+            self._writer_waits.record(acquired - started)
+            _WRITER_WAIT.observe(acquired - started)
+            conn = self._writer
+            try:
+                yield conn
+            except BaseException:
+                DB_ERRORS.labels("writer", op).inc()
+                await conn.rollback()
+                raise
+            else:
+                await conn.commit()
+            finally:
+                DB_OPERATION_SECONDS.labels("writer", op).observe(time.perf_counter() - acquired)
+
+    @asynccontextmanager
+    async def reader(self, op: str = "other") -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool.
+
+        Args:
+            op: Operation name for metrics
+        """
+        if not self._opened:
+            await self.open()
+
+        started = time.perf_counter()
+        conn = await self._readers.get()
+        acquired = time.perf_counter()
+        self._reader_waits.record(acquired - started)
+        _READER_WAIT.observe(acquired - started)
+        try:
+            yield conn
+        except BaseException:
+            DB_ERRORS.labels("reader", op).inc()
+            raise
+        finally:
+            self._readers.put_nowait(conn)
+            DB_OPERATION_SECONDS.labels("reader", op).observe(time.perf_counter() - acquired)
+
+    def stats(self) -> dict:
+        """Pool wait-time statistics."""
+        return {
+            "open": self._opened,
+            "read_pool_size": len(self._all_readers),
+            "readers_idle": self._readers.qsize(),
+            "writer_locked": self._write_lock.locked(),
+            "writer": self._writer_waits.as_dict(),
+            "readers": self._reader_waits.as_dict(),
+        }
+
+
+# Process-wide manager (created lazily)
+_manager: Optional[ConnectionManager] = None
+
+
+def get_connection_manager() -> ConnectionManager:
+    """Get the process-wide connection manager, creating it if needed."""
+    global _manager
+    if _manager is None:
+        _manager = ConnectionManager()
+    return _manager
+
+
+async def configure_connection_manager(config: ConnectionConfig) -> ConnectionManager:
+    """Replace the process-wide connection manager with a new config.
+
+    Any connections held by the previous manager are closed first.
+
+    Args:
+        config: New connection configuration
+
+    Returns:
+        The new (not yet opened) ConnectionManager
+    """
+    global _manager
+    if _manager is not None:
+        await _manager.close()
+    _manager = ConnectionManager(config)
+    return _manager
+
+
+async def close_connection_manager() -> None:
+    """Close the process-wide connection manager (call on shutdown)."""
+    if _manager is not None:
+        await _manager.close()
+
+
 async def init_database(db_path: Optional[Path] = None) -> None:
     """Initialize the database with all required tables.
 
     Creates:
     - user_notes: Core table for user memories
+    - user_note_entries: Individual notes about each user
     - interaction_memories: Specific interaction records
     - puppy_diary: Puppy's personal thoughts
+    - indexed_messages: Dedup ledger of indexed Discord messages
+    - messages_fts: FTS5 full-text index over indexed_messages
+    - channel_watermarks: Last indexed message per channel
+    - user_names_fts: Trigram index over user names for fuzzy lookups
 
     Args:
-        db_path: Path to database file. Defaults to ~/.discord_puppy/brain.db
+        db_path: Path to database file. Defaults to the manager's path
     """
-    conn = await get_connection(db_path)
+    manager = get_connection_manager()
+    if db_path is not None and Path(db_path) != manager.path:
+        manager = await configure_connection_manager(ConnectionConfig(db_path=Path(db_path)))
 
-    try:
+    async with manager.writer("init_database") as conn:
         # User notes table - the core memory about each human
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS user_notes (
@@ -124,11 +406,9 @@ async def init_database(db_path: Optional[Path] = None) -> None:
             )
         """)
 
-        # Index for fast hash lookups (the whole point of deduplication!)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_message_hash
-            ON indexed_messages(message_hash)
-        """)
+        # Hash lookups (the whole point of deduplication!) use the index
+        # SQLite builds for UNIQUE message_hash - a second one only costs writes
+        await conn.execute("DROP INDEX IF EXISTS idx_message_hash")
 
         # Index for channel-based queries
         await conn.execute("""
@@ -136,11 +416,186 @@ async def init_database(db_path: Optional[Path] = None) -> None:
             ON indexed_messages(channel_id, message_timestamp DESC)
         """)
 
-        await conn.commit()
-        print("🧠 Discord Puppy brain initialized!")
+        # Most-recent-first across all channels (get_recent_messages, search)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_message_timestamp
+            ON indexed_messages(message_timestamp DESC)
+        """)
+
+        # Per-user queries - and the ON DELETE CASCADE from user_notes
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_message_user
+            ON indexed_messages(user_id, message_timestamp DESC)
+        """)
+
+        # Per-channel high-water marks - the newest message snowflake we've
+        # indexed, so restarts resume with history(after=...) instead of
+        # re-walking the whole days_back window
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS channel_watermarks (
+                channel_id TEXT PRIMARY KEY,
+                guild_id TEXT,
+                last_message_id INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Full-text index over message content (external content = no copy
+        # of the text, just the inverted index). Kept in sync by triggers.
+        cursor = await conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+        )
+        fts_exists = await cursor.fetchone() is not None
+
+        await conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                content_preview,
+                content='indexed_messages',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS indexed_messages_fts_insert
+            AFTER INSERT ON indexed_messages BEGIN
+                INSERT INTO messages_fts(rowid, content_preview)
+                VALUES (new.id, new.content_preview);
+            END
+        """)
+
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS indexed_messages_fts_delete
+            AFTER DELETE ON indexed_messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, content_preview)
+                VALUES ('delete', old.id, old.content_preview);
+            END
+        """)
+
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS indexed_messages_fts_update
+            AFTER UPDATE OF content_preview ON indexed_messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, content_preview)
+                VALUES ('delete', old.id, old.content_preview);
+                INSERT INTO messages_fts(rowid, content_preview)
+                VALUES (new.id, new.content_preview);
+            END
+        """)
+
+        # Brains from before the FTS index existed need a one-time backfill
+        if not fts_exists:
+            await conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+
+        # list_users - most recently seen first
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_last_seen
+            ON user_notes(last_seen DESC)
+        """)
 
-    finally:
-        await conn.close()
+        # Case-insensitive exact name lookups (see memory/users.py)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_username_nocase
+            ON user_notes(discord_username COLLATE NOCASE)
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_display_name_nocase
+            ON user_notes(display_name COLLATE NOCASE)
+        """)
+
+        # Trigram index over names for fuzzy lookups. It keeps its own copy
+        # of the (tiny) names, keyed by the numeric snowflake - user_notes has
+        # no stable integer rowid to point an external-content table at.
+        cursor = await conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_names_fts'"
+        )
+        names_fts_exists = await cursor.fetchone() is not None
+
+        await conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS user_names_fts USING fts5(
+                discord_username,
+                display_name,
+                tokenize='trigram'
+            )
+        """)
+
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS user_notes_names_insert
+            AFTER INSERT ON user_notes BEGIN
+                INSERT INTO user_names_fts(rowid, discord_username, display_name)
+                VALUES (CAST(new.user_id AS INTEGER), new.discord_username, new.display_name);
+            END
+        """)
+
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS user_notes_names_delete
+            AFTER DELETE ON user_notes BEGIN
+                DELETE FROM user_names_fts WHERE rowid = CAST(old.user_id AS INTEGER);
+            END
+        """)
+
+        # Upserts touch the names on every sighting - only reindex real renames
+        await conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS user_notes_names_update
+            AFTER UPDATE OF discord_username, display_name ON user_notes
+            WHEN old.discord_username IS NOT new.discord_username
+              OR old.display_name IS NOT new.display_name
+            BEGIN
+                DELETE FROM user_names_fts WHERE rowid = CAST(old.user_id AS INTEGER);
+                INSERT INTO user_names_fts(rowid, discord_username, display_name)
+                VALUES (CAST(new.user_id AS INTEGER), new.discord_username, new.display_name);
+            END
+        """)
+
+        if not names_fts_exists:
+            await conn.execute("""
+                INSERT INTO user_names_fts(rowid, discord_username, display_name)
+                SELECT CAST(user_id AS INTEGER), discord_username, display_name FROM user_notes
+            """)
+
+        # One row per note (see memory/user_notes.py). Appends are a single
+        # INSERT - no read-modify-write of a growing blob.
+        cursor = await conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_note_entries'"
+        )
+        note_entries_exist = await cursor.fetchone() is not None
+
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_note_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                note TEXT NOT NULL,
+                importance INTEGER DEFAULT 3 CHECK (importance >= 1 AND importance <= 5),
+                is_rollup INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES user_notes(user_id)
+                    ON DELETE CASCADE
+            )
+        """)
+
+        # Top-N per user, most important then newest - straight off the index
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_note_entries_user
+            ON user_note_entries(user_id, importance DESC, id DESC)
+        """)
+
+        # Brains from before per-note rows: split the old notes blob, one
+        # entry per line (the legacy column is left as it was)
+        if not note_entries_exist:
+            cursor = await conn.execute(
+                "SELECT user_id, notes, updated_at FROM user_notes WHERE notes != ''"
+            )
+            legacy = [
+                (row["user_id"], line.strip().removeprefix("- ").strip(), row["updated_at"])
+                for row in await cursor.fetchall()
+                for line in row["notes"].splitlines()
+                if line.strip().removeprefix("- ").strip()
+            ]
+            await conn.executemany(
+                "INSERT INTO user_note_entries (user_id, note, created_at) VALUES (?, ?, ?)",
+                legacy,
+            )
+
+    print("🧠 Discord Puppy brain initialized!")
 
 
 async def ensure_user_exists(
@@ -152,6 +607,9 @@ async def ensure_user_exists(
 ) -> None:
     """Ensure a user exists in the database, creating if needed.
 
+    Does NOT commit - the caller owns the transaction (use
+    ConnectionManager.writer()).
+
     Args:
         conn: Active database connection
         user_id: Discord user ID
@@ -171,7 +629,44 @@ async def ensure_user_exists(
     """,
         (user_id, username, display_name, mood),
     )
-    await conn.commit()
+
+
+def utc_timestamp() -> str:
+    """Current UTC time in SQLite's CURRENT_TIMESTAMP format."""
+    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def upsert_users(
+    conn: aiosqlite.Connection,
+    users: list[tuple[str, str, str, str, int, str]],
+) -> None:
+    """Upsert many users in one statement, with pre-coalesced counts.
+
+    Each row is (user_id, username, display_name, mood, times_seen, last_seen).
+    times_seen folds N ensure_user_exists() calls into one row: the first
+    sighting creates the user (count 0), every later one adds 1.
+
+    Does NOT commit - the caller owns the transaction.
+
+    Args:
+        conn: Active database connection
+        users: Coalesced user rows, one per user_id
+    """
+    await conn.executemany(
+        """
+        INSERT INTO user_notes (
+            user_id, discord_username, display_name, puppy_mood_when_met,
+            interaction_count, last_seen
+        )
+        VALUES (?1, ?2, ?3, ?4, ?5 - 1, ?6)
+        ON CONFLICT(user_id) DO UPDATE SET
+            discord_username = COALESCE(excluded.discord_username, discord_username),
+            display_name = COALESCE(excluded.display_name, display_name),
+            last_seen = excluded.last_seen,
+            interaction_count = interaction_count + ?5
+    """,
+        users,
+    )
 
 
 # Helper functions for JSON fields
@@ -0,0 +1,265 @@
+"""
+Ingestion Queue - Write-Behind for Live Messages 📥🧠
+
+The gateway hands us messages faster than we'd like to fsync them.
+Instead of writing each one inline in on_message, messages are
+snapshotted onto an in-memory queue and flushed in grouped transactions:
+
+- Flush when the queue reaches max_batch_size
+- Flush every flush_interval_seconds otherwise
+- Repeated sightings of the same user within a batch are coalesced
+  into ONE upsert (interaction_count += N, last_seen = latest)
+- Backfill watermarks are left alone - after a restart, one live
+  message would otherwise jump a channel's watermark past everything
+  posted while the bot was offline (the backfill skips what we already
+  ingested live by message hash)
+- A batch whose write fails goes back on the queue and is retried
+  (up to max_retries attempts) instead of being lost
+- stop() flushes whatever is left, so shutdown never loses messages
+
+submit() is synchronous and never touches the disk - on_message
+stays fast no matter how slow the brain is.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import discord
+
+from discord_puppy.memory.database import (
+    ConnectionManager,
+    get_connection_manager,
+    upsert_users,
+    utc_timestamp,
+)
+from discord_puppy.memory.message_indexer import (
+    INDEXED_MESSAGES,
+    compute_message_hash,
+    index_message_rows,
+    message_to_row,
+)
+from discord_puppy.memory.user_cache import get_user_memory_cache
+
+logger = logging.getLogger("discord_puppy.memory.ingestion")
+
+_LIVE_NEW = INDEXED_MESSAGES.labels("live", "new")
+_LIVE_SKIPPED = INDEXED_MESSAGES.labels("live", "skipped")
+
+
+@dataclass
+class IngestionConfig:
+    """Configuration for the write-behind ingestion queue."""
+    max_batch_size: int = 200           # Flush as soon as this many are waiting
+    flush_interval_seconds: float = 1.0  # ...or at least this often
+    max_pending: int = 10_000           # Drop (and count) beyond this backlog
+    max_retries: int = 3                # Write attempts per message before it's dropped
+
+
+@dataclass
+class PendingIngest:
+    """A message snapshot waiting to be written."""
+    user_id: str
+    username: str
+    display_name: str
+    mood: str
+    seen_at: str
+    row: tuple
+    attempts: int = 0
+
+
+class IngestionQueue:
+    """Batches user upserts + message inserts off the gateway hot path."""
+
+    def __init__(
+        self,
+        config: Optional[IngestionConfig] = None,
+        manager: Optional[ConnectionManager] = None,
+    ):
+        """Initialize the ingestion queue.
+
+        Args:
+            config: Ingestion configuration (uses defaults if None)
+            manager: Connection manager to write through (process-wide if None)
+        """
+        self.config = config or IngestionConfig()
+        self._manager = manager
+
+        self._pending: deque[PendingIngest] = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._batches = 0
+        self._failed_batches = 0
+        self._retried = 0
+
+    @property
+    def manager(self) -> ConnectionManager:
+        return self._manager or get_connection_manager()
+
+    @property
+    def backlog(self) -> int:
+        """Number of messages waiting to be flushed."""
+        return len(self._pending)
+
+    def submit(self, message: discord.Message, mood: str = "curious") -> None:
+        """Queue a message (and its author) for the next flush.
+
+        Never blocks and never awaits - safe to call from on_message.
+
+        Args:
+            message: The Discord message to remember
+            mood: Puppy's mood if this is the first time meeting the author
+        """
+        if len(self._pending) >= self.config.max_pending:
+            self._dropped += 1
+            return
+
+        self._pending.append(PendingIngest(
+            user_id=str(message.author.id),
+            username=message.author.name,
+            display_name=message.author.display_name,
+            mood=mood,
+            seen_at=utc_timestamp(),
+            row=message_to_row(message, compute_message_hash(message)),
+        ))
+        self._submitted += 1
+
+        if len(self._pending) >= self.config.max_batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self._running:
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out everything still queued.
+
+        Failed batches are retried until they run out of attempts, so this
+        always finishes - and never raises.
+        """
+        self._running = False
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+        while self._pending:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("❌ Ingestion flush failed during shutdown: %s", e)
+
+    async def _flush_loop(self) -> None:
+        """Flush by size (wakeup) or by time (timeout), whichever is first."""
+        while self._running:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=self.config.flush_interval_seconds,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("❌ Ingestion flush failed: %s", e)
+
+    async def flush(self) -> int:
+        """Write everything currently queued, one transaction per batch.
+
+        A batch that fails is put back at the front of the queue (minus
+        messages out of attempts) and the error is re-raised.
+
+        Returns:
+            Number of messages newly inserted
+        """
+        inserted = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = [
+                    self._pending.popleft()
+                    for _ in range(min(len(self._pending), self.config.max_batch_size))
+                ]
+                try:
+                    inserted += await self._write_batch(batch)
+                except Exception:
+                    self._requeue(batch)
+                    raise
+        return inserted
+
+    def _requeue(self, batch: list[PendingIngest]) -> None:
+        """Put a failed batch back in front, dropping what's out of attempts."""
+        retry = []
+        for item in batch:
+            item.attempts += 1
+            if item.attempts < self.config.max_retries:
+                retry.append(item)
+            else:
+                self._dropped += 1
+        self._retried += len(retry)
+        self._pending.extendleft(reversed(retry))
+
+    async def _write_batch(self, batch: list[PendingIngest]) -> int:
+        """Write one batch as a single transaction."""
+        # Coalesce users: one upsert per user, counting every sighting
+        users: dict[str, list] = {}
+        for item in batch:
+            entry = users.get(item.user_id)
+            if entry is None:
+                users[item.user_id] = [
+                    item.user_id, item.username, item.display_name,
+                    item.mood, 1, item.seen_at,
+                ]
+            else:
+                entry[1] = item.username
+                entry[2] = item.display_name
+                entry[4] += 1
+                entry[5] = item.seen_at
+
+        user_rows = [tuple(u) for u in users.values()]
+        try:
+            async with self.manager.writer("ingest_batch") as conn:
+                # Users first - indexed_messages references them
+                await upsert_users(conn, user_rows)
+                inserted = await index_message_rows(conn, [item.row for item in batch])
+        except Exception:
+            self._failed_batches += 1
+            raise
+
+        # Committed - cached prompt memories for renamed/new users are stale now
+        get_user_memory_cache().users_upserted(user_rows)
+
+        self._written += inserted
+        self._batches += 1
+        _LIVE_NEW.inc(inserted)
+        _LIVE_SKIPPED.inc(len(batch) - inserted)
+        return inserted
+
+    def stats(self) -> dict:
+        """Queue statistics."""
+        return {
+            "backlog": len(self._pending),
+            "submitted": self._submitted,
+            "written": self._written,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "failed_batches": self._failed_batches,
+            "retried": self._retried,
+        }
@@ -8,16 +8,46 @@ message twice (we're not goldfish, we're puppies with MEMORY!).
 Hashing Strategy:
 - SHA256 hash of: message_id + channel_id + content + author_id
 - This ensures we detect even edited messages as "different"
+
+Backfill Strategy:
+- Messages are written a page at a time: one IN (...) dedupe query,
+  one author upsert and one executemany insert per page
+- Each page also advances the channel's watermark, so restarts fetch
+  only what's new (history(after=watermark))
+- Guilds and channels are indexed concurrently, bounded by a global
+  and a per-guild limit (BackfillConfig)
+- 429s are retried after Retry-After; a global limit pauses every
+  channel in the run via RateLimitGate
 """
 
+import asyncio
 import hashlib
+import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 import aiosqlite
 import discord
 
-from discord_puppy.memory.database import get_connection, ensure_user_exists
+from discord_puppy import metrics
+from discord_puppy.memory.database import (
+    ensure_user_exists,
+    get_connection_manager,
+    upsert_users,
+    utc_timestamp,
+)
+from discord_puppy.memory.user_cache import get_user_memory_cache
+
+logger = logging.getLogger("discord_puppy.memory.indexer")
+
+INDEXED_MESSAGES = metrics.counter(
+    "puppy_indexed_messages_total", "Messages seen by the indexer (source: backfill/live, result: new/skipped)",
+    ["source", "result"],
+)
+_BACKFILL_NEW = INDEXED_MESSAGES.labels("backfill", "new")
+_BACKFILL_SKIPPED = INDEXED_MESSAGES.labels("backfill", "skipped")
 
 
 def compute_message_hash(message: discord.Message) -> str:
@@ -70,9 +100,6 @@ async def index_message(
     Returns:
         True if message was newly indexed, False if already existed
     """
-    # Truncate content for preview (we don't need the whole thing)
-    content_preview = message.content[:200] if message.content else None
-
     try:
         await conn.execute(
             """
@@ -81,15 +108,7 @@ async def index_message(
                 user_id, content_preview, message_timestamp
             ) VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                message_hash,
-                str(message.id),
-                str(message.channel.id),
-                str(message.guild.id) if message.guild else None,
-                str(message.author.id),
-                content_preview,
-                message.created_at.isoformat(),
-            )
+            message_to_row(message, message_hash),
         )
         return True
     except aiosqlite.IntegrityError:
@@ -97,6 +116,53 @@ async def index_message(
         return False
 
 
+def message_to_row(message: discord.Message, message_hash: str) -> tuple:
+    """Snapshot the columns we store for a message.
+
+    Args:
+        message: Discord message object
+        message_hash: Pre-computed hash of the message
+
+    Returns:
+        Row tuple in indexed_messages column order
+    """
+    return (
+        message_hash,
+        str(message.id),
+        str(message.channel.id),
+        str(message.guild.id) if message.guild else None,
+        str(message.author.id),
+        # Truncate content for preview (we don't need the whole thing)
+        message.content[:200] if message.content else None,
+        message.created_at.isoformat(),
+    )
+
+
+async def index_message_rows(conn: aiosqlite.Connection, rows: list[tuple]) -> int:
+    """Index many pre-built message rows, skipping ones we already have.
+
+    Does NOT commit - the caller owns the transaction.
+
+    Args:
+        conn: Active database connection
+        rows: Tuples from message_to_row()
+
+    Returns:
+        Number of rows that were newly inserted
+    """
+    # rowcount (unlike total_changes) ignores the FTS trigger writes
+    cursor = await conn.executemany(
+        """
+        INSERT OR IGNORE INTO indexed_messages (
+            message_hash, message_id, channel_id, guild_id,
+            user_id, content_preview, message_timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    return max(cursor.rowcount, 0)
+
+
 async def update_user_notes_from_message(
     conn: aiosqlite.Connection,
     message: discord.Message,
@@ -121,20 +187,133 @@ async def update_user_notes_from_message(
     )
 
 
+# Awaited between pages so background work can yield to live traffic
+Throttle = Callable[[], Awaitable[None]]
+
+
+async def get_channel_watermark(conn: aiosqlite.Connection, channel_id: str) -> Optional[int]:
+    """Get the newest message ID we've indexed for a channel.
+
+    Args:
+        conn: Active database connection
+        channel_id: Discord channel ID
+
+    Returns:
+        Message snowflake, or None if the channel has never been indexed
+    """
+    cursor = await conn.execute(
+        "SELECT last_message_id FROM channel_watermarks WHERE channel_id = ?",
+        (str(channel_id),),
+    )
+    row = await cursor.fetchone()
+    return row[0] if row else None
+
+
+async def advance_channel_watermarks(
+    conn: aiosqlite.Connection,
+    marks: list[tuple[str, Optional[str], int]],
+) -> None:
+    """Move channel watermarks forward (never backwards), creating missing ones.
+
+    Only the backfill calls this - a watermark means "everything up to
+    here has been fetched", which live ingestion can't promise: messages
+    posted while the bot was offline sit below the newest live one.
+
+    Does NOT commit - the caller owns the transaction.
+
+    Args:
+        conn: Active database connection
+        marks: (channel_id, guild_id, message_id) tuples
+    """
+    await conn.executemany(
+        """
+        INSERT INTO channel_watermarks (channel_id, guild_id, last_message_id)
+        VALUES (?, ?, ?)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            last_message_id = MAX(last_message_id, excluded.last_message_id),
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        marks,
+    )
+
+
+async def index_message_page(
+    conn: aiosqlite.Connection,
+    messages: list[discord.Message],
+    mood: str = "indexing",
+) -> tuple[list[discord.Message], int]:
+    """Index a page of messages with a handful of set-based statements.
+
+    One SELECT finds which hashes we already have, one executemany
+    upserts the page's distinct new authors, and one executemany inserts
+    the new messages. Does NOT commit - the caller owns the transaction,
+    and invalidates the user memory cache for the authors once it commits.
+
+    Args:
+        conn: Active database connection
+        messages: Page of (non-bot) messages to index
+        mood: Puppy's mood for authors we're meeting for the first time
+
+    Returns:
+        Tuple of (messages that were newly indexed, count already indexed)
+    """
+    hashed: dict[str, discord.Message] = {}
+    for message in messages:
+        hashed.setdefault(compute_message_hash(message), message)
+    if not hashed:
+        return [], 0
+
+    placeholders = ",".join("?" * len(hashed))
+    cursor = await conn.execute(
+        f"SELECT message_hash FROM indexed_messages WHERE message_hash IN ({placeholders})",
+        list(hashed),
+    )
+    existing = {row[0] for row in await cursor.fetchall()}
+    new = {h: m for h, m in hashed.items() if h not in existing}
+    if not new:
+        return [], len(messages)
+
+    # Authors first - indexed_messages references user_notes
+    seen_at = utc_timestamp()
+    authors: dict[str, list] = {}
+    for message in new.values():
+        user_id = str(message.author.id)
+        if user_id in authors:
+            authors[user_id][4] += 1
+        else:
+            authors[user_id] = [
+                user_id, message.author.name, message.author.display_name, mood, 1, seen_at,
+            ]
+    author_rows = [tuple(a) for a in authors.values()]
+    await upsert_users(conn, author_rows)
+
+    await index_message_rows(conn, [message_to_row(m, h) for h, m in new.items()])
+    return list(new.values()), len(messages) - len(new)
+
+
 async def index_channel_history(
     channel: discord.TextChannel,
     limit: Optional[int] = 1000,
     days_back: int = 30,
+    page_size: int = 100,
+    throttle: Optional[Throttle] = None,
 ) -> dict:
     """Index message history from a Discord channel.
 
     Fetches messages from the channel and indexes any we haven't seen.
-    Uses hashing to skip messages we've already processed.
+    Uses hashing to skip messages we've already processed. Messages are
+    written a page at a time - one transaction per page_size messages.
+
+    Channels we've indexed before resume after their watermark (the last
+    indexed message); only new channels fall back to the days_back window.
 
     Args:
         channel: Discord text channel to index
         limit: Maximum messages to fetch (None = no limit, be careful!)
-        days_back: How many days back to look
+        days_back: How many days back to look (new channels only)
+        page_size: Messages per write transaction (Discord pages are 100)
+        throttle: Awaited before each page is written - lets a background
+            backfill step aside for live traffic
 
     Returns:
         Dict with stats: {new_messages, skipped_messages, total_processed}
@@ -146,59 +325,222 @@ async def index_channel_history(
         "users_updated": set(),
     }
 
-    # Calculate the cutoff date
-    after_date = datetime.utcnow() - timedelta(days=days_back)
+    manager = get_connection_manager()
+    channel_id = str(channel.id)
+    guild_id = str(channel.guild.id) if getattr(channel, "guild", None) else None
+
+    # Resume after the watermark if we've been here before; only brand
+    # new channels walk the days_back window
+    async with manager.reader("channel_watermark") as conn:
+        watermark = await get_channel_watermark(conn, channel_id)
+
+    if watermark is not None:
+        after = discord.Object(id=watermark)
+    else:
+        after = datetime.utcnow() - timedelta(days=days_back)
+
+    async def flush(page: list[discord.Message], newest_id: int) -> None:
+        if throttle:
+            await throttle()
+        # Only hold the writer between network fetches, never across them
+        async with manager.writer("index_page") as conn:
+            new, already = await index_message_page(conn, page)
+            await advance_channel_watermarks(conn, [(channel_id, guild_id, newest_id)])
+
+        # Committed - cached prompt memories for renamed/new authors are stale now
+        get_user_memory_cache().users_upserted(
+            (str(m.author.id), m.author.name, m.author.display_name) for m in new
+        )
+        stats["new_messages"] += len(new)
+        stats["skipped_messages"] += already
+        _BACKFILL_NEW.inc(len(new))
+        _BACKFILL_SKIPPED.inc(already)
+        stats["users_updated"].update(str(m.author.id) for m in new)
+
+    # Oldest first, so every committed page is a safe place to resume from
+    page: list[discord.Message] = []
+    newest_id: Optional[int] = None
+    async for message in channel.history(limit=limit, after=after, oldest_first=True):
+        stats["total_processed"] += 1
+        newest_id = message.id if newest_id is None else max(newest_id, message.id)
+
+        # Skip bot messages (we don't index ourselves!)
+        if message.author.bot:
+            stats["skipped_messages"] += 1
+            _BACKFILL_SKIPPED.inc()
+            continue
 
-    conn = await get_connection()
-    try:
-        async for message in channel.history(limit=limit, after=after_date):
-            stats["total_processed"] += 1
+        page.append(message)
+        if len(page) >= page_size:
+            await flush(page, newest_id)
+            page = []
 
-            # Skip bot messages (we don't index ourselves!)
-            if message.author.bot:
-                stats["skipped_messages"] += 1
-                continue
+    if newest_id is not None and (page or newest_id != watermark):
+        await flush(page, newest_id)
 
-            # Compute hash and check if we've seen it
-            message_hash = compute_message_hash(message)
+    # Convert set to count for return
+    stats["users_updated"] = len(stats["users_updated"])
+    return stats
 
-            if await is_message_indexed(conn, message_hash):
-                stats["skipped_messages"] += 1
-                continue
 
-            # New message! Index it!
-            if await index_message(conn, message, message_hash):
-                stats["new_messages"] += 1
-                stats["users_updated"].add(str(message.author.id))
+@dataclass
+class BackfillConfig:
+    """Concurrency limits for history backfill."""
+    max_concurrency: int = 8         # Channels in flight across ALL guilds
+    per_guild_concurrency: int = 2   # Channels in flight within one guild
+    max_rate_limit_retries: int = 3  # Retries per channel after a 429
+    throttle: Optional[Throttle] = None  # Awaited before each page write
 
-                # Update user notes
-                await update_user_notes_from_message(conn, message)
 
-        await conn.commit()
+@dataclass
+class ChannelProgress:
+    """Progress report for one channel of a backfill."""
+    guild_name: str
+    channel_name: str
+    channel_id: str
+    status: str  # "indexed", "skipped" or "failed"
+    stats: Optional[dict] = None
+    reason: str = ""
+    elapsed_seconds: float = 0.0
 
-    finally:
-        await conn.close()
 
-    # Convert set to count for return
-    stats["users_updated"] = len(stats["users_updated"])
-    return stats
+ProgressCallback = Callable[[ChannelProgress], None]
+
+
+def log_channel_progress(progress: ChannelProgress) -> None:
+    """Default progress reporter - one log line per finished channel."""
+    if progress.status == "skipped":
+        logger.info("⏭️  Skipping %s #%s (%s)", progress.guild_name, progress.channel_name, progress.reason)
+    elif progress.status == "failed":
+        logger.warning(
+            "❌ Error indexing %s #%s: %s", progress.guild_name, progress.channel_name, progress.reason,
+        )
+    elif progress.stats and progress.stats["new_messages"] > 0:
+        logger.info(
+            "✨ %s #%s: %d new messages (%.1fs)", progress.guild_name, progress.channel_name,
+            progress.stats["new_messages"], progress.elapsed_seconds,
+        )
+    else:
+        logger.debug(
+            "📖 %s #%s: up to date (%.1fs)", progress.guild_name, progress.channel_name, progress.elapsed_seconds,
+        )
+
+
+class RateLimitGate:
+    """Shared pause switch for a backfill run.
+
+    discord.py already honours per-route X-RateLimit-* headers by
+    sleeping inside its HTTP client. What it can't do is stop OUR other
+    in-flight channels when Discord reports a global limit - this gate
+    does that: every channel task waits on it before (re)starting.
+    """
+
+    def __init__(self) -> None:
+        self._open = asyncio.Event()
+        self._open.set()
+        self._reopen_at = 0.0
+
+    async def wait(self) -> None:
+        """Wait until no global pause is active."""
+        await self._open.wait()
+
+    def pause(self, seconds: float) -> None:
+        """Close the gate for `seconds` (extends an existing pause)."""
+        loop = asyncio.get_running_loop()
+        reopen_at = loop.time() + seconds
+        if reopen_at <= self._reopen_at:
+            return
+        self._reopen_at = reopen_at
+        self._open.clear()
+        loop.call_at(reopen_at, self._maybe_reopen, reopen_at)
+
+    def _maybe_reopen(self, reopen_at: float) -> None:
+        if reopen_at >= self._reopen_at:
+            self._open.set()
+
+
+def _rate_limit_info(error: Exception) -> Optional[tuple[float, bool]]:
+    """Extract (retry_after_seconds, is_global) from a rate-limit error.
+
+    Returns None if the error isn't a rate limit.
+    """
+    if isinstance(error, discord.RateLimited):
+        return error.retry_after, False
+
+    if isinstance(error, discord.HTTPException) and error.status == 429:
+        headers = getattr(error.response, "headers", None) or {}
+        retry_after = headers.get("Retry-After") or headers.get("X-RateLimit-Reset-After") or 1.0
+        is_global = (
+            headers.get("X-RateLimit-Global", "").lower() == "true"
+            or headers.get("X-RateLimit-Scope", "") == "global"
+        )
+        try:
+            return float(retry_after), is_global
+        except ValueError:
+            return 1.0, is_global
+
+    return None
+
+
+async def _index_channel_with_retry(
+    channel: discord.TextChannel,
+    limit: int,
+    days_back: int,
+    gate: RateLimitGate,
+    max_retries: int,
+    throttle: Optional[Throttle] = None,
+) -> dict:
+    """Index one channel, backing off and retrying on 429s."""
+    attempt = 0
+    while True:
+        await gate.wait()
+        try:
+            return await index_channel_history(
+                channel, limit=limit, days_back=days_back, throttle=throttle,
+            )
+        except (discord.HTTPException, discord.RateLimited) as e:
+            info = _rate_limit_info(e)
+            if info is None or attempt >= max_retries:
+                raise
+            retry_after, is_global = info
+            if is_global:
+                gate.pause(retry_after)
+            attempt += 1
+            await asyncio.sleep(retry_after)
 
 
 async def index_guild_history(
     guild: discord.Guild,
     limit_per_channel: int = 500,
     days_back: int = 30,
+    config: Optional[BackfillConfig] = None,
+    on_progress: Optional[ProgressCallback] = log_channel_progress,
+    global_limit: Optional[asyncio.Semaphore] = None,
+    gate: Optional[RateLimitGate] = None,
 ) -> dict:
     """Index message history from all text channels in a guild.
 
+    Channels are indexed concurrently, at most config.per_guild_concurrency
+    at a time (and, when called from index_all_guilds, within the shared
+    global limit).
+
     Args:
         guild: Discord guild to index
         limit_per_channel: Max messages per channel
         days_back: How many days back to look
+        config: Concurrency limits (uses defaults if None)
+        on_progress: Called once per channel as it finishes
+        global_limit: Shared semaphore capping channels across guilds
+        gate: Shared global rate-limit gate
 
     Returns:
         Dict with aggregated stats
     """
+    config = config or BackfillConfig()
+    guild_limit = asyncio.Semaphore(max(1, config.per_guild_concurrency))
+    global_limit = global_limit or asyncio.Semaphore(max(1, config.max_concurrency))
+    gate = gate or RateLimitGate()
+
     total_stats = {
         "channels_processed": 0,
         "new_messages": 0,
@@ -207,35 +549,51 @@ async def index_guild_history(
         "users_updated": 0,
     }
 
-    for channel in guild.text_channels:
-        # Check if we have permission to read history
-        if not channel.permissions_for(guild.me).read_message_history:
-            print(f"  ⏭️  Skipping #{channel.name} (no read permission)")
-            continue
-
-        print(f"  📖 Indexing #{channel.name}...")
-
-        try:
-            stats = await index_channel_history(
-                channel,
-                limit=limit_per_channel,
-                days_back=days_back,
-            )
-
-            total_stats["channels_processed"] += 1
-            total_stats["new_messages"] += stats["new_messages"]
-            total_stats["skipped_messages"] += stats["skipped_messages"]
-            total_stats["total_processed"] += stats["total_processed"]
-            total_stats["users_updated"] += stats["users_updated"]
+    def report(progress: ChannelProgress) -> None:
+        if on_progress:
+            on_progress(progress)
 
-            if stats["new_messages"] > 0:
-                print(f"    ✨ Found {stats['new_messages']} new messages!")
-
-        except discord.Forbidden:
-            print(f"  ⏭️  Skipping #{channel.name} (forbidden)")
-        except Exception as e:
-            print(f"  ❌ Error indexing #{channel.name}: {e}")
+    async def index_one(channel: discord.TextChannel) -> None:
+        progress = ChannelProgress(
+            guild_name=guild.name,
+            channel_name=channel.name,
+            channel_id=str(channel.id),
+            status="indexed",
+        )
 
+        # Check if we have permission to read history
+        if not channel.permissions_for(guild.me).read_message_history:
+            progress.status, progress.reason = "skipped", "no read permission"
+            report(progress)
+            return
+
+        async with guild_limit, global_limit:
+            started = time.perf_counter()
+            try:
+                stats = await _index_channel_with_retry(
+                    channel,
+                    limit=limit_per_channel,
+                    days_back=days_back,
+                    gate=gate,
+                    max_retries=config.max_rate_limit_retries,
+                    throttle=config.throttle,
+                )
+            except discord.Forbidden:
+                progress.status, progress.reason = "skipped", "forbidden"
+            except Exception as e:
+                progress.status, progress.reason = "failed", str(e)
+            else:
+                progress.stats = stats
+                total_stats["channels_processed"] += 1
+                total_stats["new_messages"] += stats["new_messages"]
+                total_stats["skipped_messages"] += stats["skipped_messages"]
+                total_stats["total_processed"] += stats["total_processed"]
+                total_stats["users_updated"] += stats["users_updated"]
+            progress.elapsed_seconds = time.perf_counter() - started
+
+        report(progress)
+
+    await asyncio.gather(*(index_one(channel) for channel in guild.text_channels))
     return total_stats
 
 
@@ -243,19 +601,29 @@ async def index_all_guilds(
     client: discord.Client,
     limit_per_channel: int = 500,
     days_back: int = 30,
+    config: Optional[BackfillConfig] = None,
+    on_progress: Optional[ProgressCallback] = log_channel_progress,
 ) -> dict:
     """Index message history from all guilds the bot is in.
 
-    This is the main entry point - call this on bot startup!
+    This is the main entry point - call this on bot startup! Guilds and
+    their channels are backfilled concurrently within the limits in
+    config, so startup is bounded by Discord latency, not channel count.
 
     Args:
         client: Discord client instance
         limit_per_channel: Max messages per channel
         days_back: How many days back to look
+        config: Concurrency limits (uses defaults if None)
+        on_progress: Called once per channel as it finishes
 
     Returns:
         Dict with aggregated stats across all guilds
     """
+    config = config or BackfillConfig()
+    global_limit = asyncio.Semaphore(max(1, config.max_concurrency))
+    gate = RateLimitGate()
+
     total_stats = {
         "guilds_processed": 0,
         "channels_processed": 0,
@@ -264,13 +632,17 @@ async def index_all_guilds(
         "total_processed": 0,
     }
 
-    for guild in client.guilds:
-        print(f"🏠 Indexing guild: {guild.name}")
+    async def index_one(guild: discord.Guild) -> None:
+        logger.info("🏠 Indexing guild: %s", guild.name)
 
         stats = await index_guild_history(
             guild,
             limit_per_channel=limit_per_channel,
             days_back=days_back,
+            config=config,
+            on_progress=on_progress,
+            global_limit=global_limit,
+            gate=gate,
         )
 
         total_stats["guilds_processed"] += 1
@@ -279,4 +651,5 @@ async def index_all_guilds(
         total_stats["skipped_messages"] += stats["skipped_messages"]
         total_stats["total_processed"] += stats["total_processed"]
 
+    await asyncio.gather(*(index_one(guild) for guild in client.guilds))
     return total_stats
@@ -0,0 +1,387 @@
+"""
+Retention - Forgetting Gracefully 🐕🗄️
+
+indexed_messages used to only ever grow. The retention engine keeps the
+online brain bounded:
+
+- Policies by age and by row count, per channel, with per-guild and
+  per-channel overrides on top of a default
+- Expired rows are moved (not just deleted) to an archive DB file
+  attached next to the brain, with their content zlib-compressed
+- Work happens in small batches, one short writer transaction each,
+  yielding to live traffic between batches
+- Freed pages are returned to the OS with PRAGMA incremental_vacuum in
+  small slices, never a stop-the-world VACUUM
+
+Moves are idempotent: rows are copied into the archive (INSERT OR
+IGNORE) before they're deleted from the brain, so a crash between the
+two just repeats the move next time.
+
+Incremental vacuum needs auto_vacuum=INCREMENTAL, which new brains get
+automatically. Older brains need a one-time full VACUUM to switch over -
+that only happens if convert_to_incremental is set, since it blocks the
+writer for as long as it takes.
+
+Note: keep max_age_days at or above the backfill's days_back. Channels
+with a watermark never re-fetch old history, but a brand new channel's
+first backfill would otherwise re-index messages we just archived.
+"""
+
+import asyncio
+import logging
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+import aiosqlite
+
+from discord_puppy.memory.database import ConnectionManager, get_connection_manager
+
+logger = logging.getLogger("discord_puppy.memory.retention")
+
+ARCHIVE_SCHEMA = "archive"
+
+
+@dataclass
+class RetentionPolicy:
+    """How much history to keep online for one channel."""
+    max_age_days: Optional[float] = 90.0  # None = keep regardless of age
+    max_rows: Optional[int] = 50_000      # Per channel; None = no cap
+
+
+@dataclass
+class RetentionConfig:
+    """Configuration for the retention engine."""
+    default: RetentionPolicy = field(default_factory=RetentionPolicy)
+    guilds: dict[str, RetentionPolicy] = field(default_factory=dict)    # guild_id -> policy
+    channels: dict[str, RetentionPolicy] = field(default_factory=dict)  # channel_id -> policy
+
+    archive: bool = True                    # False = delete expired rows outright
+    archive_path: Optional[Path] = None     # Defaults to <brain>.archive.db
+    compression_level: int = 6
+
+    batch_size: int = 500                   # Rows moved per transaction
+    interval_seconds: float = 600.0         # How often a pass runs
+    vacuum_pages: int = 256                 # Pages freed per vacuum slice
+    convert_to_incremental: bool = False    # One-time full VACUUM on old brains
+
+    def policy_for(self, channel_id: str, guild_id: Optional[str]) -> RetentionPolicy:
+        """Channel override, else guild override, else the default."""
+        if channel_id in self.channels:
+            return self.channels[channel_id]
+        if guild_id is not None and guild_id in self.guilds:
+            return self.guilds[guild_id]
+        return self.default
+
+
+def compress_content(text: Optional[str], level: int = 6) -> Optional[bytes]:
+    """zlib-compress message content for the archive."""
+    if text is None:
+        return None
+    return zlib.compress(text.encode("utf-8"), level)
+
+
+def decompress_content(blob: Optional[bytes]) -> Optional[str]:
+    """Inverse of compress_content."""
+    if blob is None:
+        return None
+    return zlib.decompress(blob).decode("utf-8")
+
+
+async def expired_cutoff(
+    conn: aiosqlite.Connection,
+    channel_id: str,
+    policy: RetentionPolicy,
+    now: datetime,
+) -> Optional[str]:
+    """The message_timestamp below which a channel's rows are expired.
+
+    Returns:
+        ISO timestamp (rows strictly older are expired), or None if the
+        channel is within policy
+    """
+    cutoffs = []
+    if policy.max_age_days is not None:
+        cutoffs.append((now - timedelta(days=policy.max_age_days)).isoformat())
+
+    if policy.max_rows is not None:
+        # Timestamp of the max_rows-th newest message (idx_message_channel)
+        cursor = await conn.execute("""
+            SELECT message_timestamp FROM indexed_messages
+            WHERE channel_id = ?
+            ORDER BY message_timestamp DESC
+            LIMIT 1 OFFSET ?
+        """, (channel_id, max(policy.max_rows - 1, 0)))
+        row = await cursor.fetchone()
+        if row is not None and row[0] is not None:
+            cutoffs.append(row[0])
+
+    return max(cutoffs) if cutoffs else None
+
+
+class RetentionEngine:
+    """Moves expired messages to the archive, then vacuums in slices."""
+
+    def __init__(
+        self,
+        config: Optional[RetentionConfig] = None,
+        manager: Optional[ConnectionManager] = None,
+        busy: Optional[Callable[[], bool]] = None,
+        max_yield_seconds: float = 5.0,
+    ):
+        """Initialize the retention engine.
+
+        Args:
+            config: Retention configuration (uses defaults if None)
+            manager: Connection manager to write through (process-wide if None)
+            busy: Returns True while live traffic should go first
+            max_yield_seconds: Longest a single batch waits on busy()
+        """
+        self.config = config or RetentionConfig()
+        self._manager = manager
+        self.busy = busy
+        self.max_yield_seconds = max_yield_seconds
+
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self._runs = 0
+        self._archived = 0
+        self._deleted = 0
+        self._vacuumed_pages = 0
+        self._last_run: Optional[datetime] = None
+
+    @property
+    def manager(self) -> ConnectionManager:
+        return self._manager or get_connection_manager()
+
+    @property
+    def archive_path(self) -> Path:
+        if self.config.archive_path is not None:
+            return self.config.archive_path
+        brain = self.manager.path
+        return brain.with_name(f"{brain.stem}.archive{brain.suffix}")
+
+    def start(self) -> None:
+        """Start periodic retention passes."""
+        if self._running:
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop retention (a half-done pass just resumes next time)."""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while self._running:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("❌ Retention pass failed: %s", e)
+            await asyncio.sleep(self.config.interval_seconds)
+
+    async def _yield_to_live_traffic(self) -> None:
+        """Wait (bounded) while live traffic is busy, then yield once."""
+        if self.busy:
+            waited = 0.0
+            while self.busy() and waited < self.max_yield_seconds:
+                await asyncio.sleep(0.1)
+                waited += 0.1
+        await asyncio.sleep(0)
+
+    async def _ensure_archive(self, conn: aiosqlite.Connection) -> None:
+        """Attach the archive DB to the writer and make sure its table exists."""
+        cursor = await conn.execute("PRAGMA database_list")
+        if any(row["name"] == ARCHIVE_SCHEMA for row in await cursor.fetchall()):
+            return
+
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        await conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (str(self.archive_path),))
+        await conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.journal_mode = WAL")
+        await conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.archived_messages (
+                message_hash TEXT PRIMARY KEY,
+                message_id TEXT NOT NULL,
+                channel_id TEXT NOT NULL,
+                guild_id TEXT,
+                user_id TEXT NOT NULL,
+                content_zlib BLOB,
+                message_timestamp TIMESTAMP,
+                indexed_at TIMESTAMP,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_archived_channel
+            ON archived_messages(channel_id, message_timestamp)
+        """)
+
+    async def _channels(self) -> list[aiosqlite.Row]:
+        async with self.manager.reader("retention_channels") as conn:
+            cursor = await conn.execute("""
+                SELECT channel_id, MAX(guild_id) AS guild_id
+                FROM indexed_messages
+                GROUP BY channel_id
+            """)
+            return await cursor.fetchall()
+
+    async def _move_batch(self, channel_id: str, cutoff: str) -> int:
+        """Archive + delete one batch of expired rows. Returns rows moved."""
+        async with self.manager.writer("retention_move") as conn:
+            cursor = await conn.execute("""
+                SELECT id, message_hash, message_id, channel_id, guild_id, user_id,
+                       content_preview, message_timestamp, indexed_at
+                FROM indexed_messages
+                WHERE channel_id = ? AND message_timestamp < ?
+                ORDER BY message_timestamp
+                LIMIT ?
+            """, (channel_id, cutoff, self.config.batch_size))
+            rows = await cursor.fetchall()
+            if not rows:
+                return 0
+
+            if self.config.archive:
+                await self._ensure_archive(conn)
+                level = self.config.compression_level
+                await conn.executemany(f"""
+                    INSERT OR IGNORE INTO {ARCHIVE_SCHEMA}.archived_messages (
+                        message_hash, message_id, channel_id, guild_id, user_id,
+                        content_zlib, message_timestamp, indexed_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (
+                        row["message_hash"], row["message_id"], row["channel_id"],
+                        row["guild_id"], row["user_id"],
+                        compress_content(row["content_preview"], level),
+                        row["message_timestamp"], row["indexed_at"],
+                    )
+                    for row in rows
+                ])
+
+            ids = [row["id"] for row in rows]
+            await conn.execute(
+                f"DELETE FROM indexed_messages WHERE id IN ({','.join('?' * len(ids))})",
+                ids,
+            )
+
+        if self.config.archive:
+            self._archived += len(rows)
+        else:
+            self._deleted += len(rows)
+        return len(rows)
+
+    async def enforce(self, now: Optional[datetime] = None) -> int:
+        """Move every channel's expired rows out of the brain.
+
+        Args:
+            now: Reference time for age policies (defaults to now, UTC)
+
+        Returns:
+            Rows moved (or deleted, if archiving is off)
+        """
+        # Aware, like the stored message timestamps, so the ISO strings compare
+        now = now or datetime.now(timezone.utc)
+        moved = 0
+        for channel in await self._channels():
+            channel_id = channel["channel_id"]
+            policy = self.config.policy_for(channel_id, channel["guild_id"])
+
+            async with self.manager.reader("retention_cutoff") as conn:
+                cutoff = await expired_cutoff(conn, channel_id, policy, now)
+            if cutoff is None:
+                continue
+
+            while True:
+                await self._yield_to_live_traffic()
+                batch = await self._move_batch(channel_id, cutoff)
+                moved += batch
+                if batch < self.config.batch_size:
+                    break
+        return moved
+
+    async def _auto_vacuum_mode(self) -> int:
+        async with self.manager.writer("retention_vacuum") as conn:
+            cursor = await conn.execute("PRAGMA auto_vacuum")
+            return (await cursor.fetchone())[0]
+
+    async def vacuum(self) -> int:
+        """Return free pages to the OS, vacuum_pages at a time.
+
+        Returns:
+            Pages freed
+        """
+        mode = await self._auto_vacuum_mode()
+        if mode != 2:  # 2 = INCREMENTAL
+            if not self.config.convert_to_incremental:
+                logger.info("🗄️ Brain predates incremental vacuum - skipping (see convert_to_incremental)")
+                return 0
+            logger.warning("🗄️ Converting brain to incremental vacuum (one-time full VACUUM)...")
+            async with self.manager.writer("retention_vacuum") as conn:
+                await conn.commit()  # VACUUM can't run inside a transaction
+                await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                await conn.execute("VACUUM")
+            return 0
+
+        freed = 0
+        while True:
+            await self._yield_to_live_traffic()
+            async with self.manager.writer("retention_vacuum") as conn:
+                cursor = await conn.execute("PRAGMA freelist_count")
+                free = (await cursor.fetchone())[0]
+                if free == 0:
+                    break
+                cursor = await conn.execute(f"PRAGMA incremental_vacuum({int(self.config.vacuum_pages)})")
+                await cursor.fetchall()  # Each step frees a page - run it to completion
+                cursor = await conn.execute("PRAGMA freelist_count")
+                remaining = (await cursor.fetchone())[0]
+            freed += free - remaining
+            if remaining >= free:
+                break  # Nothing more we can free right now
+
+        if freed:
+            # Let the WAL shrink back too (never blocks readers)
+            async with self.manager.writer("retention_vacuum") as conn:
+                await conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        self._vacuumed_pages += freed
+        return freed
+
+    async def run_once(self, now: Optional[datetime] = None) -> dict:
+        """One full pass: enforce policies, then vacuum.
+
+        Returns:
+            Rows moved and pages freed by this pass
+        """
+        moved = await self.enforce(now)
+        freed = await self.vacuum() if moved else 0
+
+        self._runs += 1
+        self._last_run = datetime.utcnow()
+        if moved:
+            logger.info("🗄️ Retention: moved %d message(s), freed %d page(s)", moved, freed)
+        return {"moved": moved, "pages_freed": freed}
+
+    def stats(self) -> dict:
+        """Retention statistics."""
+        return {
+            "runs": self._runs,
+            "archived": self._archived,
+            "deleted": self._deleted,
+            "vacuumed_pages": self._vacuumed_pages,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "archive_path": str(self.archive_path) if self.config.archive else None,
+        }
@@ -0,0 +1,158 @@
+"""
+Message Search - Sniffing Through the Archives 🔍🐕
+
+Full-text search over indexed messages, backed by the messages_fts
+FTS5 index (see database.init_database). Results are ranked by bm25
+relevance instead of scanning every row with LIKE.
+
+Query Syntax (friendly subset of FTS5):
+- pizza party         -> messages containing both words
+- "pizza party"       -> the exact phrase
+- pizz*               -> prefix match (pizza, pizzeria, ...)
+- cats OR dogs        -> either word
+"""
+
+import re
+from typing import Optional
+
+import aiosqlite
+
+# Quoted phrases, or runs of anything that isn't whitespace/quote
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Characters FTS5 treats as syntax - stripped from bare terms
+_FTS_SYNTAX_RE = re.compile(r'["()*:^{}+\-]')
+
+
+def build_fts_query(query: str) -> str:
+    """Turn a user-supplied search string into a safe FTS5 MATCH expression.
+
+    Every term is quoted so stray punctuation can never raise an FTS5
+    syntax error. A trailing * on a bare term keeps prefix matching, and
+    an uppercase OR between terms is passed through.
+
+    Args:
+        query: Raw search string
+
+    Returns:
+        FTS5 MATCH expression, or "" if the query has no searchable terms
+    """
+    parts: list[str] = []
+    for match in _TOKEN_RE.finditer(query or ""):
+        phrase, bare = match.group(1), match.group(2)
+
+        if phrase is not None:
+            phrase = _FTS_SYNTAX_RE.sub(" ", phrase).strip()
+            if phrase:
+                parts.append(f'"{phrase}"')
+            continue
+
+        if bare == "OR":
+            if parts and parts[-1] != "OR":
+                parts.append("OR")
+            continue
+
+        is_prefix = bare.endswith("*")
+        words = _FTS_SYNTAX_RE.sub(" ", bare).split()
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            parts.append(f'"{word}"*' if is_prefix and last else f'"{word}"')
+
+    # A dangling OR is a syntax error
+    while parts and parts[-1] == "OR":
+        parts.pop()
+    if parts and parts[0] == "OR":
+        parts.pop(0)
+
+    return " ".join(parts)
+
+
+async def search_indexed_messages(
+    conn: aiosqlite.Connection,
+    query: str = "",
+    limit: int = 20,
+    channel_id: Optional[str] = None,
+    user: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> list[aiosqlite.Row]:
+    """Search indexed messages, best matches first.
+
+    With no searchable terms this falls back to the most recent messages
+    matching the filters.
+
+    Args:
+        conn: Active database connection
+        query: Search string (see module docstring for syntax)
+        limit: Max results
+        channel_id: Only messages from this channel
+        user: Only messages from this user (ID, username or display name)
+        since: Only messages at/after this ISO timestamp (e.g. "2024-05-01")
+        until: Only messages before this ISO timestamp
+
+    Returns:
+        Rows with content_preview, message_timestamp, channel_id,
+        display_name and discord_username
+    """
+    match_expr = build_fts_query(query)
+
+    # With search terms, FTS5 drives and hands rows back already in rank
+    # order. The unary + keeps the planner from starting at an
+    # indexed_messages index instead and sorting every match afterwards.
+    m = "+m" if match_expr else "m"
+
+    filters: list[str] = []
+    params: list = []
+
+    if channel_id:
+        filters.append(f"{m}.channel_id = ?")
+        params.append(str(channel_id))
+    if user:
+        # Resolve the user up front: with a single user_id the recency path
+        # walks idx_message_user in order instead of sorting
+        cursor = await conn.execute("""
+            SELECT user_id FROM user_notes
+            WHERE user_id = ?1
+               OR discord_username = ?1 COLLATE NOCASE
+               OR display_name = ?1 COLLATE NOCASE
+            LIMIT 20
+        """, (user,))
+        user_ids = [row[0] for row in await cursor.fetchall()]
+        if not user_ids:
+            return []
+        filters.append(f"{m}.user_id IN ({','.join('?' * len(user_ids))})")
+        params.extend(user_ids)
+    if since:
+        filters.append(f"{m}.message_timestamp >= ?")
+        params.append(since)
+    if until:
+        filters.append(f"{m}.message_timestamp < ?")
+        params.append(until)
+
+    if match_expr:
+        where = " AND ".join(["messages_fts MATCH ?"] + filters)
+        sql = f"""
+            SELECT m.content_preview, m.message_timestamp, m.channel_id,
+                   u.display_name, u.discord_username
+            FROM messages_fts
+            JOIN indexed_messages m ON m.id = messages_fts.rowid
+            LEFT JOIN user_notes u ON m.user_id = u.user_id
+            WHERE {where}
+            ORDER BY messages_fts.rank
+            LIMIT ?
+        """
+        params = [match_expr] + params
+    else:
+        where = " AND ".join(filters) or "1"
+        sql = f"""
+            SELECT m.content_preview, m.message_timestamp, m.channel_id,
+                   u.display_name, u.discord_username
+            FROM indexed_messages m
+            LEFT JOIN user_notes u ON m.user_id = u.user_id
+            WHERE {where}
+            ORDER BY m.message_timestamp DESC
+            LIMIT ?
+        """
+
+    cursor = await conn.execute(sql, (*params, limit))
+    return await cursor.fetchall()
@@ -0,0 +1,219 @@
+"""
+User Memory Cache - Knowing Who You're Talking To 🐕🧑‍🤝‍🧑
+
+Before this, the model had to spend a whole LLM turn calling
+get_user_notes just to learn who it was talking to. Now the responder
+prefetches what we remember about the authors of the pending messages
+and inlines it in the prompt - most replies take one model turn.
+
+- LRU + TTL cache keyed by user_id (bounded memory, bounded staleness)
+- get_many() fetches every miss in ONE query
+- Unknown users are cached too (as "nothing known") so we don't keep
+  asking the database about them
+- record_user_note and note rollups invalidate the user; user upserts invalidate only
+  when they change something the prompt shows (a brand new user, or a
+  new name) - interaction counts ticking up don't throw the entry away
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import aiosqlite
+
+from discord_puppy.memory.database import ConnectionManager, get_connection_manager
+from discord_puppy.memory.user_notes import top_user_notes
+
+
+@dataclass
+class UserCacheConfig:
+    """Configuration for the user memory cache."""
+    max_entries: int = 10_000       # LRU cap
+    ttl_seconds: float = 300.0      # Entries older than this are refetched
+    notes_per_user: int = 5         # Top notes carried into the prompt
+
+
+@dataclass(slots=True)
+class UserMemory:
+    """What the puppy remembers about one user."""
+    user_id: str
+    username: str
+    display_name: str
+    notes: list[str]
+    trust_level: int
+    interaction_count: int
+
+    def render(self) -> str:
+        """One prompt line about this user."""
+        name = self.display_name or self.username or self.user_id
+        handle = f" (@{self.username})" if self.username and self.username != name else ""
+        notes = "; ".join(self.notes)
+        return (
+            f"{name}{handle}: trust {self.trust_level}/10, seen {self.interaction_count}x; "
+            f"notes: {notes or '(none yet)'}"
+        )
+
+
+async def load_user_memories(
+    conn: aiosqlite.Connection,
+    user_ids: list[str],
+    notes_per_user: int = 5,
+) -> dict[str, UserMemory]:
+    """Fetch memories for many users (one query for users, one for notes).
+
+    Args:
+        conn: Active database connection
+        user_ids: Users to fetch
+        notes_per_user: Top notes to include per user
+
+    Returns:
+        user_id -> UserMemory, for the users that exist
+    """
+    if not user_ids:
+        return {}
+
+    placeholders = ",".join("?" * len(user_ids))
+    cursor = await conn.execute(f"""
+        SELECT user_id, discord_username, display_name, trust_level, interaction_count
+        FROM user_notes
+        WHERE user_id IN ({placeholders})
+    """, user_ids)
+    users = await cursor.fetchall()
+    notes = await top_user_notes(conn, [row["user_id"] for row in users], limit=notes_per_user)
+    return {
+        row["user_id"]: UserMemory(
+            user_id=row["user_id"],
+            username=row["discord_username"] or "",
+            display_name=row["display_name"] or "",
+            notes=[note["note"] for note in notes.get(row["user_id"], [])],
+            trust_level=row["trust_level"] or 5,
+            interaction_count=row["interaction_count"] or 0,
+        )
+        for row in users
+    }
+
+
+class UserMemoryCache:
+    """LRU/TTL cache of UserMemory, keyed by user_id."""
+
+    def __init__(
+        self,
+        config: Optional[UserCacheConfig] = None,
+        manager: Optional[ConnectionManager] = None,
+    ):
+        """Initialize the user memory cache.
+
+        Args:
+            config: Cache configuration (uses defaults if None)
+            manager: Connection manager to read through (process-wide if None)
+        """
+        self.config = config or UserCacheConfig()
+        self._manager = manager
+
+        # user_id -> (fetched_at, memory or None for "no such user")
+        self._entries: OrderedDict[str, tuple[float, Optional[UserMemory]]] = OrderedDict()
+
+        # Stats
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @property
+    def manager(self) -> ConnectionManager:
+        return self._manager or get_connection_manager()
+
+    def _lookup(self, user_id: str, now: float) -> tuple[bool, Optional[UserMemory]]:
+        entry = self._entries.get(user_id)
+        if entry is None or now - entry[0] > self.config.ttl_seconds:
+            return False, None
+        self._entries.move_to_end(user_id)
+        return True, entry[1]
+
+    def _store(self, user_id: str, memory: Optional[UserMemory], now: float) -> None:
+        self._entries[user_id] = (now, memory)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_many(self, user_ids: Iterable[str]) -> dict[str, UserMemory]:
+        """Memories for several users - cached where possible, one query for the rest.
+
+        Args:
+            user_ids: Users to look up (duplicates are fine)
+
+        Returns:
+            user_id -> UserMemory for the users we know, in request order
+        """
+        now = time.monotonic()
+        wanted = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        found: dict[str, Optional[UserMemory]] = {}
+        missing: list[str] = []
+
+        for user_id in wanted:
+            hit, memory = self._lookup(user_id, now)
+            if hit:
+                self._hits += 1
+                found[user_id] = memory
+            else:
+                self._misses += 1
+                missing.append(user_id)
+
+        if missing:
+            async with self.manager.reader("user_memory") as conn:
+                loaded = await load_user_memories(conn, missing, self.config.notes_per_user)
+            for user_id in missing:
+                found[user_id] = loaded.get(user_id)
+                self._store(user_id, found[user_id], now)
+
+        return {user_id: found[user_id] for user_id in wanted if found[user_id] is not None}
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's entry (their memory just changed)."""
+        if self._entries.pop(str(user_id), None) is not None:
+            self._invalidations += 1
+
+    def users_upserted(self, rows: Iterable[tuple]) -> None:
+        """React to user upserts - invalidate only where the prompt would change.
+
+        Args:
+            rows: upsert_users() rows (user_id, username, display_name, ...)
+        """
+        for user_id, username, display_name, *_ in rows:
+            entry = self._entries.get(str(user_id))
+            if entry is None:
+                continue
+            memory = entry[1]
+            if memory is None or memory.username != username or memory.display_name != display_name:
+                self.invalidate(user_id)
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+        }
+
+
+# Process-wide cache (created lazily)
+_user_cache: Optional[UserMemoryCache] = None
+
+
+def get_user_memory_cache() -> UserMemoryCache:
+    """Get the process-wide user memory cache, creating it if needed."""
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserMemoryCache()
+    return _user_cache
+
+
+def set_user_memory_cache(cache: UserMemoryCache) -> None:
+    """Install a configured cache as the process-wide one."""
+    global _user_cache
+    _user_cache = cache
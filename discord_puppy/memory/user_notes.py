@@ -0,0 +1,298 @@
+"""
+User Notes - Remembering Things About Friends (Within Reason) 🐕📝
+
+Notes used to be one TEXT blob per user: record_user_note read it,
+appended a line and wrote it back. That lost updates under concurrent
+writes, grew forever, and every read dragged the whole history into the
+prompt.
+
+Now every note is its own row in user_note_entries:
+- add_user_note() is a single INSERT - atomic, nothing to lose - and
+  caps each note at MAX_NOTE_CHARS
+- top_user_notes() returns the N most important (then newest) notes
+  per user, straight off an index
+- A periodic rollup keeps each user within a NotesBudget: the newest
+  and most important notes are kept as-is, the rest are folded into one
+  rollup note (and whatever doesn't fit in that is forgotten)
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import aiosqlite
+
+from discord_puppy.memory.database import ConnectionManager, get_connection_manager
+
+logger = logging.getLogger("discord_puppy.memory.user_notes")
+
+MIN_IMPORTANCE = 1
+MAX_IMPORTANCE = 5
+DEFAULT_IMPORTANCE = 3
+MAX_NOTE_CHARS = 500        # One note is one fact, not an essay
+NOTES_QUERY_CHUNK = 500     # User IDs per top_user_notes query
+
+
+@dataclass
+class NotesBudget:
+    """How much the puppy may remember about any one user."""
+    max_notes: int = 40                 # Rows per user before a rollup
+    max_chars: int = 4000               # Total note text per user before a rollup
+    keep_notes: int = 15                # Kept verbatim by a rollup
+    rollup_max_chars: int = 1000        # Size of the folded rollup note
+    interval_seconds: float = 3600.0    # How often the rollup runs
+
+
+def clamp_importance(importance: int) -> int:
+    """Keep importance within 1..5."""
+    return max(MIN_IMPORTANCE, min(MAX_IMPORTANCE, int(importance)))
+
+
+async def add_user_note(
+    conn: aiosqlite.Connection,
+    user_id: str,
+    note: str,
+    importance: int = DEFAULT_IMPORTANCE,
+) -> int:
+    """Append one note about a user.
+
+    Does NOT commit - the caller owns the transaction.
+
+    Args:
+        conn: Active database connection
+        user_id: Who the note is about (must exist in user_notes)
+        note: The note text (cut off at MAX_NOTE_CHARS)
+        importance: 1 (trivia) to 5 (never forget)
+
+    Returns:
+        The new note's id
+    """
+    note = note.strip()
+    if len(note) > MAX_NOTE_CHARS:
+        note = note[:MAX_NOTE_CHARS - 1].rstrip() + "…"
+    cursor = await conn.execute(
+        "INSERT INTO user_note_entries (user_id, note, importance) VALUES (?, ?, ?)",
+        (user_id, note, clamp_importance(importance)),
+    )
+    return cursor.lastrowid
+
+
+async def top_user_notes(
+    conn: aiosqlite.Connection,
+    user_ids: list[str],
+    limit: int = 5,
+) -> dict[str, list[aiosqlite.Row]]:
+    """The most important, then newest, notes for each user.
+
+    Args:
+        conn: Active database connection
+        user_ids: Users to fetch notes for
+        limit: Max notes per user
+
+    Returns:
+        user_id -> note rows (note, importance, created_at, is_rollup, rank), best first
+    """
+    if not user_ids:
+        return {}
+
+    # Rank each user's notes straight off the index - no sort needed.
+    # IDs go in chunks so list_users(limit=600) stays under SQLite's
+    # bound-parameter limit.
+    notes: dict[str, list[aiosqlite.Row]] = {user_id: [] for user_id in user_ids}
+    for start in range(0, len(user_ids), NOTES_QUERY_CHUNK):
+        chunk = user_ids[start:start + NOTES_QUERY_CHUNK]
+        cursor = await conn.execute(f"""
+            SELECT user_id, note, importance, created_at, is_rollup, rank
+            FROM (
+                SELECT user_id, note, importance, created_at, is_rollup,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY user_id ORDER BY importance DESC, id DESC
+                       ) AS rank
+                FROM user_note_entries
+                WHERE user_id IN ({','.join('?' * len(chunk))})
+            )
+            WHERE rank <= ?
+        """, (*chunk, limit))
+        for row in await cursor.fetchall():
+            notes[row["user_id"]].append(row)
+
+    for rows in notes.values():
+        rows.sort(key=lambda row: row["rank"])
+    return notes
+
+
+async def rollup_user_notes(
+    conn: aiosqlite.Connection,
+    user_id: str,
+    budget: NotesBudget,
+) -> int:
+    """Fold one user's notes down to the budget.
+
+    Keeps up to keep_notes best (importance, then newest) notes verbatim and
+    folds everything else - previous rollups included - into a single
+    rollup note of at most rollup_max_chars. Duplicate notes collapse.
+    Deterministic: the same notes always roll up the same way.
+
+    Does NOT commit - the caller owns the transaction.
+
+    Args:
+        conn: Active database connection
+        user_id: User to roll up
+        budget: Limits to enforce
+
+    Returns:
+        Number of note rows removed
+    """
+    cursor = await conn.execute("""
+        SELECT id, note, importance, created_at
+        FROM user_note_entries
+        WHERE user_id = ?
+        ORDER BY importance DESC, id DESC
+    """, (user_id,))
+    rows = await cursor.fetchall()
+
+    # Keep the best notes verbatim - fewer if they alone blow the char budget
+    keep = budget.keep_notes
+    while keep > 0 and sum(len(row["note"]) for row in rows[:keep]) + budget.rollup_max_chars > budget.max_chars:
+        keep -= 1
+    kept = rows[:keep]
+    folded = rows[keep:]
+    if not folded:
+        return 0
+
+    # Best first, skipping anything we already said
+    seen = {row["note"].casefold() for row in kept}
+    pieces: list[str] = []
+    length = 0
+    for row in folded:
+        text = row["note"]
+        if text.casefold() in seen:
+            continue
+        seen.add(text.casefold())
+        if length + len(text) + 2 > budget.rollup_max_chars:
+            continue  # A shorter note further down may still fit
+        pieces.append(text)
+        length += len(text) + 2
+
+    doomed = [row["id"] for row in folded]
+    await conn.execute(
+        f"DELETE FROM user_note_entries WHERE id IN ({','.join('?' * len(doomed))})",
+        doomed,
+    )
+    if pieces:
+        await conn.execute("""
+            INSERT INTO user_note_entries (user_id, note, importance, is_rollup, created_at)
+            VALUES (?, ?, ?, 1, ?)
+        """, (
+            user_id,
+            "; ".join(pieces),
+            max(row["importance"] for row in folded),
+            max(row["created_at"] for row in folded),
+        ))
+        return len(doomed) - 1
+    return len(doomed)
+
+
+async def users_over_budget(conn: aiosqlite.Connection, budget: NotesBudget) -> list[str]:
+    """Users whose notes exceed the budget's row or character limits."""
+    cursor = await conn.execute("""
+        SELECT user_id
+        FROM user_note_entries
+        GROUP BY user_id
+        HAVING COUNT(*) > ? OR SUM(LENGTH(note)) > ?
+    """, (budget.max_notes, budget.max_chars))
+    return [row["user_id"] for row in await cursor.fetchall()]
+
+
+class NoteRollup:
+    """Periodically rolls up users whose notes outgrew the budget."""
+
+    def __init__(
+        self,
+        budget: Optional[NotesBudget] = None,
+        manager: Optional[ConnectionManager] = None,
+    ):
+        """Initialize the note rollup.
+
+        Args:
+            budget: Per-user limits (uses defaults if None)
+            manager: Connection manager to write through (process-wide if None)
+        """
+        self.budget = budget or NotesBudget()
+        self._manager = manager
+
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self._runs = 0
+        self._users_rolled_up = 0
+        self._notes_removed = 0
+
+    @property
+    def manager(self) -> ConnectionManager:
+        return self._manager or get_connection_manager()
+
+    def start(self) -> None:
+        """Start the periodic rollup."""
+        if self._running:
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the periodic rollup."""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while self._running:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("❌ Note rollup failed: %s", e)
+            await asyncio.sleep(self.budget.interval_seconds)
+
+    async def run_once(self) -> int:
+        """Roll up every user over budget, one short transaction each.
+
+        Returns:
+            Number of note rows removed
+        """
+        # Deferred import - the cache imports this module
+        from discord_puppy.memory.user_cache import get_user_memory_cache
+
+        async with self.manager.reader("notes_over_budget") as conn:
+            user_ids = await users_over_budget(conn, self.budget)
+
+        removed = 0
+        for user_id in user_ids:
+            async with self.manager.writer("note_rollup") as conn:
+                removed += await rollup_user_notes(conn, user_id, self.budget)
+            get_user_memory_cache().invalidate(user_id)
+            await asyncio.sleep(0)  # Let live writes in between users
+
+        self._runs += 1
+        self._users_rolled_up += len(user_ids)
+        self._notes_removed += removed
+        if user_ids:
+            logger.info("📝 Rolled up notes for %d user(s), %d row(s) folded", len(user_ids), removed)
+        return removed
+
+    def stats(self) -> dict:
+        """Rollup statistics."""
+        return {
+            "runs": self._runs,
+            "users_rolled_up": self._users_rolled_up,
+            "notes_removed": self._notes_removed,
+        }
@@ -0,0 +1,165 @@
+"""
+User Resolver - Figuring Out WHO "dave" Is 🐕🔎
+
+get_user_notes and record_user_note used to find people with
+`LIKE '%x%'` on two columns: a full scan of user_notes on every call,
+and record_user_note would happily write to whichever partial match
+came back first.
+
+Resolution now goes from most to least precise, and every step but the
+last is an index lookup:
+1. Mention syntax (<@123>, <@!123>) or a raw user ID -> primary key
+2. Case-insensitive exact username / display name -> NOCASE indexes
+3. Fuzzy fallback -> trigram index over names, candidates re-ranked by
+   string similarity (short queries use a NOCASE prefix range instead)
+
+Callers that write (record_user_note) should insist on a unique exact
+match - resolution.unique is None whenever the answer is ambiguous.
+"""
+
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Optional
+
+import aiosqlite
+
+MENTION_PATTERN = re.compile(r"^<@!?(\d+)>$")
+SNOWFLAKE_PATTERN = re.compile(r"^\d{15,21}$")
+
+# Methods that name exactly one person (or exactly that name)
+EXACT_METHODS = ("mention", "id", "exact")
+
+FUZZY_CANDIDATES = 50      # Trigram hits re-ranked in Python
+FUZZY_MIN_SCORE = 0.5      # Below this it's not really a match
+
+
+@dataclass
+class UserResolution:
+    """The outcome of resolving a user reference."""
+    query: str
+    method: str  # mention, id, exact, fuzzy, none
+    matches: list[aiosqlite.Row] = field(default_factory=list)
+    scores: list[float] = field(default_factory=list)
+
+    @property
+    def is_exact(self) -> bool:
+        return self.method in EXACT_METHODS
+
+    @property
+    def unique(self) -> Optional[aiosqlite.Row]:
+        """The one user this refers to - None if missing, fuzzy or ambiguous."""
+        if self.is_exact and len(self.matches) == 1:
+            return self.matches[0]
+        return None
+
+
+def _similarity(query: str, row: aiosqlite.Row) -> float:
+    """How well a user's names match a (casefolded) query, 0..1."""
+    best = 0.0
+    for name in (row["discord_username"], row["display_name"]):
+        if not name:
+            continue
+        name = name.casefold()
+        score = SequenceMatcher(None, query, name).ratio()
+        if query in name:
+            # Substrings are good matches even when the name is much longer
+            score = max(score, 0.6 + 0.4 * len(query) / len(name))
+        best = max(best, score)
+    return best
+
+
+def _trigram_query(query: str) -> str:
+    """OR of every trigram in the query - rank favours names sharing most."""
+    trigrams = dict.fromkeys(query[i:i + 3] for i in range(len(query) - 2))
+    return " OR ".join('"' + t.replace('"', '""') + '"' for t in trigrams)
+
+
+async def _fuzzy_candidates(conn: aiosqlite.Connection, query: str) -> list[aiosqlite.Row]:
+    if len(query) >= 3:
+        cursor = await conn.execute("""
+            SELECT u.*
+            FROM (
+                SELECT rowid FROM user_names_fts
+                WHERE user_names_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ) AS hits
+            JOIN user_notes u ON u.user_id = CAST(hits.rowid AS TEXT)
+        """, (_trigram_query(query), FUZZY_CANDIDATES))
+        return await cursor.fetchall()
+
+    # Too short for trigrams - prefix ranges on the NOCASE indexes
+    upper = query + "\U0010ffff"
+    cursor = await conn.execute("""
+        SELECT * FROM user_notes
+        WHERE (discord_username >= ?1 COLLATE NOCASE AND discord_username < ?2 COLLATE NOCASE)
+           OR (display_name >= ?1 COLLATE NOCASE AND display_name < ?2 COLLATE NOCASE)
+        LIMIT ?3
+    """, (query, upper, FUZZY_CANDIDATES))
+    return await cursor.fetchall()
+
+
+async def resolve_user(
+    conn: aiosqlite.Connection,
+    query: str,
+    limit: int = 5,
+) -> UserResolution:
+    """Resolve a user reference (ID, mention, name or partial name).
+
+    Args:
+        conn: Active database connection
+        query: What the model called the user
+        limit: Max matches to return
+
+    Returns:
+        UserResolution with the method used and user_notes rows, best first
+    """
+    text = query.strip()
+    if not text:
+        return UserResolution(query=query, method="none")
+
+    # 1. Mentions and raw IDs
+    mention = MENTION_PATTERN.match(text)
+    if mention or SNOWFLAKE_PATTERN.match(text):
+        user_id = mention.group(1) if mention else text
+        cursor = await conn.execute("SELECT * FROM user_notes WHERE user_id = ?", (user_id,))
+        row = await cursor.fetchone()
+        if row is not None:
+            return UserResolution(
+                query=query,
+                method="mention" if mention else "id",
+                matches=[row],
+                scores=[1.0],
+            )
+        if mention:
+            return UserResolution(query=query, method="none")
+
+    # 2. Exact name, case-insensitive
+    name = text.removeprefix("@")
+    cursor = await conn.execute("""
+        SELECT * FROM user_notes
+        WHERE discord_username = ?1 COLLATE NOCASE OR display_name = ?1 COLLATE NOCASE
+        LIMIT ?2
+    """, (name, FUZZY_CANDIDATES))
+    # Most recently seen first (sorted here - a handful of rows, no temp B-tree)
+    rows = sorted(await cursor.fetchall(), key=lambda row: (row["last_seen"] or "", row["user_id"]), reverse=True)
+    if rows:
+        rows = rows[:limit]
+        return UserResolution(query=query, method="exact", matches=rows, scores=[1.0] * len(rows))
+
+    # 3. Fuzzy, ranked by similarity
+    folded = name.casefold()
+    ranked = sorted(
+        ((_similarity(folded, row), row) for row in await _fuzzy_candidates(conn, folded)),
+        key=lambda pair: (-pair[0], pair[1]["user_id"]),
+    )
+    ranked = [(score, row) for score, row in ranked if score >= FUZZY_MIN_SCORE][:limit]
+    if not ranked:
+        return UserResolution(query=query, method="none")
+    return UserResolution(
+        query=query,
+        method="fuzzy",
+        matches=[row for _, row in ranked],
+        scores=[score for score, _ in ranked],
+    )
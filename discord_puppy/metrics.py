@@ -0,0 +1,436 @@
+"""
+Metrics - Counting Every Bark 🐕📊
+
+Operational visibility used to be print() output. This module is a small
+in-process metrics registry (counters, gauges, histograms) plus a local
+HTTP endpoint that serves it in the Prometheus text format.
+
+- Metrics are declared once, at import time, next to the code they
+  measure: `SENDS = metrics.counter("puppy_sends_total", "...", ["kind"])`
+- Labelled children are cached - hot paths bind them once
+  (`SENDS.labels("reply")`) and then an update is a couple of additions
+- Anything that's cheaper to read than to track (queue depths, pool
+  sizes) is filled in by on_collect() callbacks, only when scraped
+- Everything runs on the event loop - no locks, and not thread-safe
+
+Usage:
+    server = MetricsServer(port=9108)
+    await server.start()    # GET http://127.0.0.1:9108/metrics
+"""
+
+import asyncio
+import logging
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+
+logger = logging.getLogger("discord_puppy.metrics")
+
+# Seconds - from a fast SQLite read up to a slow model run
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+AGENT_BUCKETS = (0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe how long the block took."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Metric:
+    """A named metric family with optional labels."""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values) -> object:
+        """The child for these label values (created on first use, then cached)."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._new_child()
+            self._children[key] = child
+        return child
+
+    def remove(self, *values) -> None:
+        """Drop one labelled child."""
+        self._children.pop(tuple(str(value) for value in values), None)
+
+    def clear(self) -> None:
+        """Drop every labelled child (e.g. before refilling a gauge)."""
+        if self.labelnames:
+            self._children.clear()
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        for values, child in self._children.items():
+            yield self.name, _format_labels(self.labelnames, values), child.value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return lines
+
+
+class Counter(Metric):
+    """Only goes up."""
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    """Goes up and down."""
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+
+class Histogram(Metric):
+    """Counts observations into cumulative buckets."""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, values, le), cumulative
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, child.count
+
+
+class MetricsRegistry:
+    """Every metric in the process, plus callbacks that refresh gauges."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def _register(self, metric_type: type, name: str, *args, **kwargs) -> Metric:
+        existing = self._metrics.get(name)
+        if existing is not None:
+            if not isinstance(existing, metric_type):
+                raise ValueError(f"Metric {name} already registered as a {existing.kind}")
+            return existing
+        metric = metric_type(name, *args, **kwargs)
+        self._metrics[name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def on_collect(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run callback before every scrape (usable as a decorator)."""
+        self._collectors.append(callback)
+        return callback
+
+    def render(self) -> str:
+        """Everything, in the Prometheus text exposition format."""
+        for callback in self._collectors:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("📊 Metrics collector %s failed: %s", getattr(callback, "__name__", callback), e)
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry - metrics register on it at import time
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _registry
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Declare (or fetch) a counter on the process-wide registry."""
+    return _registry.counter(name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """Declare (or fetch) a gauge on the process-wide registry."""
+    return _registry.gauge(name, documentation, labelnames)
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Declare (or fetch) a histogram on the process-wide registry."""
+    return _registry.histogram(name, documentation, labelnames, buckets)
+
+
+def on_collect(callback: Callable[[], None]) -> Callable[[], None]:
+    """Refresh gauges before every scrape of the process-wide registry."""
+    return _registry.on_collect(callback)
+
+
+# Discord sends happen in several places (replies, spontaneous barks, the
+# send tool) - they share these families
+DISCORD_SEND_SECONDS = histogram(
+    "puppy_discord_send_seconds", "Discord send round trip, including any rate limit wait", ["kind"],
+)
+DISCORD_SEND_ERRORS = counter(
+    "puppy_discord_send_errors_total", "Discord sends that failed, by HTTP status", ["kind", "status"],
+)
+DISCORD_RATE_LIMITS = counter(
+    "puppy_discord_rate_limits_total", "Discord rate limits hit (429, global) or slept on pre-emptively", ["scope"],
+)
+
+
+class DiscordRateLimitCounter(logging.Filter):
+    """Counts the rate limits discord.py handles internally.
+
+    discord.py retries 429s itself and only tells its logger - and the
+    pre-emptive waits only at DEBUG. Install with count_discord_rate_limits(),
+    which lowers "discord.http" to DEBUG so every wait reaches this filter;
+    records below pass_level are counted and then dropped, so the log
+    output stays as it was.
+    """
+
+    PATTERNS = (
+        ("We are being rate limited", "429"),
+        ("Global rate limit has been hit", "global"),
+        ("Pre-emptively rate limiting", "preemptive"),
+    )
+
+    def __init__(self, pass_level: int = logging.INFO):
+        super().__init__()
+        self.pass_level = pass_level
+        self._children = {scope: DISCORD_RATE_LIMITS.labels(scope) for _, scope in self.PATTERNS}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = str(record.msg)
+        for pattern, scope in self.PATTERNS:
+            if pattern in message:
+                self._children[scope].inc()
+                break
+        return record.levelno >= self.pass_level
+
+
+def count_discord_rate_limits(name: str = "discord.http") -> DiscordRateLimitCounter:
+    """Attach a DiscordRateLimitCounter to discord.py's HTTP logger.
+
+    Call after logging levels are configured - the logger's current level
+    is what still gets through to the log output.
+
+    Args:
+        name: Logger discord.py reports rate limits on
+
+    Returns:
+        The installed counter
+    """
+    http_logger = logging.getLogger(name)
+    counter = DiscordRateLimitCounter(pass_level=http_logger.getEffectiveLevel())
+    http_logger.setLevel(logging.DEBUG)
+    http_logger.addFilter(counter)
+    return counter
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """Tiny HTTP server for GET /metrics, on the bot's own event loop."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9108,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the metrics server.
+
+        Args:
+            host: Interface to listen on (local only by default)
+            port: TCP port (0 picks a free one)
+            registry: What to serve (process-wide if None)
+        """
+        self.host = host
+        self.port = port
+        self.registry = registry or _registry
+        self._server: Optional[asyncio.Server] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    async def start(self) -> None:
+        """Start listening (no-op if already running)."""
+        if self._server is not None:
+            return
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("📊 Metrics at http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            # Headers don't matter to us - just drain them
+            while await asyncio.wait_for(reader.readline(), timeout=5.0) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request.decode("latin-1").split()
+            if len(parts) < 2 or parts[0] not in ("GET", "HEAD"):
+                status, body = "405 Method Not Allowed", b"Method not allowed\n"
+            elif parts[1].split("?")[0] != "/metrics":
+                status, body = "404 Not Found", b"Try /metrics\n"
+            else:
+                status, body = "200 OK", self.registry.render().encode("utf-8")
+
+            head = (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode("latin-1"))
+            if parts and parts[0] != "HEAD":
+                writer.write(body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
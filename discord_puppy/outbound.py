@@ -0,0 +1,449 @@
+"""
+Outbound Scheduler - Barking in Line 🐕📮
+
+Replies, spontaneous barks and the agent's status updates used to hit
+Discord independently. Under load they collided in the same per-channel
+rate limit bucket and came back as 429s and retries - with the final
+reply stuck behind a pile of "looking that up..." chatter.
+
+Now every send goes through one scheduler:
+
+- One queue per channel, sent in priority order: replies > spontaneous
+  > status updates, first come first served within a priority
+- Sends are paced against a budget per channel (Discord allows 5
+  messages per 5 seconds) and a global one, so the scheduler waits
+  instead of Discord answering 429. A 429 that gets through anyway
+  pauses the channel for a whole window
+- Back-to-back status updates from the same agent run are merged: into
+  the queued update if it hasn't gone out yet, or as an edit of the one
+  that just went out - one message instead of five
+- Status updates that waited too long are dropped (stale chatter), and
+  so are a run's queued updates once its reply is submitted - the
+  answer is here, "still looking..." is noise
+- stats() and the metrics endpoint expose queue depth and send-queue
+  latency per kind
+
+Usage:
+    outbound = OutboundScheduler()
+    outbound.start()
+    await outbound.send(channel, "woof", SendKind.REPLY, reference=message)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Hashable, Optional
+
+import discord
+
+from discord_puppy import metrics
+from discord_puppy.response_executor import WaitTimes
+
+logger = logging.getLogger("discord_puppy.outbound")
+
+QUEUE_SECONDS = metrics.histogram(
+    "puppy_outbound_queue_seconds", "Time a send waited in the outbound queue (priority + rate limit budget)",
+    ["kind"],
+)
+OUTBOUND = metrics.counter(
+    "puppy_outbound_total", "Outbound sends by outcome: sent, edited, merged, dropped, failed", ["kind", "outcome"],
+)
+THROTTLED_SECONDS = metrics.counter(
+    "puppy_outbound_throttled_seconds_total", "Seconds channels spent waiting for rate limit budget",
+)
+
+
+class SendKind(IntEnum):
+    """Lower goes first."""
+    REPLY = 0
+    SPONTANEOUS = 1
+    STATUS = 2
+
+
+@dataclass
+class OutboundConfig:
+    """Configuration for the outbound scheduler."""
+    channel_burst: int = 5                  # Sends per channel per window...
+    channel_window_seconds: float = 5.0     # ...(Discord: 5 messages / 5s per channel)
+    global_burst: int = 40                  # Sends across all channels per window...
+    global_window_seconds: float = 1.0      # ...(kept under Discord's 50 requests/s)
+    max_queue_per_channel: int = 50         # Least urgent send dropped beyond this
+    send_timeout_seconds: float = 15.0      # One send or edit, including discord.py's own retries
+    status_merge_seconds: float = 5.0       # Status updates from one run this close together merge
+    status_deadline_seconds: float = 30.0   # Queued status updates older than this are dropped
+    max_message_length: int = 2000          # Discord's limit - merges never go past it
+
+
+@dataclass(order=True)
+class OutboundMessage:
+    """A queued send, ordered by (kind, arrival)."""
+    kind: SendKind
+    seq: int
+    content: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    reference: Any = field(default=None, compare=False)           # Message to reply to
+    run_id: Optional[Hashable] = field(default=None, compare=False)
+    edit: Optional[discord.Message] = field(default=None, compare=False)  # Edit this instead of sending
+
+
+@dataclass
+class _StatusMessage:
+    """The last status update a run posted in a channel."""
+    message: discord.Message
+    content: str
+    sent_at: float
+
+
+class _Outbox:
+    """One channel's queue, rate limit budget and recent status messages."""
+
+    def __init__(self, channel: discord.abc.Messageable):
+        self.channel = channel
+        self.queue: list[OutboundMessage] = []
+        self.sent_at: deque[float] = deque()   # Send times inside the current window
+        self.paused_until = 0.0
+        self.last_sent = 0.0
+        self.worker: Optional[asyncio.Task] = None
+        self.status: dict[Hashable, _StatusMessage] = {}
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Status senders may have stopped waiting - don't warn about it
+    if not future.cancelled():
+        future.exception()
+
+
+class OutboundScheduler:
+    """Per-channel, priority-ordered, rate-limit-aware sender."""
+
+    def __init__(self, config: Optional[OutboundConfig] = None):
+        """Initialize the outbound scheduler.
+
+        Args:
+            config: Scheduler configuration (uses defaults if None)
+        """
+        self.config = config or OutboundConfig()
+
+        self._outboxes: dict[Hashable, _Outbox] = {}
+        self._global_sent: deque[float] = deque()
+        self._seq = itertools.count()
+        self._running = False
+
+        # Stats
+        self._waits = {kind: WaitTimes() for kind in SendKind}
+        self._outcomes = {
+            (kind, outcome): OUTBOUND.labels(kind.name.lower(), outcome)
+            for kind in SendKind
+            for outcome in ("sent", "edited", "merged", "dropped", "failed")
+        }
+        self._counts = {key: 0 for key in self._outcomes}
+        self._queue_seconds = {kind: QUEUE_SECONDS.labels(kind.name.lower()) for kind in SendKind}
+        self._throttled_seconds = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(outbox.queue) for outbox in self._outboxes.values())
+
+    def start(self) -> None:
+        """Start accepting sends."""
+        self._running = True
+
+    async def stop(self, drain: bool = True, timeout: float = 10.0) -> None:
+        """Stop accepting sends and wind down.
+
+        Args:
+            drain: Let queued sends go out (up to timeout)
+            timeout: Max seconds to wait when draining
+        """
+        self._running = False
+        workers = [outbox.worker for outbox in self._outboxes.values() if outbox.worker]
+        if drain and workers:
+            await asyncio.wait(workers, timeout=timeout)
+
+        # Whatever is left gets cancelled
+        for outbox in self._outboxes.values():
+            if outbox.worker:
+                outbox.worker.cancel()
+            for item in outbox.queue:
+                if not item.future.done():
+                    item.future.cancel()
+            outbox.queue.clear()
+        workers = [outbox.worker for outbox in self._outboxes.values() if outbox.worker]
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._outboxes.clear()
+
+    async def send(
+        self,
+        channel: discord.abc.Messageable,
+        content: str,
+        kind: SendKind = SendKind.REPLY,
+        reference: Any = None,
+        run_id: Optional[Hashable] = None,
+    ) -> discord.Message:
+        """Queue a send and wait until it's out.
+
+        Cancelling the wait doesn't take the send back - a merged status
+        update may carry someone else's text too.
+
+        Args:
+            channel: Where to send
+            content: Message text
+            kind: What kind of send this is (sets its priority)
+            reference: Message to reply to (optional)
+            run_id: Agent run the send belongs to - status updates from the
+                same run merge, and a reply or spontaneous send drops the
+                run's still-queued status updates
+
+        Returns:
+            The sent (or edited) message
+
+        Raises:
+            RuntimeError: The scheduler isn't running, or the channel's
+                queue is full of more urgent sends
+            asyncio.TimeoutError: Dropped as stale, or the send timed out
+            discord.HTTPException: Discord refused the send
+        """
+        return await asyncio.shield(self.submit(channel, content, kind, reference, run_id))
+
+    def submit(
+        self,
+        channel: discord.abc.Messageable,
+        content: str,
+        kind: SendKind = SendKind.REPLY,
+        reference: Any = None,
+        run_id: Optional[Hashable] = None,
+    ) -> asyncio.Future:
+        """Queue a send without waiting. See send() for the arguments.
+
+        Returns:
+            Future for the sent message
+        """
+        loop = asyncio.get_running_loop()
+        if not self._running:
+            future = loop.create_future()
+            future.set_exception(RuntimeError("Outbound scheduler is not running"))
+            return future
+
+        now = loop.time()
+        key = getattr(channel, "id", None) or id(channel)
+        outbox = self._outboxes.get(key)
+        if outbox is None:
+            self._forget_idle(now)
+            outbox = self._outboxes[key] = _Outbox(channel)
+
+        edit = None
+        if kind is not SendKind.STATUS and run_id is not None:
+            self._drop_status(outbox, run_id)
+        elif kind is SendKind.STATUS and run_id is not None:
+            merged = self._merge_status(outbox, content, run_id, now)
+            if merged is not None:
+                return merged
+            recent = outbox.status.get(run_id)
+            if recent is not None and self._fits(recent.content, content):
+                edit, content = recent.message, f"{recent.content}\n{content}"
+
+        future = loop.create_future()
+        future.add_done_callback(_consume_exception)
+        item = OutboundMessage(
+            kind=kind,
+            seq=next(self._seq),
+            content=content,
+            enqueued_at=now,
+            future=future,
+            reference=reference,
+            run_id=run_id,
+            edit=edit,
+        )
+
+        if len(outbox.queue) >= self.config.max_queue_per_channel:
+            # Make room by dropping the least urgent send, if it's less urgent than us
+            worst = max(outbox.queue)
+            if worst < item:
+                self._count(kind, "dropped")
+                future.set_exception(RuntimeError("Outbound queue full"))
+                return future
+            outbox.queue.remove(worst)
+            heapq.heapify(outbox.queue)
+            self._drop(worst, RuntimeError("Outbound queue full"))
+
+        heapq.heappush(outbox.queue, item)
+        if outbox.worker is None:
+            outbox.worker = asyncio.create_task(self._drain(key, outbox))
+        return future
+
+    def _forget_idle(self, now: float) -> None:
+        """Drop channels with nothing queued and no budget or edits to remember."""
+        idle = max(self.config.channel_window_seconds, self.config.status_merge_seconds)
+        for key in [
+            key for key, outbox in self._outboxes.items()
+            if outbox.worker is None and not outbox.queue and now - outbox.last_sent > idle
+        ]:
+            del self._outboxes[key]
+
+    def _fits(self, first: str, second: str) -> bool:
+        return len(first) + 1 + len(second) <= self.config.max_message_length
+
+    def _merge_status(
+        self, outbox: _Outbox, content: str, run_id: Hashable, now: float,
+    ) -> Optional[asyncio.Future]:
+        """Fold a status update into the run's queued one, if any."""
+        # Forget status messages too old to edit
+        window = self.config.status_merge_seconds
+        for stale in [rid for rid, status in outbox.status.items() if now - status.sent_at > window]:
+            del outbox.status[stale]
+
+        for item in outbox.queue:
+            if item.kind is SendKind.STATUS and item.run_id == run_id and self._fits(item.content, content):
+                item.content = f"{item.content}\n{content}"
+                self._count(SendKind.STATUS, "merged")
+                return item.future
+        return None
+
+    def _drop_status(self, outbox: _Outbox, run_id: Hashable) -> None:
+        """Drop a run's queued status updates - its final answer supersedes them."""
+        superseded = [
+            item for item in outbox.queue
+            if item.kind is SendKind.STATUS and item.run_id == run_id
+        ]
+        if superseded:
+            outbox.queue = [item for item in outbox.queue if item not in superseded]
+            heapq.heapify(outbox.queue)
+            for item in superseded:
+                self._drop(item, RuntimeError("Status update superseded by the run's reply"))
+        outbox.status.pop(run_id, None)
+
+    def _budget_wait(self, outbox: _Outbox, now: float) -> float:
+        """Seconds until this channel may send again (0 if it may now)."""
+        config = self.config
+        for sent, window in (
+            (outbox.sent_at, config.channel_window_seconds),
+            (self._global_sent, config.global_window_seconds),
+        ):
+            while sent and now - sent[0] >= window:
+                sent.popleft()
+
+        wait = outbox.paused_until - now
+        if len(outbox.sent_at) >= config.channel_burst:
+            wait = max(wait, outbox.sent_at[0] + config.channel_window_seconds - now)
+        if len(self._global_sent) >= config.global_burst:
+            wait = max(wait, self._global_sent[0] + config.global_window_seconds - now)
+        return wait
+
+    async def _drain(self, key: Hashable, outbox: _Outbox) -> None:
+        """Send one channel's queue, in order, within budget."""
+        loop = asyncio.get_running_loop()
+        try:
+            while outbox.queue:
+                now = loop.time()
+                wait = self._budget_wait(outbox, now)
+                if wait > 0:
+                    self._throttled_seconds += wait
+                    THROTTLED_SECONDS.inc(wait)
+                    await asyncio.sleep(wait)
+                    continue
+
+                item = heapq.heappop(outbox.queue)
+                if item.future.done():
+                    continue
+                if item.kind is SendKind.STATUS and now - item.enqueued_at > self.config.status_deadline_seconds:
+                    self._drop(item, asyncio.TimeoutError("Status update went stale in the queue"))
+                    logger.info("⌛ Dropped stale status update for channel %s", key)
+                    continue
+
+                waited = now - item.enqueued_at
+                self._waits[item.kind].record(waited)
+                self._queue_seconds[item.kind].observe(waited)
+                outbox.sent_at.append(now)
+                outbox.last_sent = now
+                self._global_sent.append(now)
+                await self._deliver(outbox, item)
+        finally:
+            outbox.worker = None
+
+    async def _deliver(self, outbox: _Outbox, item: OutboundMessage) -> None:
+        """Send (or edit) one message and settle its future."""
+        try:
+            if item.edit is not None:
+                send = item.edit.edit(content=item.content)
+            elif item.reference is not None:
+                send = outbox.channel.send(item.content, reference=item.reference)
+            else:
+                send = outbox.channel.send(item.content)
+            message = await asyncio.wait_for(send, timeout=self.config.send_timeout_seconds)
+        except asyncio.CancelledError:
+            item.future.cancel()
+            raise
+        except Exception as e:
+            if isinstance(e, discord.HTTPException) and e.status == 429:
+                # discord.py gave up retrying - sit out a whole window
+                loop = asyncio.get_running_loop()
+                outbox.paused_until = loop.time() + self.config.channel_window_seconds
+            self._count(item.kind, "failed")
+            logger.warning("❌ %s send failed: %s", item.kind.name, e)
+            if not item.future.done():
+                item.future.set_exception(e)
+            return
+
+        # edit() hands back the edited message (or None on older discord.py)
+        message = message or item.edit
+        self._count(item.kind, "edited" if item.edit is not None else "sent")
+        if item.kind is SendKind.STATUS and item.run_id is not None:
+            outbox.status[item.run_id] = _StatusMessage(
+                message, item.content, asyncio.get_running_loop().time(),
+            )
+        if not item.future.done():
+            item.future.set_result(message)
+
+    def _drop(self, item: OutboundMessage, error: Exception) -> None:
+        self._count(item.kind, "dropped")
+        if not item.future.done():
+            item.future.set_exception(error)
+
+    def _count(self, kind: SendKind, outcome: str) -> None:
+        self._counts[(kind, outcome)] += 1
+        self._outcomes[(kind, outcome)].inc()
+
+    def stats(self) -> dict:
+        """Queue depth, send-queue latency and outcomes per kind."""
+        depths = {kind: 0 for kind in SendKind}
+        for outbox in self._outboxes.values():
+            for item in outbox.queue:
+                depths[item.kind] += 1
+        return {
+            "queue_depth": sum(depths.values()),
+            "channels": len(self._outboxes),
+            "throttled_seconds": self._throttled_seconds,
+            "kinds": {
+                kind.name.lower(): {
+                    "queued": depths[kind],
+                    **self._waits[kind].as_dict(),
+                    **{outcome: count for (k, outcome), count in self._counts.items() if k is kind},
+                }
+                for kind in SendKind
+            },
+        }
+
+
+# Process-wide scheduler (set by the bot on startup)
+_scheduler: Optional[OutboundScheduler] = None
+
+
+def get_outbound_scheduler() -> Optional[OutboundScheduler]:
+    """Get the bot's outbound scheduler, if one is set."""
+    return _scheduler
+
+
+def set_outbound_scheduler(scheduler: Optional[OutboundScheduler]) -> None:
+    """Set the bot's outbound scheduler."""
+    global _scheduler
+    _scheduler = scheduler
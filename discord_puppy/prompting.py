@@ -0,0 +1,250 @@
+"""
+Prompt Builder - Fitting the Whole Conversation in the Puppy's Mouth 🐕📏
+
+The reply prompt used to be "channel header + last 10 messages + every
+pending message", with nothing but a 200-char cut per history line. A
+long burst of pending messages went through in full, and so did the
+latency and cost of running it.
+
+The builder works against a token budget instead, filled by priority:
+1. The header + instruction (always)
+2. The mention(s) that woke us up
+3. The other pending messages, newest first
+4. Recent channel history, newest first
+5. What we remember about the people talking
+
+Trimming is deterministic: every message is capped at
+max_message_tokens, and once the budget runs out whole items are dropped,
+lowest priority and oldest first, so there's never a gap mid-conversation.
+The same input always produces the same prompt. Tokens are estimated
+(~4 chars each) - close enough to keep prompt size predictable without a
+tokenizer dependency. Prompt sizes go to the puppy_prompt_tokens histogram.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Sequence
+
+from discord_puppy import metrics
+from discord_puppy.channel_cache import CachedMessage
+
+logger = logging.getLogger("discord_puppy.prompting")
+
+PROMPT_TOKENS = metrics.histogram(
+    "puppy_prompt_tokens", "Estimated tokens per built prompt",
+    buckets=(250, 500, 750, 1000, 1500, 2000, 3000, 4000, 8000),
+)
+PROMPTS_TRIMMED = metrics.counter(
+    "puppy_prompts_trimmed_total", "Prompts that had to drop messages or memories to fit the budget",
+)
+
+CHARS_PER_TOKEN = 4
+MEMORY_HEADER = "What you remember about these users:"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for a piece of text (~4 chars per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to roughly max_tokens, marking the cut with '...'."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    keep = max(max_tokens * CHARS_PER_TOKEN - 3, 0)
+    return text[:keep].rstrip() + "..."
+
+
+@dataclass
+class PromptBudget:
+    """Token budget for one reply prompt."""
+    max_tokens: int = 2000          # Whole prompt, header included
+    max_message_tokens: int = 150   # Any single message is cut to this
+    history_limit: int = 10         # Recent messages considered for context
+    min_item_tokens: int = 8        # Don't squeeze in items smaller than this
+
+
+@dataclass
+class PromptMessage:
+    """A message as the builder sees it."""
+    id: int
+    author: str
+    content: str
+    is_mention: bool = False
+
+    @classmethod
+    def from_cached(cls, cached: CachedMessage) -> "PromptMessage":
+        return cls(id=cached.id, author=cached.author_name, content=cached.content)
+
+    def render(self, max_tokens: int) -> str:
+        return f"{self.author}: {truncate_to_tokens(self.content, max_tokens)}"
+
+
+@dataclass
+class BuiltPrompt:
+    """The finished prompt plus what went into it."""
+    text: str
+    tokens: int
+    included: dict[str, int] = field(default_factory=dict)
+    dropped: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class PromptStats:
+    """Token counts across every prompt built."""
+    prompts: int = 0
+    total_tokens: int = 0
+    max_tokens: int = 0
+    last_tokens: int = 0
+    trimmed: int = 0  # Prompts that had to drop something
+
+    def record(self, built: BuiltPrompt) -> None:
+        self.prompts += 1
+        self.total_tokens += built.tokens
+        self.max_tokens = max(self.max_tokens, built.tokens)
+        self.last_tokens = built.tokens
+        PROMPT_TOKENS.observe(built.tokens)
+        if any(built.dropped.values()):
+            self.trimmed += 1
+            PROMPTS_TRIMMED.inc()
+
+    def as_dict(self) -> dict:
+        avg = self.total_tokens / self.prompts if self.prompts else 0.0
+        return {
+            "prompts": self.prompts,
+            "avg_tokens": avg,
+            "max_tokens": self.max_tokens,
+            "last_tokens": self.last_tokens,
+            "trimmed": self.trimmed,
+        }
+
+
+class PromptBuilder:
+    """Builds reply prompts that fit a token budget."""
+
+    def __init__(self, budget: Optional[PromptBudget] = None):
+        """Initialize the prompt builder.
+
+        Args:
+            budget: Token budget (uses defaults if None)
+        """
+        self.budget = budget or PromptBudget()
+        self._stats = PromptStats()
+
+    def build(
+        self,
+        header: str,
+        instruction: str,
+        pending: Sequence[PromptMessage] = (),
+        history: Iterable[PromptMessage] = (),
+        user_memory: Sequence[str] = (),
+    ) -> BuiltPrompt:
+        """Assemble a prompt within the budget.
+
+        Args:
+            header: Channel header line (always included)
+            instruction: What we want from the model (always included)
+            pending: Messages to respond to, oldest first
+            history: Recent channel messages, oldest first
+            user_memory: One line per remembered user, most relevant first
+
+        Returns:
+            The prompt text, its estimated token count, and per-section
+            included/dropped counts
+        """
+        budget = self.budget
+        cap = budget.max_message_tokens
+        # The fixed scaffolding is paid for up front
+        scaffold = [header, "", "Recent messages:", "", "---", instruction]
+        if user_memory:
+            scaffold += [MEMORY_HEADER, ""]
+        remaining = budget.max_tokens - estimate_tokens("\n".join(scaffold))
+
+        def take(text: str, squeeze: bool = False) -> Optional[str]:
+            """Spend budget on one line; None if it doesn't fit."""
+            nonlocal remaining
+            cost = estimate_tokens(text) + 1  # + newline
+            if cost > remaining:
+                if not squeeze or remaining < budget.min_item_tokens:
+                    return None
+                text = truncate_to_tokens(text, remaining - 1)
+                cost = estimate_tokens(text) + 1
+            remaining -= cost
+            return text
+
+        pending_ids = {pm.id for pm in pending}
+        chosen_pending: dict[int, str] = {}
+        included = {"mentions": 0, "pending": 0, "history": 0, "user_memory": 0}
+        dropped = {"mentions": 0, "pending": 0, "history": 0, "user_memory": 0}
+
+        # 1. Mentions - squeezed in even if they have to be cut short
+        for index in reversed(range(len(pending))):
+            if pending[index].is_mention:
+                line = take(pending[index].render(cap), squeeze=True)
+                if line is None:
+                    dropped["mentions"] += 1
+                else:
+                    chosen_pending[index] = line
+                    included["mentions"] += 1
+
+        # 2. The rest of the pending burst, newest first - once one doesn't
+        # fit, everything older goes too (no gaps in the conversation)
+        full = False
+        for index in reversed(range(len(pending))):
+            if pending[index].is_mention:
+                continue
+            line = None if full else take(pending[index].render(cap))
+            if line is None:
+                full = True
+                dropped["pending"] += 1
+            else:
+                chosen_pending[index] = line
+                included["pending"] += 1
+
+        # 3. Recent history (minus what's already pending), newest first
+        recent = [m for m in history if m.id not in pending_ids][-budget.history_limit:]
+        chosen_history: list[str] = []
+        full = False
+        for message in reversed(recent):
+            line = None if full else take(message.render(cap))
+            if line is None:
+                full = True
+                dropped["history"] += 1
+            else:
+                chosen_history.append(line)
+                included["history"] += 1
+        chosen_history.reverse()
+
+        # 4. User memory, most relevant first
+        chosen_memory: list[str] = []
+        for note in user_memory:
+            line = take(truncate_to_tokens(note, cap))
+            if line is None:
+                dropped["user_memory"] += 1
+            else:
+                chosen_memory.append(line)
+                included["user_memory"] += 1
+
+        # Render in reading order, regardless of fill order
+        lines = [header, ""]
+        if chosen_memory:
+            lines.append(MEMORY_HEADER)
+            lines.extend(chosen_memory)
+            lines.append("")
+        lines.append("Recent messages:")
+        lines.extend(chosen_history)
+        lines.extend(["", "---", instruction])
+        lines.extend(chosen_pending[index] for index in sorted(chosen_pending))
+
+        text = "\n".join(lines)
+        built = BuiltPrompt(text=text, tokens=estimate_tokens(text), included=included, dropped=dropped)
+        self._stats.record(built)
+        logger.debug(
+            "📏 Prompt: %d tokens (budget %d), included=%s dropped=%s",
+            built.tokens, budget.max_tokens, included, dropped,
+        )
+        return built
+
+    def stats(self) -> dict:
+        """Token counts across every prompt built so far."""
+        return self._stats.as_dict()
@@ -0,0 +1,281 @@
+"""
+Response Executor - One Bark at a Time (ish) 🐕⏱️
+
+The heartbeat used to fire-and-forget an LLM run for every decision.
+Under load that meant unbounded concurrent runs, and replies landing
+minutes after the conversation had moved on. The executor fixes that:
+
+- Jobs wait in a priority queue: mentions > responses > spontaneous
+- At most max_concurrency jobs run at once, and at most
+  per_channel_concurrency in any one channel
+- Every job has a deadline - if it's still queued when the deadline
+  passes, it's dropped (nobody wants a reply to a 3-minute-old joke)
+- In-flight jobs are tracked, so stop() can drain or cancel them
+- stats() exposes queue depth, wait times and drops
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger("discord_puppy.executor")
+
+
+class JobPriority(IntEnum):
+    """Lower runs first."""
+    MENTION = 0
+    RESPONSE = 1
+    SPONTANEOUS = 2
+
+
+@dataclass
+class ExecutorConfig:
+    """Configuration for the response executor."""
+    max_concurrency: int = 8            # LLM runs in flight across all channels
+    per_channel_concurrency: int = 1    # ...and within any one channel
+    max_queue_size: int = 200           # Lowest priority dropped beyond this
+    max_run_seconds: float = 120.0      # A single run is cancelled after this
+
+    # How long a job may wait in the queue before it's stale
+    mention_deadline_seconds: float = 60.0
+    response_deadline_seconds: float = 30.0
+    spontaneous_deadline_seconds: float = 15.0
+
+    def deadline_for(self, priority: JobPriority) -> float:
+        return {
+            JobPriority.MENTION: self.mention_deadline_seconds,
+            JobPriority.RESPONSE: self.response_deadline_seconds,
+            JobPriority.SPONTANEOUS: self.spontaneous_deadline_seconds,
+        }[priority]
+
+
+@dataclass(order=True)
+class ResponseJob:
+    """A queued response, ordered by (priority, arrival)."""
+    priority: JobPriority
+    seq: int
+    channel_id: int = field(compare=False)
+    run: Callable[[], Awaitable[None]] = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    deadline: float = field(compare=False)
+
+
+@dataclass
+class WaitTimes:
+    """Queue wait statistics for one priority."""
+    started: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, waited: float) -> None:
+        self.started += 1
+        self.total_seconds += waited
+        self.max_seconds = max(self.max_seconds, waited)
+
+    def as_dict(self) -> dict:
+        avg = self.total_seconds / self.started if self.started else 0.0
+        return {"started": self.started, "avg_wait_ms": avg * 1000, "max_wait_ms": self.max_seconds * 1000}
+
+
+class ResponseExecutor:
+    """Bounded, priority-ordered, deadline-aware runner for responses."""
+
+    def __init__(self, config: Optional[ExecutorConfig] = None):
+        """Initialize the response executor.
+
+        Args:
+            config: Executor configuration (uses defaults if None)
+        """
+        self.config = config or ExecutorConfig()
+
+        self._queue: list[ResponseJob] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+
+        self._in_flight: set[asyncio.Task] = set()
+        self._channel_load: dict[int, int] = {}
+        self._running_by_priority: dict[JobPriority, int] = {priority: 0 for priority in JobPriority}
+
+        self._running = False
+        self._accepting = True
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self._waits = {priority: WaitTimes() for priority in JobPriority}
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._dropped_expired = 0
+        self._dropped_full = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def outstanding(self, priority: JobPriority) -> int:
+        """Jobs of this priority that are queued or still running."""
+        queued = sum(1 for job in self._queue if job.priority == priority)
+        return queued + self._running_by_priority[priority]
+
+    def submit(
+        self,
+        priority: JobPriority,
+        channel_id: int,
+        run: Callable[[], Awaitable[None]],
+        deadline_seconds: Optional[float] = None,
+    ) -> bool:
+        """Queue a response job.
+
+        Args:
+            priority: How urgent the job is
+            channel_id: Channel the job will speak in
+            run: Zero-arg coroutine factory - called only if the job runs
+            deadline_seconds: Max queue wait (defaults by priority)
+
+        Returns:
+            True if queued, False if rejected (stopping, or queue full of
+            more urgent work)
+        """
+        if not self._accepting:
+            return False
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        wait = deadline_seconds if deadline_seconds is not None else self.config.deadline_for(priority)
+        job = ResponseJob(
+            priority=priority,
+            seq=next(self._seq),
+            channel_id=channel_id,
+            run=run,
+            enqueued_at=now,
+            deadline=now + wait,
+        )
+
+        if len(self._queue) >= self.config.max_queue_size:
+            # Make room by evicting the least urgent job, if it's less urgent than us
+            worst = max(self._queue)
+            if worst < job:
+                self._dropped_full += 1
+                return False
+            self._queue.remove(worst)
+            heapq.heapify(self._queue)
+            self._dropped_full += 1
+
+        heapq.heappush(self._queue, job)
+        self._wakeup.set()
+        return True
+
+    def start(self) -> None:
+        """Start the dispatcher."""
+        if self._running:
+            return
+
+        self._running = True
+        self._accepting = True
+        self._task = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self, drain: bool = True, timeout: float = 10.0) -> None:
+        """Stop accepting jobs and wind down.
+
+        Args:
+            drain: Let queued + in-flight jobs finish (up to timeout)
+            timeout: Max seconds to wait when draining
+        """
+        self._accepting = False
+
+        if drain:
+            loop = asyncio.get_running_loop()
+            give_up_at = loop.time() + timeout
+            while (self._queue or self._in_flight) and loop.time() < give_up_at:
+                await asyncio.sleep(0.05)
+
+        self._running = False
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+        # Whatever is left gets cancelled
+        self._queue.clear()
+        for task in list(self._in_flight):
+            task.cancel()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _dispatch_loop(self) -> None:
+        while self._running:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start as many queued jobs as the limits allow."""
+        now = asyncio.get_running_loop().time()
+        held: list[ResponseJob] = []
+
+        while self._queue and len(self._in_flight) < self.config.max_concurrency:
+            job = heapq.heappop(self._queue)
+
+            if now > job.deadline:
+                self._dropped_expired += 1
+                logger.info("⌛ Dropped stale %s job for channel %s", job.priority.name, job.channel_id)
+                continue
+
+            if self._channel_load.get(job.channel_id, 0) >= self.config.per_channel_concurrency:
+                held.append(job)
+                continue
+
+            self._waits[job.priority].record(now - job.enqueued_at)
+            self._channel_load[job.channel_id] = self._channel_load.get(job.channel_id, 0) + 1
+            self._running_by_priority[job.priority] += 1
+            task = asyncio.create_task(self._run_job(job))
+            self._in_flight.add(task)
+            task.add_done_callback(lambda t, job=job: self._on_done(t, job))
+
+        for job in held:
+            heapq.heappush(self._queue, job)
+
+    async def _run_job(self, job: ResponseJob) -> None:
+        try:
+            await asyncio.wait_for(job.run(), timeout=self.config.max_run_seconds)
+            self._completed += 1
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            logger.warning("⏱️ %s job for channel %s timed out", job.priority.name, job.channel_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._failed += 1
+            logger.exception("❌ %s job for channel %s failed", job.priority.name, job.channel_id)
+
+    def _on_done(self, task: asyncio.Task, job: ResponseJob) -> None:
+        self._in_flight.discard(task)
+        self._running_by_priority[job.priority] -= 1
+        load = self._channel_load.get(job.channel_id, 1) - 1
+        if load > 0:
+            self._channel_load[job.channel_id] = load
+        else:
+            self._channel_load.pop(job.channel_id, None)
+        # A slot opened up - held jobs may be able to go now
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        """Queue depth, wait times and outcomes."""
+        return {
+            "queue_depth": len(self._queue),
+            "in_flight": len(self._in_flight),
+            "completed": self._completed,
+            "failed": self._failed,
+            "timed_out": self._timed_out,
+            "dropped_expired": self._dropped_expired,
+            "dropped_full": self._dropped_full,
+            "wait": {priority.name.lower(): waits.as_dict() for priority, waits in self._waits.items()},
+        }
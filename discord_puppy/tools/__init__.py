@@ -6,8 +6,14 @@ Custom tools for the Discord Puppy agent.
 
 from discord_puppy.tools.discord_send import (
     register_discord_send_message,
+    ChannelBinding,
+    bind_channel,
     set_current_channel,
+    reset_current_channel,
     get_current_channel,
+    get_current_binding,
+    send_status_message,
+    post_status,
 )
 from discord_puppy.tools.memory_tools import (
     register_search_messages,
@@ -15,17 +21,25 @@ from discord_puppy.tools.memory_tools import (
     register_record_user_note,
     register_list_users,
     register_get_recent_messages,
+    register_get_indexing_status,
     get_recent_messages_standalone,
 )
 
 __all__ = [
     "register_discord_send_message",
+    "ChannelBinding",
+    "bind_channel",
     "set_current_channel",
+    "reset_current_channel",
     "get_current_channel",
+    "get_current_binding",
+    "send_status_message",
+    "post_status",
     "register_search_messages",
     "register_get_user_notes",
     "register_record_user_note",
     "register_list_users",
     "register_get_recent_messages",
+    "register_get_indexing_status",
     "get_recent_messages_standalone",
 ]
@@ -2,35 +2,106 @@
 Discord Send Message Tool 🐕
 
 Allows the puppy to send messages to the current Discord channel.
+
+The tool is async - it awaits the send on the bot's event loop instead of
+parking an executor thread on run_coroutine_threadsafe().result(), so any
+number of concurrent agent runs can post status updates. Every send has
+an explicit timeout, and failures come back to the agent as structured
+errors (timeout, HTTP status) instead of a bare exception string.
+
+Updates go through the bot's outbound scheduler when it's running, so
+they queue behind replies and back-to-back updates from one run merge.
+
+The target channel is bound per run in a context variable, not a module
+global - a run's binding follows it into every task it starts, and two
+runs in different channels can't overwrite each other's target.
 """
 
 import asyncio
-from typing import Optional, Any
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Iterator, Optional, Any
 import discord
 from pydantic_ai import RunContext
 
-# Global channel context
-_current_channel: Optional[discord.abc.Messageable] = None
-_event_loop: Optional[asyncio.AbstractEventLoop] = None
+from discord_puppy import metrics
+from discord_puppy.outbound import SendKind, get_outbound_scheduler
+
+logger = logging.getLogger("discord_puppy.tools.discord_send")
+
+SEND_TIMEOUT_SECONDS = 10.0  # Includes any rate limit wait inside discord.py
+MAX_MESSAGE_LENGTH = 200
+
+_SEND_SECONDS = metrics.DISCORD_SEND_SECONDS.labels("status")
+
+
+@dataclass(frozen=True)
+class ChannelBinding:
+    """Where one agent run's status updates go."""
+    channel: discord.abc.Messageable
+    loop: asyncio.AbstractEventLoop
+    run_id: int  # Status updates from one run merge
+
+
+# Per-run channel context (copied into every task the run starts)
+_binding: ContextVar[Optional[ChannelBinding]] = ContextVar("discord_puppy_channel", default=None)
+_run_ids = itertools.count(1)
+
+
+def set_current_channel(
+    channel: discord.abc.Messageable, loop: asyncio.AbstractEventLoop = None,
+) -> Token:
+    """Set the current channel for sending messages (starts a new run).
+
+    Only affects the calling task and the tasks it starts from here on.
+
+    Args:
+        channel: Where discord_send_message should post
+        loop: The bot's event loop (defaults to the current one)
+
+    Returns:
+        Token for reset_current_channel()
+    """
+    return _binding.set(ChannelBinding(channel, loop or asyncio.get_event_loop(), next(_run_ids)))
+
+
+def reset_current_channel(token: Token) -> None:
+    """Undo a set_current_channel()."""
+    _binding.reset(token)
+
+
+@contextmanager
+def bind_channel(
+    channel: discord.abc.Messageable, loop: asyncio.AbstractEventLoop = None,
+) -> Iterator[ChannelBinding]:
+    """Bind the current channel for the duration of one agent run."""
+    token = set_current_channel(channel, loop)
+    try:
+        yield _binding.get()
+    finally:
+        reset_current_channel(token)
 
 
-def set_current_channel(channel: discord.abc.Messageable, loop: asyncio.AbstractEventLoop = None) -> None:
-    """Set the current channel for sending messages."""
-    global _current_channel, _event_loop
-    _current_channel = channel
-    _event_loop = loop or asyncio.get_event_loop()
+def get_current_binding() -> Optional[ChannelBinding]:
+    """Get the current run's channel binding, if any."""
+    return _binding.get()
 
 
 def get_current_channel() -> Optional[discord.abc.Messageable]:
     """Get the current channel."""
-    return _current_channel
+    binding = _binding.get()
+    return binding.channel if binding else None
 
 
 def register_discord_send_message(agent):
     """Register the discord_send_message tool."""
     
     @agent.tool
-    def discord_send_message(context: RunContext, message: str = "") -> dict[str, Any]:
+    async def discord_send_message(context: RunContext, message: str = "") -> dict[str, Any]:
         """Send a message to the current Discord channel.
         
         Use this to update the chat about what you're doing between tool calls.
@@ -43,28 +114,84 @@ def register_discord_send_message(agent):
         Returns:
             Success status and any error message.
         """
-        global _current_channel, _event_loop
-        
-        if not _current_channel:
-            return {"success": False, "error": "No channel set"}
-        
-        if not message or not str(message).strip():
-            return {"success": False, "error": "Empty message"}
-        
-        message = str(message).strip()
-        
-        # Truncate if too long
-        if len(message) > 200:
-            message = message[:197] + "..."
-        
-        try:
-            # Schedule the coroutine on the event loop
-            future = asyncio.run_coroutine_threadsafe(
-                _current_channel.send(message),
-                _event_loop
-            )
-            # Wait for it to complete (with timeout)
-            future.result(timeout=5.0)
-            return {"success": True, "message": message}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return await post_status(message)
+
+
+async def post_status(message: str) -> dict[str, Any]:
+    """What discord_send_message does: post to the current run's channel.
+
+    Args:
+        message: The status update (trimmed, and truncated if too long)
+
+    Returns:
+        Tool result - see send_status_message()
+    """
+    binding = _binding.get()
+    if binding is None:
+        return {"success": False, "error": "No channel set"}
+
+    if not message or not str(message).strip():
+        return {"success": False, "error": "Empty message"}
+
+    message = str(message).strip()
+
+    # Truncate if too long
+    if len(message) > MAX_MESSAGE_LENGTH:
+        message = message[:MAX_MESSAGE_LENGTH - 3] + "..."
+
+    return await send_status_message(binding.channel, message, binding.loop, run_id=binding.run_id)
+
+
+async def send_status_message(
+    channel: discord.abc.Messageable,
+    message: str,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    timeout: float = SEND_TIMEOUT_SECONDS,
+    run_id: Optional[int] = None,
+) -> dict[str, Any]:
+    """Send a status update and report the outcome as a tool result.
+
+    Args:
+        channel: Where to send
+        message: Text to send
+        loop: The bot's event loop - only needed when the agent runs on
+            a different loop, in which case the send is handed over and
+            awaited without blocking a thread
+        timeout: Seconds before giving up on the send (a queued update
+            may still go out later, or be dropped as stale)
+        run_id: Agent run the update belongs to (updates from one run merge)
+
+    Returns:
+        {"success": True, "message": ...} or {"success": False, "error": ...}
+        with "status" for HTTP errors and "timed_out" for timeouts
+    """
+    started = time.perf_counter()
+    try:
+        if loop is None or loop is asyncio.get_running_loop():
+            send = _send(channel, message, run_id)
+        else:
+            send = asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_send(channel, message, run_id), loop))
+        await asyncio.wait_for(send, timeout=timeout)
+        return {"success": True, "message": message}
+    except asyncio.TimeoutError:
+        metrics.DISCORD_SEND_ERRORS.labels("status", "timeout").inc()
+        logger.warning("⏱️ Status update timed out after %gs", timeout)
+        return {"success": False, "error": f"Send timed out after {timeout:g}s", "timed_out": True}
+    except discord.HTTPException as e:
+        metrics.DISCORD_SEND_ERRORS.labels("status", e.status).inc()
+        logger.warning("❌ Status update failed (HTTP %s): %s", e.status, e.text or e)
+        return {"success": False, "error": e.text or str(e), "status": e.status}
+    except Exception as e:
+        logger.warning("❌ Status update failed: %s", e)
+        return {"success": False, "error": str(e)}
+    finally:
+        _SEND_SECONDS.observe(time.perf_counter() - started)
+
+
+async def _send(channel: discord.abc.Messageable, message: str, run_id: Optional[int]) -> None:
+    """Send through the outbound scheduler, or directly if it isn't running."""
+    scheduler = get_outbound_scheduler()
+    if scheduler is not None and scheduler.is_running:
+        await scheduler.send(channel, message, SendKind.STATUS, run_id=run_id)
+    else:
+        await channel.send(message)
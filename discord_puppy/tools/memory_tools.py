@@ -7,35 +7,54 @@ Tools to query and update the puppy's memory database.
 from typing import Any
 from pydantic_ai import RunContext
 
-from discord_puppy.memory.database import get_connection
+from discord_puppy.memory.backfill import get_backfill_status
+from discord_puppy.memory.database import get_connection_manager
+from discord_puppy.memory.search import search_indexed_messages
+from discord_puppy.memory.user_cache import get_user_memory_cache
+from discord_puppy.memory.user_notes import add_user_note, top_user_notes
+from discord_puppy.memory.users import resolve_user
 
 
 def register_search_messages(agent):
     """Register the search_messages tool."""
     
     @agent.tool
-    async def search_messages(context: RunContext, query: str = "", limit: int = 20) -> dict[str, Any]:
-        """Search indexed Discord messages.
+    async def search_messages(
+        context: RunContext,
+        query: str = "",
+        limit: int = 20,
+        channel_id: str = "",
+        user: str = "",
+        since: str = "",
+        until: str = "",
+    ) -> dict[str, Any]:
+        """Search indexed Discord messages, best matches first.
+        
+        Supports "exact phrases", prefix* matches and OR between words.
         
         Args:
             context: The pydantic-ai runtime context.
-            query: Search term to find in messages.
+            query: Search terms to find in messages.
             limit: Max results (default 20).
+            channel_id: Only search this channel (optional).
+            user: Only messages from this user ID/username (optional).
+            since: Only messages on/after this date, e.g. "2024-05-01" (optional).
+            until: Only messages before this date (optional).
             
         Returns:
             List of matching messages with user and content preview.
         """
-        conn = await get_connection()
         try:
-            cursor = await conn.execute("""
-                SELECT m.content_preview, m.message_timestamp, u.display_name, u.discord_username
-                FROM indexed_messages m
-                LEFT JOIN user_notes u ON m.user_id = u.user_id
-                WHERE m.content_preview LIKE ?
-                ORDER BY m.message_timestamp DESC
-                LIMIT ?
-            """, (f"%{query}%", limit))
-            rows = await cursor.fetchall()
+            async with get_connection_manager().reader("search_messages") as conn:
+                rows = await search_indexed_messages(
+                    conn,
+                    query=query,
+                    limit=limit,
+                    channel_id=channel_id or None,
+                    user=user or None,
+                    since=since or None,
+                    until=until or None,
+                )
             return {
                 "success": True,
                 "count": len(rows),
@@ -43,6 +62,7 @@ def register_search_messages(agent):
                     {
                         "user": row["display_name"] or row["discord_username"] or "unknown",
                         "content": row["content_preview"],
+                        "channel_id": row["channel_id"],
                         "when": row["message_timestamp"]
                     }
                     for row in rows
@@ -50,8 +70,6 @@ def register_search_messages(agent):
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
-        finally:
-            await conn.close()
 
 
 def register_get_user_notes(agent):
@@ -63,89 +81,107 @@ def register_get_user_notes(agent):
         
         Args:
             context: The pydantic-ai runtime context.
-            username: Username or display name to look up.
+            username: User ID, <@mention>, username or display name to look up.
             
         Returns:
             User info including notes, trust level, favorite topics, etc.
         """
-        conn = await get_connection()
         try:
-            cursor = await conn.execute("""
-                SELECT * FROM user_notes
-                WHERE discord_username LIKE ? OR display_name LIKE ?
-                LIMIT 5
-            """, (f"%{username}%", f"%{username}%"))
-            rows = await cursor.fetchall()
-            if not rows:
-                return {"success": True, "found": False, "message": f"No user found matching '{username}'"}
+            async with get_connection_manager().reader("get_user_notes") as conn:
+                resolution = await resolve_user(conn, username, limit=5)
+                if not resolution.matches:
+                    return {"success": True, "found": False, "message": f"No user found matching '{username}'"}
             
-            return {
-                "success": True,
-                "found": True,
-                "users": [
-                    {
-                        "username": row["discord_username"],
-                        "display_name": row["display_name"],
-                        "notes": row["notes"],
-                        "trust_level": row["trust_level"],
-                        "favorite_topics": row["favorite_topics"],
-                        "interaction_count": row["interaction_count"],
-                        "first_seen": row["first_seen"],
-                        "last_seen": row["last_seen"]
-                    }
-                    for row in rows
-                ]
-            }
+                notes = await top_user_notes(
+                    conn, [row["user_id"] for row in resolution.matches], limit=10
+                )
+                return {
+                    "success": True,
+                    "found": True,
+                    "match": resolution.method,
+                    "users": [
+                        {
+                            "user_id": row["user_id"],
+                            "username": row["discord_username"],
+                            "display_name": row["display_name"],
+                            "notes": [
+                                {
+                                    "note": note["note"],
+                                    "importance": note["importance"],
+                                    "when": note["created_at"],
+                                }
+                                for note in notes[row["user_id"]]
+                            ],
+                            "trust_level": row["trust_level"],
+                            "favorite_topics": row["favorite_topics"],
+                            "interaction_count": row["interaction_count"],
+                            "first_seen": row["first_seen"],
+                            "last_seen": row["last_seen"]
+                        }
+                        for row in resolution.matches
+                    ]
+                }
         except Exception as e:
             return {"success": False, "error": str(e)}
-        finally:
-            await conn.close()
 
 
 def register_record_user_note(agent):
     """Register the record_user_note tool."""
     
     @agent.tool
-    async def record_user_note(context: RunContext, username: str = "", note: str = "") -> dict[str, Any]:
-        """Add or update notes about a user.
+    async def record_user_note(
+        context: RunContext,
+        username: str = "",
+        note: str = "",
+        importance: int = 3,
+    ) -> dict[str, Any]:
+        """Add a note about a user.
         
         Args:
             context: The pydantic-ai runtime context.
-            username: Username to add note for.
-            note: The note to record (appends to existing notes).
+            username: User ID, <@mention> or exact username/display name.
+            note: The note to record (one fact per note).
+            importance: 1 (trivia) to 5 (never forget), default 3.
             
         Returns:
-            Success status.
+            Success status, or the candidates if the user is ambiguous.
         """
         if not username or not note:
             return {"success": False, "error": "Need both username and note"}
         
-        conn = await get_connection()
         try:
-            cursor = await conn.execute("""
-                SELECT user_id, notes FROM user_notes
-                WHERE discord_username LIKE ? OR display_name LIKE ?
-                LIMIT 1
-            """, (f"%{username}%", f"%{username}%"))
-            row = await cursor.fetchone()
+            async with get_connection_manager().writer("record_user_note") as conn:
+                resolution = await resolve_user(conn, username, limit=5)
+                row = resolution.unique
             
-            if not row:
-                return {"success": False, "error": f"User '{username}' not found"}
-            
-            existing = row["notes"] or ""
-            new_notes = f"{existing}\n- {note}".strip()
+                if row is None:
+                    if not resolution.matches:
+                        return {"success": False, "error": f"User '{username}' not found"}
+                    # Never guess who a note belongs to
+                    return {
+                        "success": False,
+                        "error": f"'{username}' is ambiguous - retry with one of these user IDs",
+                        "candidates": [
+                            {
+                                "user_id": match["user_id"],
+                                "username": match["discord_username"],
+                                "display_name": match["display_name"],
+                            }
+                            for match in resolution.matches
+                        ],
+                    }
             
-            await conn.execute("""
-                UPDATE user_notes SET notes = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = ?
-            """, (new_notes, row["user_id"]))
-            await conn.commit()
+                await add_user_note(conn, row["user_id"], note, importance)
+                await conn.execute(
+                    "UPDATE user_notes SET updated_at = CURRENT_TIMESTAMP WHERE user_id = ?",
+                    (row["user_id"],),
+                )
             
+            # Next prompt should see the new note
+            get_user_memory_cache().invalidate(row["user_id"])
             return {"success": True, "message": f"Note recorded for {username}"}
         except Exception as e:
             return {"success": False, "error": str(e)}
-        finally:
-            await conn.close()
 
 
 def register_list_users(agent):
@@ -162,32 +198,31 @@ def register_list_users(agent):
         Returns:
             List of users with basic info.
         """
-        conn = await get_connection()
         try:
-            cursor = await conn.execute("""
-                SELECT display_name, discord_username, interaction_count, last_seen, notes
-                FROM user_notes
-                ORDER BY last_seen DESC
-                LIMIT ?
-            """, (limit,))
-            rows = await cursor.fetchall()
-            return {
-                "success": True,
-                "count": len(rows),
-                "users": [
-                    {
-                        "name": row["display_name"] or row["discord_username"],
-                        "interactions": row["interaction_count"],
-                        "last_seen": row["last_seen"],
-                        "notes": row["notes"] or "(no notes)"
-                    }
-                    for row in rows
-                ]
-            }
+            async with get_connection_manager().reader("list_users") as conn:
+                cursor = await conn.execute("""
+                    SELECT user_id, display_name, discord_username, interaction_count, last_seen
+                    FROM user_notes
+                    ORDER BY last_seen DESC
+                    LIMIT ?
+                """, (limit,))
+                rows = await cursor.fetchall()
+                notes = await top_user_notes(conn, [row["user_id"] for row in rows], limit=3)
+                return {
+                    "success": True,
+                    "count": len(rows),
+                    "users": [
+                        {
+                            "name": row["display_name"] or row["discord_username"],
+                            "interactions": row["interaction_count"],
+                            "last_seen": row["last_seen"],
+                            "notes": "; ".join(note["note"] for note in notes[row["user_id"]]) or "(no notes)"
+                        }
+                        for row in rows
+                    ]
+                }
         except Exception as e:
             return {"success": False, "error": str(e)}
-        finally:
-            await conn.close()
 
 
 def register_get_recent_messages(agent):
@@ -204,8 +239,54 @@ def register_get_recent_messages(agent):
         Returns:
             Recent messages.
         """
-        conn = await get_connection()
         try:
+            async with get_connection_manager().reader("get_recent_messages") as conn:
+                cursor = await conn.execute("""
+                    SELECT m.content_preview, m.message_timestamp, u.display_name
+                    FROM indexed_messages m
+                    LEFT JOIN user_notes u ON m.user_id = u.user_id
+                    ORDER BY m.message_timestamp DESC
+                    LIMIT ?
+                """, (limit,))
+                rows = await cursor.fetchall()
+                return {
+                    "success": True,
+                    "messages": [
+                        {
+                            "user": row["display_name"] or "unknown",
+                            "content": row["content_preview"],
+                            "when": row["message_timestamp"]
+                        }
+                        for row in rows
+                    ]
+                }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+
+def register_get_indexing_status(agent):
+    """Register the get_indexing_status tool."""
+
+    @agent.tool
+    async def get_indexing_status(context: RunContext) -> dict[str, Any]:
+        """Check how far the background message-history backfill has got.
+
+        If it isn't ready yet, search results may be missing older messages.
+
+        Args:
+            context: The pydantic-ai runtime context.
+
+        Returns:
+            Backfill state, readiness, and channel/message progress.
+        """
+        return {"success": True, **get_backfill_status()}
+
+
+# Standalone function for use outside agent (e.g., spontaneous messages)
+async def get_recent_messages_standalone(limit: int = 10) -> dict[str, Any]:
+    """Get recent messages (standalone async version for non-agent use)."""
+    try:
+        async with get_connection_manager().reader("get_recent_messages_standalone") as conn:
             cursor = await conn.execute("""
                 SELECT m.content_preview, m.message_timestamp, u.display_name
                 FROM indexed_messages m
@@ -225,37 +306,5 @@ def register_get_recent_messages(agent):
                     for row in rows
                 ]
             }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-        finally:
-            await conn.close()
-
-
-# Standalone function for use outside agent (e.g., spontaneous messages)
-async def get_recent_messages_standalone(limit: int = 10) -> dict[str, Any]:
-    """Get recent messages (standalone async version for non-agent use)."""
-    conn = await get_connection()
-    try:
-        cursor = await conn.execute("""
-            SELECT m.content_preview, m.message_timestamp, u.display_name
-            FROM indexed_messages m
-            LEFT JOIN user_notes u ON m.user_id = u.user_id
-            ORDER BY m.message_timestamp DESC
-            LIMIT ?
-        """, (limit,))
-        rows = await cursor.fetchall()
-        return {
-            "success": True,
-            "messages": [
-                {
-                    "user": row["display_name"] or "unknown",
-                    "content": row["content_preview"],
-                    "when": row["message_timestamp"]
-                }
-                for row in rows
-            ]
-        }
     except Exception as e:
         return {"success": False, "error": str(e)}
-    finally:
-        await conn.close()
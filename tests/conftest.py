@@ -0,0 +1,46 @@
+"""Shared fixtures: a throwaway brain and fake Discord objects."""
+
+import pytest
+
+from benchmarks.fakes import FakeChannel, FakeGuild
+from discord_puppy.memory.database import (
+    ConnectionConfig,
+    close_connection_manager,
+    configure_connection_manager,
+    init_database,
+)
+
+
+@pytest.fixture
+async def brain(tmp_path):
+    """A fresh brain in a temp dir, installed as the process-wide manager."""
+    manager = await configure_connection_manager(ConnectionConfig(db_path=tmp_path / "brain.db"))
+    await init_database()
+    yield manager
+    await close_connection_manager()
+
+
+@pytest.fixture
+def guild() -> FakeGuild:
+    return FakeGuild(1000, "test guild")
+
+
+@pytest.fixture
+def channel(guild) -> FakeChannel:
+    channel = FakeChannel(2000, "general", guild)
+    guild.text_channels.append(channel)
+    return channel
+
+
+@pytest.fixture
+async def stop_after():
+    """Register a start()/stop() service to be stopped (without draining) after the test."""
+    services = []
+
+    def register(service):
+        services.append(service)
+        return service
+
+    yield register
+    for service in reversed(services):
+        await service.stop(drain=False)
@@ -0,0 +1,28 @@
+"""Helpers for building fake Discord objects in tests."""
+
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fakes import FakeChannel, FakeMessage, FakeUser
+from benchmarks.synthetic import snowflake
+
+
+def make_user(n: int, bot: bool = False) -> FakeUser:
+    return FakeUser(id=100 + n, name=f"user{n}", display_name=f"User {n}", bot=bot)
+
+
+def make_message(
+    channel: FakeChannel,
+    seq: int,
+    content: str = "",
+    author: FakeUser = None,
+    minutes_ago: float = 0.0,
+) -> FakeMessage:
+    """A message in channel, with IDs that increase with seq (and time)."""
+    when = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return FakeMessage(
+        id=snowflake(when, seq),
+        content=content or f"message {seq}",
+        author=author or make_user(seq % 3),
+        channel=channel,
+        created_at=when,
+    )
@@ -0,0 +1,111 @@
+"""Agent pool: checkout, recycling and builds off the event loop."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from discord_puppy.agents.agent_pool import AgentPool, AgentPoolConfig
+
+
+class FakeAgent:
+    build_seconds = 0.0
+
+    def __init__(self):
+        time.sleep(self.build_seconds)  # Blocking, like the real build
+        self.thread = threading.current_thread()
+        self.history_cleared = 0
+
+    def reload_code_generation_agent(self):
+        pass
+
+    def clear_message_history(self):
+        self.history_cleared += 1
+
+
+class SlowAgent(FakeAgent):
+    build_seconds = 0.2
+
+
+class BrokenAgent(FakeAgent):
+    def __init__(self):
+        raise RuntimeError("no model configured")
+
+
+async def test_warmup_fills_the_pool():
+    pool = AgentPool(AgentPoolConfig(size=3), factory=FakeAgent)
+    await pool.warmup()
+    stats = pool.stats()
+    assert (stats["idle"], stats["total"], stats["created"]) == (3, 3, 3)
+
+
+async def test_runs_never_share_an_agent():
+    pool = AgentPool(AgentPoolConfig(size=2, max_size=2), factory=FakeAgent)
+    await pool.warmup()
+    async with pool.acquire() as first, pool.acquire() as second:
+        assert first is not second
+    assert pool.stats()["idle"] == 2
+
+
+async def test_agents_are_built_off_the_event_loop():
+    pool = AgentPool(AgentPoolConfig(size=1, max_size=2), factory=SlowAgent)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    try:
+        async with pool.acquire() as agent:
+            assert agent.thread is not threading.main_thread()
+    finally:
+        ticker.cancel()
+    assert ticks >= 5
+
+
+async def test_idle_agent_is_served_while_another_builds():
+    pool = AgentPool(AgentPoolConfig(size=1, max_size=2), factory=FakeAgent)
+    await pool.warmup()
+    pool.factory = SlowAgent
+
+    async def cold_run():
+        async with pool.acquire():
+            pass
+
+    async with pool.acquire():
+        cold = asyncio.create_task(cold_run())
+        await asyncio.sleep(0.05)  # Cold checkout is now building
+    started = time.perf_counter()
+    async with pool.acquire():
+        assert time.perf_counter() - started < 0.1
+    await cold
+
+    stats = pool.stats()
+    assert (stats["idle"], stats["total"]) == (2, 2)
+
+
+async def test_failed_build_gives_its_slot_back():
+    pool = AgentPool(AgentPoolConfig(size=1, max_size=1), factory=BrokenAgent)
+    with pytest.raises(RuntimeError):
+        async with pool.acquire():
+            pass
+    assert pool.stats()["total"] == 0
+
+    pool.factory = FakeAgent
+    async with pool.acquire():
+        pass
+
+
+async def test_failed_run_recycles_the_agent():
+    pool = AgentPool(AgentPoolConfig(size=1, max_size=1), factory=FakeAgent)
+    await pool.warmup()
+    with pytest.raises(ValueError):
+        async with pool.acquire() as agent:
+            raise ValueError("run failed")
+    async with pool.acquire() as replacement:
+        assert replacement is not agent
+    assert pool.stats()["recycled"] == 1
@@ -0,0 +1,14 @@
+"""Backfill supervisor setup."""
+
+from discord_puppy.memory.backfill import BackfillSupervisor
+from discord_puppy.memory.message_indexer import BackfillConfig
+
+
+def test_supervisor_leaves_callers_config_alone():
+    config = BackfillConfig(max_concurrency=2, per_guild_concurrency=1)
+    supervisor = BackfillSupervisor(config=config)
+
+    assert config.throttle is None
+    assert supervisor.config is not config
+    assert supervisor.config.throttle == supervisor._yield_to_live_traffic
+    assert (supervisor.config.max_concurrency, supervisor.config.per_guild_concurrency) == (2, 1)
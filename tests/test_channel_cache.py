@@ -0,0 +1,87 @@
+"""Channel cache: ring buffers, warmth, edits/deletes and the global cap."""
+
+from helpers import make_message
+
+from benchmarks.fakes import FakeChannel
+from discord_puppy.channel_cache import ChannelCacheConfig, ChannelMessageCache
+
+
+def fill(channel, count, start=0):
+    messages = [make_message(channel, seq, minutes_ago=60 - seq) for seq in range(start, start + count)]
+    channel.messages.extend(messages)
+    return messages
+
+
+def count_history_calls(channel):
+    calls = []
+    history = channel.history
+
+    def counted(**kwargs):
+        calls.append(kwargs)
+        return history(**kwargs)
+
+    channel.history = counted
+    return calls
+
+
+async def test_cold_channel_reads_rest_once(channel):
+    cache = ChannelMessageCache(ChannelCacheConfig(per_channel=20))
+    fill(channel, 30)
+    calls = count_history_calls(channel)
+
+    first = await cache.get_recent(channel, limit=5)
+    second = await cache.get_recent(channel, limit=5)
+
+    assert [m.content for m in first] == [f"message {n}" for n in range(25, 30)]
+    assert second == first
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+async def test_live_messages_after_seeding_are_served(channel):
+    cache = ChannelMessageCache(ChannelCacheConfig(per_channel=20))
+    fill(channel, 10)
+    await cache.get_recent(channel, limit=5)
+    for message in fill(channel, 2, start=10):
+        cache.add(message)
+
+    recent = cache.recent(channel.id, 3)
+    assert [m.content for m in recent] == ["message 9", "message 10", "message 11"]
+
+
+def test_full_live_buffer_is_warm(channel):
+    cache = ChannelMessageCache(ChannelCacheConfig(per_channel=5))
+    messages = fill(channel, 5)
+    for message in messages[:4]:
+        cache.add(message)
+    assert cache.recent(channel.id, 3) is None
+
+    cache.add(messages[4])
+    assert [m.id for m in cache.recent(channel.id, 5)] == [m.id for m in messages]
+
+
+def test_edits_and_deletes(channel):
+    cache = ChannelMessageCache(ChannelCacheConfig(per_channel=3))
+    messages = fill(channel, 3)
+    for message in messages:
+        cache.add(message)
+
+    cache.update(channel.id, messages[1].id, "edited")
+    cache.remove(channel.id, [messages[0].id])
+
+    assert [m.content for m in cache.recent(channel.id, 3)] == ["edited", "message 2"]
+    assert cache.stats()["messages"] == 2
+
+
+def test_global_cap_evicts_least_recently_active(guild):
+    cache = ChannelMessageCache(ChannelCacheConfig(per_channel=5, max_total_messages=10))
+    channels = [FakeChannel(3000 + n, f"c{n}", guild) for n in range(3)]
+    for channel in channels:
+        for message in fill(channel, 5):
+            cache.add(message)
+
+    stats = cache.stats()
+    assert stats["messages"] == 10
+    assert stats["channels"] == 2
+    assert cache.recent(channels[0].id, 1) is None
+    assert cache.recent(channels[2].id, 1) is not None
@@ -0,0 +1,102 @@
+"""The status update tool: structured results and per-run channel binding."""
+
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from benchmarks.fakes import FakeChannel
+from discord_puppy.tools.discord_send import (
+    bind_channel,
+    get_current_binding,
+    post_status,
+    register_discord_send_message,
+    send_status_message,
+)
+
+
+class StuckChannel:
+    id = 9001
+
+    async def send(self, content, reference=None):
+        await asyncio.sleep(10)
+
+
+class RefusingChannel:
+    id = 9002
+
+    async def send(self, content, reference=None):
+        raise discord.HTTPException(SimpleNamespace(status=403, reason="Forbidden"), "Missing Access")
+
+
+class BrokenChannel:
+    id = 9003
+
+    async def send(self, content, reference=None):
+        raise ConnectionResetError("connection reset")
+
+
+async def test_send_that_times_out():
+    result = await send_status_message(StuckChannel(), "woof", timeout=0.05)
+    assert result == {"success": False, "error": "Send timed out after 0.05s", "timed_out": True}
+
+
+async def test_send_refused_by_discord():
+    result = await send_status_message(RefusingChannel(), "woof")
+    assert result["success"] is False
+    assert result["status"] == 403
+    assert "Missing Access" in result["error"]
+
+
+async def test_send_that_raises():
+    result = await send_status_message(BrokenChannel(), "woof")
+    assert result == {"success": False, "error": "connection reset"}
+
+
+async def test_send_goes_out(channel):
+    result = await send_status_message(channel, "sniffing...")
+    assert result == {"success": True, "message": "sniffing..."}
+    assert [m.content for m in channel.messages] == ["sniffing..."]
+
+
+class ToolCollector:
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self, func):
+        self.tools[func.__name__] = func
+        return func
+
+
+async def test_concurrent_runs_post_to_their_own_channel(guild):
+    collector = ToolCollector()
+    register_discord_send_message(collector)
+    send_tool = collector.tools["discord_send_message"]
+    general = FakeChannel(7001, "general", guild)
+    random = FakeChannel(7002, "random", guild)
+
+    async def run(channel, name):
+        with bind_channel(channel) as binding:
+            results = []
+            for step in range(3):
+                results.append(await post_status(f"{name} status {step}"))
+                await asyncio.sleep(0.01)  # Let the other run interleave
+                results.append(await send_tool(None, message=f"{name} tool {step}"))
+            # Tasks started inside the run see the same binding
+            inner = await asyncio.create_task(post_status(f"{name} inner"))
+            assert get_current_binding() is binding
+        assert get_current_binding() is None
+        return results + [inner]
+
+    results = await asyncio.gather(run(general, "general"), run(random, "random"))
+
+    assert all(r["success"] for rs in results for r in rs)
+    for channel in (general, random):
+        contents = [m.content for m in channel.messages]
+        assert len(contents) == 7
+        assert all(content.startswith(channel.name) for content in contents)
+
+
+async def test_no_binding_outside_a_run():
+    assert get_current_binding() is None
+    assert await post_status("woof") == {"success": False, "error": "No channel set"}
@@ -0,0 +1,129 @@
+"""Heartbeat decisions per channel: responses, mentions and spontaneous barks."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from helpers import make_message
+
+from benchmarks.fakes import FakeChannel
+from discord_puppy.heartbeat import HeartbeatConfig, HeartbeatEngine
+from discord_puppy.response_executor import JobPriority, ResponseExecutor
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, priority, channel_id, run, deadline_seconds=None):
+        self.jobs.append((priority, channel_id))
+        return True
+
+    def of(self, priority):
+        return [channel_id for p, channel_id in self.jobs if p is priority]
+
+
+def make_engine(**overrides):
+    config = HeartbeatConfig(**{"response_chance": 0.0, "spontaneous_chance": 0.0, **overrides})
+    executor = RecordingExecutor()
+    engine = HeartbeatEngine(
+        client=None, config=config, executor=executor,
+        on_should_respond=lambda pending: None, on_spontaneous=lambda channel: None,
+    )
+    return engine, executor
+
+
+async def quiet_channels(engine, guild, count):
+    """Channels that had chatter on the last beat and are quiet now."""
+    channels = [FakeChannel(5000 + n, f"quiet-{n}", guild) for n in range(count)]
+    for channel in channels:
+        engine.queue_message(make_message(channel, 0))
+    await engine._process_heartbeat()
+    return channels
+
+
+async def test_mention_always_responds(guild, channel):
+    engine, executor = make_engine()
+    engine.queue_message(make_message(channel, 0), is_mention=True)
+    engine._process_mentions()
+    assert executor.of(JobPriority.MENTION) == [channel.id]
+
+
+async def test_mention_is_pending_until_the_reply_is_sent(channel):
+    sent = asyncio.Event()
+    replied = []
+
+    async def reply(pending):
+        await sent.wait()
+        replied.append(pending)
+
+    executor = ResponseExecutor()
+    engine = HeartbeatEngine(
+        client=None, config=HeartbeatConfig(), executor=executor,
+        on_should_respond=reply, on_spontaneous=lambda channel: None,
+    )
+    executor.start()
+    try:
+        assert not engine.has_pending_mention
+        engine.queue_message(make_message(channel, 0), is_mention=True)
+        assert engine.has_pending_mention
+
+        # Decided and handed to the executor - still pending while it runs
+        engine._process_mentions()
+        await asyncio.sleep(0.01)
+        assert executor.in_flight == 1
+        assert engine.has_pending_mention
+
+        sent.set()
+        await asyncio.sleep(0.01)
+        assert replied
+        assert not engine.has_pending_mention
+    finally:
+        await executor.stop(drain=False)
+
+
+async def test_spontaneous_is_one_roll_per_beat(guild):
+    engine, executor = make_engine()
+    await quiet_channels(engine, guild, 20)
+    engine.config.spontaneous_chance = 1.0
+
+    await engine._process_heartbeat()
+    assert len(executor.of(JobPriority.SPONTANEOUS)) == 1
+
+
+async def test_spontaneous_channel_cools_down(guild):
+    engine, executor = make_engine(spontaneous_cooldown_seconds=300.0)
+    [channel] = await quiet_channels(engine, guild, 1)
+    engine.config.spontaneous_chance = 1.0
+
+    for _ in range(5):
+        await engine._process_heartbeat()
+    assert executor.of(JobPriority.SPONTANEOUS) == [channel.id]
+
+    state = engine._channels[channel.id]
+    state.last_spontaneous -= timedelta(seconds=301)
+    await engine._process_heartbeat()
+    assert executor.of(JobPriority.SPONTANEOUS) == [channel.id, channel.id]
+
+
+async def test_long_idle_channels_are_forgotten(guild):
+    engine, executor = make_engine(spontaneous_window_seconds=60.0)
+    [channel] = await quiet_channels(engine, guild, 1)
+    engine._channels[channel.id].last_activity -= timedelta(seconds=61)
+    engine.config.spontaneous_chance = 1.0
+
+    await engine._process_heartbeat()
+    assert channel.id not in engine._channels
+    assert executor.of(JobPriority.SPONTANEOUS) == []
+
+
+async def test_quiet_channels_keep_decaying(guild):
+    engine, executor = make_engine(engagement_decay_amount=0.15, engagement_decay_seconds=30.0)
+    [channel] = await quiet_channels(engine, guild, 1)
+    state = engine._channels[channel.id]
+    state.engagement_boost = 0.45
+    state.last_decay_time -= timedelta(seconds=61)
+
+    await engine._process_heartbeat()
+    assert state.engagement_boost == pytest.approx(0.15)
+    assert engine.effective_response_chance(channel.id) == pytest.approx(0.15)
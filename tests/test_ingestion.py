@@ -0,0 +1,94 @@
+"""Write-behind ingestion: batching, coalescing, retries and shutdown."""
+
+from contextlib import asynccontextmanager
+
+import pytest
+from helpers import make_message, make_user
+
+from discord_puppy.memory.ingestion import IngestionConfig, IngestionQueue
+
+
+class FlakyManager:
+    """Fails the first `failures` writer transactions, then behaves."""
+
+    def __init__(self, manager, failures):
+        self.manager = manager
+        self.failures = failures
+
+    @asynccontextmanager
+    async def writer(self, op="other"):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        async with self.manager.writer(op) as conn:
+            yield conn
+
+
+async def count(brain, sql, *params):
+    async with brain.reader() as conn:
+        cursor = await conn.execute(sql, params)
+        return (await cursor.fetchone())[0]
+
+
+async def test_batch_coalesces_users(brain, channel):
+    author = make_user(1)
+    ingestion = IngestionQueue()
+    for seq in range(5):
+        ingestion.submit(make_message(channel, seq, author=author))
+
+    assert await ingestion.flush() == 5
+    assert ingestion.stats()["batches"] == 1
+    assert await count(brain, "SELECT interaction_count FROM user_notes WHERE user_id = ?", str(author.id)) == 4
+    assert await count(brain, "SELECT COUNT(*) FROM indexed_messages") == 5
+
+
+async def test_duplicates_are_skipped(brain, channel):
+    message = make_message(channel, 0)
+    ingestion = IngestionQueue()
+    ingestion.submit(message)
+    ingestion.submit(message)
+    assert await ingestion.flush() == 1
+
+
+async def test_failed_batch_is_retried(brain, channel):
+    ingestion = IngestionQueue(manager=FlakyManager(brain, failures=1))
+    for seq in range(3):
+        ingestion.submit(make_message(channel, seq))
+
+    with pytest.raises(RuntimeError):
+        await ingestion.flush()
+    assert ingestion.backlog == 3
+
+    assert await ingestion.flush() == 3
+    stats = ingestion.stats()
+    assert (stats["failed_batches"], stats["retried"], stats["dropped"]) == (1, 3, 0)
+
+
+async def test_messages_out_of_attempts_are_dropped(brain, channel):
+    ingestion = IngestionQueue(IngestionConfig(max_retries=2), manager=FlakyManager(brain, failures=10))
+    ingestion.submit(make_message(channel, 0))
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await ingestion.flush()
+    assert ingestion.backlog == 0
+    assert ingestion.stats()["dropped"] == 1
+
+
+async def test_stop_flushes_and_never_raises(brain, channel):
+    ingestion = IngestionQueue(IngestionConfig(flush_interval_seconds=60), manager=FlakyManager(brain, failures=2))
+    ingestion.start()
+    for seq in range(4):
+        ingestion.submit(make_message(channel, seq))
+
+    await ingestion.stop()
+    assert ingestion.backlog == 0
+    assert await count(brain, "SELECT COUNT(*) FROM indexed_messages") == 4
+
+
+async def test_backlog_is_bounded(brain, channel):
+    ingestion = IngestionQueue(IngestionConfig(max_pending=2))
+    for seq in range(5):
+        ingestion.submit(make_message(channel, seq))
+    assert ingestion.backlog == 2
+    assert ingestion.stats()["dropped"] == 3
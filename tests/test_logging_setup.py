@@ -0,0 +1,69 @@
+"""The queued logging pipeline: record preparation, drops and rate limits."""
+
+import io
+import logging
+import queue
+import sys
+
+from discord_puppy.logging_setup import (
+    LoggingConfig,
+    NonBlockingQueueHandler,
+    RateLimit,
+    RateLimitFilter,
+    setup_logging,
+)
+
+
+def record(msg, *args, exc_info=None):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+def test_prepare_renders_message_at_log_time():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    channels = ["#general"]
+    prepared = handler.prepare(record("watching %s", channels))
+    channels.append("#random")
+
+    assert prepared.msg == "watching ['#general']"
+    assert prepared.args is None
+    assert prepared.getMessage() == "watching ['#general']"
+
+
+def test_prepare_keeps_traceback_text():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        prepared = handler.prepare(record("failed", exc_info=sys.exc_info()))
+
+    assert prepared.exc_info is None
+    assert "ValueError: boom" in prepared.exc_text
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(record("one"))
+    handler.handle(record("two"))
+    assert handler.dropped == 1
+
+
+def test_rate_limit_reports_suppressed_count():
+    limited = RateLimitFilter(RateLimit(per_second=0.0, burst=2))
+    passed = [limited.filter(record("rolled %d", n)) for n in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert limited.suppressed == 3
+
+    limited._buckets["rolled %d"][0] = 1.0  # Refill one token
+    late = record("rolled %d", 9)
+    assert limited.filter(late)
+    assert late.getMessage() == "rolled 9 (3 similar suppressed)"
+
+
+def test_pipeline_writes_through_the_queue():
+    stream = io.StringIO()
+    pipeline = setup_logging(LoggingConfig(format="%(name)s %(message)s", stream=stream))
+    try:
+        logging.getLogger("discord_puppy.test").info("hello %s", "puppy")
+    finally:
+        pipeline.stop()
+    assert "discord_puppy.test hello puppy" in stream.getvalue()
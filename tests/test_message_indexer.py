@@ -0,0 +1,67 @@
+"""Backfill watermarks and how live ingestion interacts with them."""
+
+from helpers import make_message
+
+from discord_puppy.memory.ingestion import IngestionQueue
+from discord_puppy.memory.message_indexer import get_channel_watermark, index_channel_history
+from discord_puppy.memory.user_cache import UserMemoryCache, set_user_memory_cache
+
+
+def post(channel, seqs):
+    messages = [make_message(channel, seq, minutes_ago=30 - seq) for seq in seqs]
+    channel.messages.extend(messages)
+    return messages
+
+
+async def test_backfill_resumes_after_watermark(brain, channel):
+    post(channel, range(5))
+    first = await index_channel_history(channel, limit=None)
+    assert first["new_messages"] == 5
+
+    post(channel, range(5, 8))
+    second = await index_channel_history(channel, limit=None)
+    assert second["new_messages"] == 3
+    assert second["total_processed"] == 3
+
+
+async def test_live_ingestion_does_not_skip_offline_messages(brain, channel):
+    post(channel, range(5))
+    await index_channel_history(channel, limit=None)
+    async with brain.reader() as conn:
+        watermark = await get_channel_watermark(conn, str(channel.id))
+
+    # Posted while the bot was offline, then one live message after restart
+    post(channel, range(5, 10))
+    [live] = post(channel, [10])
+    ingestion = IngestionQueue()
+    ingestion.submit(live)
+    await ingestion.flush()
+
+    async with brain.reader() as conn:
+        assert await get_channel_watermark(conn, str(channel.id)) == watermark
+
+    stats = await index_channel_history(channel, limit=None)
+    assert stats["new_messages"] == 5       # The offline ones
+    assert stats["skipped_messages"] == 1   # The live one, already ingested
+
+
+async def test_backfill_invalidates_user_cache_after_commit(brain, channel):
+    class CommitCheckingCache(UserMemoryCache):
+        def users_upserted(self, rows):
+            rows = list(rows)
+            seen.append((brain._writer.in_transaction, [row[0] for row in rows]))
+            super().users_upserted(rows)
+
+    seen = []
+    set_user_memory_cache(CommitCheckingCache())
+    try:
+        post(channel, range(3))
+        await index_channel_history(channel, limit=None)
+    finally:
+        set_user_memory_cache(None)
+
+    assert seen
+    assert all(not in_transaction for in_transaction, _ in seen)
+    assert {user_id for _, user_ids in seen for user_id in user_ids} == {
+        str(m.author.id) for m in channel.messages
+    }
@@ -0,0 +1,42 @@
+"""discord.py rate limit counting."""
+
+import logging
+
+import pytest
+
+from discord_puppy.metrics import DISCORD_RATE_LIMITS, count_discord_rate_limits
+
+
+@pytest.fixture
+def http_logger():
+    http_logger = logging.getLogger("test.discord.http")
+    http_logger.setLevel(logging.INFO)
+    http_logger.propagate = False
+    yield http_logger
+    http_logger.filters.clear()
+    http_logger.handlers.clear()
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_counts_debug_waits_without_logging_them(http_logger):
+    output = Collect()
+    http_logger.addHandler(output)
+    count_discord_rate_limits("test.discord.http")
+    preemptive = DISCORD_RATE_LIMITS.labels("preemptive")
+    limited = DISCORD_RATE_LIMITS.labels("429")
+    before = preemptive.value, limited.value
+
+    http_logger.debug("A rate limit bucket (%s) has been exhausted. Pre-emptively rate limiting...", "x")
+    http_logger.warning("We are being rate limited. %s %s responded with 429.", "POST", "/x")
+    http_logger.debug("GET /x has returned 200")
+
+    assert (preemptive.value, limited.value) == (before[0] + 1, before[1] + 1)
+    assert [r.levelno for r in output.records] == [logging.WARNING]
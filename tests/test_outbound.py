@@ -0,0 +1,142 @@
+"""Outbound scheduler: priorities, budgets, status merging and drops."""
+
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from discord_puppy.outbound import OutboundConfig, OutboundScheduler, SendKind
+
+
+@pytest.fixture
+def make_scheduler(stop_after):
+    def make(**overrides) -> OutboundScheduler:
+        scheduler = stop_after(OutboundScheduler(OutboundConfig(**overrides)))
+        scheduler.start()
+        return scheduler
+
+    return make
+
+
+def contents(channel) -> list[str]:
+    return [message.content for message in channel.messages]
+
+
+async def test_sends_in_priority_order(make_scheduler, channel):
+    outbound = make_scheduler()
+    futures = [
+        outbound.submit(channel, "status", SendKind.STATUS),
+        outbound.submit(channel, "spontaneous", SendKind.SPONTANEOUS),
+        outbound.submit(channel, "reply", SendKind.REPLY),
+    ]
+    await asyncio.gather(*futures)
+    assert contents(channel) == ["reply", "spontaneous", "status"]
+
+
+async def test_channel_budget_paces_sends(make_scheduler, channel):
+    outbound = make_scheduler(channel_burst=2, channel_window_seconds=0.2)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(*(outbound.submit(channel, str(n)) for n in range(4)))
+
+    assert loop.time() - started >= 0.2
+    assert outbound.stats()["throttled_seconds"] > 0
+    assert contents(channel) == ["0", "1", "2", "3"]
+
+
+async def test_queued_status_updates_merge(make_scheduler, channel):
+    outbound = make_scheduler()
+    first = outbound.submit(channel, "sniffing...", SendKind.STATUS, run_id=1)
+    second = outbound.submit(channel, "still sniffing...", SendKind.STATUS, run_id=1)
+    other = outbound.submit(channel, "other run", SendKind.STATUS, run_id=2)
+
+    assert first is second
+    await asyncio.gather(first, other)
+    assert contents(channel) == ["sniffing...\nstill sniffing...", "other run"]
+
+
+async def test_recent_status_message_is_edited(make_scheduler, channel):
+    outbound = make_scheduler()
+    await outbound.send(channel, "sniffing...", SendKind.STATUS, run_id=1)
+    await outbound.send(channel, "found it", SendKind.STATUS, run_id=1)
+
+    assert channel.sent == 1
+    assert channel.edited == 1
+    assert contents(channel) == ["sniffing...\nfound it"]
+
+
+async def test_reply_drops_the_runs_queued_status(make_scheduler, channel):
+    outbound = make_scheduler()
+    status = outbound.submit(channel, "still looking...", SendKind.STATUS, run_id=1)
+    other = outbound.submit(channel, "other run", SendKind.STATUS, run_id=2)
+    reply = outbound.submit(channel, "here you go", SendKind.REPLY, run_id=1)
+
+    await asyncio.gather(reply, other)
+    with pytest.raises(RuntimeError):
+        await status
+    assert contents(channel) == ["here you go", "other run"]
+    assert outbound.stats()["kinds"]["status"]["dropped"] == 1
+
+
+async def test_reply_stops_edits_of_the_runs_status(make_scheduler, channel):
+    outbound = make_scheduler()
+    await outbound.send(channel, "looking...", SendKind.STATUS, run_id=1)
+    await outbound.send(channel, "found it", SendKind.REPLY, run_id=1)
+    await outbound.send(channel, "late status", SendKind.STATUS, run_id=1)
+
+    assert channel.edited == 0
+    assert contents(channel) == ["looking...", "found it", "late status"]
+
+
+async def test_stale_status_is_dropped(make_scheduler, channel):
+    outbound = make_scheduler(
+        channel_burst=1, channel_window_seconds=0.1, status_deadline_seconds=0.01,
+    )
+    reply = outbound.submit(channel, "reply", SendKind.REPLY)
+    status = outbound.submit(channel, "status", SendKind.STATUS)
+
+    await reply
+    with pytest.raises(asyncio.TimeoutError):
+        await status
+    assert contents(channel) == ["reply"]
+
+
+async def test_full_queue_evicts_least_urgent(make_scheduler, channel):
+    outbound = make_scheduler(max_queue_per_channel=2)
+    status = outbound.submit(channel, "status", SendKind.STATUS)
+    first = outbound.submit(channel, "first", SendKind.REPLY)
+    second = outbound.submit(channel, "second", SendKind.REPLY)
+    late_status = outbound.submit(channel, "late status", SendKind.STATUS)
+
+    await asyncio.gather(first, second)
+    for dropped in (status, late_status):
+        with pytest.raises(RuntimeError):
+            await dropped
+    assert contents(channel) == ["first", "second"]
+
+
+async def test_429_pauses_the_channel(make_scheduler, channel):
+    outbound = make_scheduler(channel_window_seconds=0.2)
+    real_send = channel.send
+    calls = []
+
+    async def send(content, reference=None):
+        calls.append(asyncio.get_running_loop().time())
+        if len(calls) == 1:
+            raise discord.HTTPException(SimpleNamespace(status=429, reason="Too Many Requests"), "slow down")
+        return await real_send(content, reference=reference)
+
+    channel.send = send
+    with pytest.raises(discord.HTTPException):
+        await outbound.send(channel, "first")
+    await outbound.send(channel, "second")
+
+    assert calls[1] - calls[0] >= 0.2
+    assert outbound.stats()["kinds"]["reply"]["failed"] == 1
+
+
+async def test_rejects_sends_when_stopped(channel):
+    outbound = OutboundScheduler()
+    with pytest.raises(RuntimeError):
+        await outbound.send(channel, "woof")
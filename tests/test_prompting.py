@@ -0,0 +1,80 @@
+"""Prompt building within a token budget."""
+
+from discord_puppy.metrics import get_metrics_registry
+from discord_puppy.prompting import (
+    PromptBudget,
+    PromptBuilder,
+    PromptMessage,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+
+
+def rendered(sample: str) -> float:
+    """A sample's value from the metrics page."""
+    for line in get_metrics_registry().render().splitlines():
+        name, _, value = line.partition(" ")
+        if name == sample:
+            return float(value)
+    raise AssertionError(f"{sample} not rendered")
+
+
+def messages(start, count, words=5, mention_at=None):
+    return [
+        PromptMessage(id=n, author=f"user{n}", content=" ".join([f"word{n}"] * words), is_mention=n == mention_at)
+        for n in range(start, start + count)
+    ]
+
+
+def test_truncate_marks_the_cut():
+    text = "x" * 400
+    cut = truncate_to_tokens(text, 10)
+    assert cut.endswith("...")
+    assert estimate_tokens(cut) <= 10
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_everything_fits_in_reading_order():
+    builder = PromptBuilder()
+    built = builder.build(
+        "[Channel: #general]", "Respond to:",
+        pending=messages(10, 2), history=messages(0, 3), user_memory=["user10: likes cats"],
+    )
+    lines = built.text.splitlines()
+    assert lines.index("user0: " + " ".join(["word0"] * 5)) < lines.index("Respond to:")
+    assert lines[-2:] == ["user10: " + " ".join(["word10"] * 5), "user11: " + " ".join(["word11"] * 5)]
+    assert "user10: likes cats" in lines
+    assert not any(built.dropped.values())
+
+
+def test_budget_drops_oldest_history_first_and_keeps_mentions():
+    budget = PromptBudget(max_tokens=120, max_message_tokens=20)
+    pending = messages(100, 6, words=8, mention_at=100)
+    built = PromptBuilder(budget).build("[Channel]", "Respond to:", pending=pending, history=messages(0, 10, words=8))
+
+    assert built.tokens <= budget.max_tokens
+    assert built.included["mentions"] == 1
+    assert built.dropped["history"] > 0
+    # Whatever history made it in is the newest, with no gaps
+    kept = [n for n in range(10) if f"user{n}: " in built.text]
+    assert kept == list(range(10 - len(kept), 10))
+
+
+def test_same_input_same_prompt():
+    args = ("[Channel]", "Respond to:")
+    kwargs = {"pending": messages(50, 5, words=40), "history": messages(0, 20, words=40)}
+    budget = PromptBudget(max_tokens=300)
+    assert PromptBuilder(budget).build(*args, **kwargs).text == PromptBuilder(budget).build(*args, **kwargs).text
+
+
+def test_prompt_sizes_are_recorded():
+    builder = PromptBuilder(PromptBudget(max_tokens=60))
+    before = rendered("puppy_prompt_tokens_count"), rendered("puppy_prompts_trimmed_total")
+    builder.build("[Channel]", "Respond to:", pending=messages(0, 1))
+    builder.build("[Channel]", "Respond to:", pending=messages(0, 30))
+
+    stats = builder.stats()
+    assert rendered("puppy_prompt_tokens_count") == before[0] + 2
+    assert rendered("puppy_prompts_trimmed_total") == before[1] + 1
+    assert stats["prompts"] == 2
+    assert stats["trimmed"] == 1
@@ -0,0 +1,157 @@
+"""Every memory tool query stays on an index.
+
+Each tool runs against a seeded brain while SQLite's trace hook records
+the statements it executes. Every recorded statement then goes through
+EXPLAIN QUERY PLAN, and the test fails on:
+
+- a full table scan ("SCAN <table>" with no index)
+- a sort spilled to a temp B-tree ("USE TEMP B-TREE FOR ...")
+
+Walking an index in order ("SCAN ... USING INDEX") is fine - every tool
+query that does it has a LIMIT. Scans of materialized subqueries and of
+FTS5 virtual tables (which use their own index) are fine too.
+
+Because the statements are captured from the real tool code, a new tool
+query or a dropped index shows up here without anyone listing it.
+"""
+
+import re
+
+import pytest
+
+from benchmarks.scenarios import collect_memory_tools, tool_scenarios
+from benchmarks.synthetic import USER_ID_BASE
+from discord_puppy.memory.database import (
+    ConnectionConfig,
+    close_connection_manager,
+    configure_connection_manager,
+    get_connection_manager,
+    init_database,
+    upsert_users,
+)
+from discord_puppy.memory.user_cache import load_user_memories
+from discord_puppy.memory.user_notes import add_user_note
+from discord_puppy.tools.memory_tools import get_recent_messages_standalone
+
+# Statements worth planning (skip PRAGMAs, transaction control, DDL)
+PLANNABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+# FTS5's own bookkeeping on its shadow tables (e.g. 'main'.'messages_fts_config')
+FTS_INTERNAL = re.compile(r"'main'\.'\w+_(config|data|idx|docsize|content)'")
+SCAN = re.compile(r"^SCAN (\S+)(.*)$")
+SUBQUERY = re.compile(r"^(?:MATERIALIZE|CO-ROUTINE) (\S+)")
+
+
+def plan_problems(details: list[str]) -> list[str]:
+    """The EXPLAIN QUERY PLAN steps (detail column, in order) that are regressions."""
+    subqueries = {m.group(1) for m in map(SUBQUERY.match, details) if m}
+    problems = []
+    for detail in details:
+        if "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+            continue
+        scan = SCAN.match(detail)
+        if scan is None:
+            continue
+        name, rest = scan.groups()
+        if "USING" in rest or "VIRTUAL TABLE" in rest or name in subqueries or name.startswith("("):
+            continue
+        problems.append(detail)
+    return problems
+
+
+async def seed_brain(conn, users: int = 500, channels: int = 10, messages: int = 5000) -> None:
+    """Synthetic users, messages and notes in the scenarios' naming scheme."""
+    await upsert_users(conn, [
+        (str(USER_ID_BASE + i), f"user{i}", f"User Number {i}", "curious", 1 + i % 7,
+         f"2024-01-{1 + i % 28:02d}T00:00:00+00:00")
+        for i in range(users)
+    ])
+    await conn.executemany("""
+        INSERT INTO indexed_messages (
+            message_hash, message_id, channel_id, guild_id, user_id,
+            content_preview, message_timestamp
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (
+            f"seed-{i}", str(i), str(i % channels), "1", str(USER_ID_BASE + i % users),
+            f"message {i} about puppies and {'cats' if i % 3 else 'dogs'}",
+            f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:00:00+00:00",
+        )
+        for i in range(messages)
+    ])
+    for i in range(0, users, 5):
+        await add_user_note(conn, str(USER_ID_BASE + i), f"likes topic {i}", importance=1 + i % 5)
+
+
+async def load_memories():
+    async with get_connection_manager().reader() as conn:
+        return await load_user_memories(conn, [str(USER_ID_BASE + i) for i in range(0, 50, 5)])
+
+
+def scenarios() -> list[tuple[str, object]]:
+    return tool_scenarios(collect_memory_tools()) + [
+        ("get_recent_messages_standalone", lambda: get_recent_messages_standalone(10)),
+        ("prompt user memory", load_memories),
+    ]
+
+
+SCENARIOS = dict(scenarios())
+
+
+@pytest.fixture
+async def seeded_brain(tmp_path):
+    """A seeded brain with a single reader, so every connection can be traced."""
+    manager = await configure_connection_manager(
+        ConnectionConfig(db_path=tmp_path / "brain.db", read_pool_size=1)
+    )
+    await init_database()
+    async with manager.writer() as conn:
+        await seed_brain(conn)
+    yield manager
+    await close_connection_manager()
+
+
+async def traced(manager, run) -> tuple[object, list[str]]:
+    """Run a scenario, returning its result and every statement it executed."""
+    captured: list[str] = []
+    async with manager.writer() as conn:
+        await conn.set_trace_callback(captured.append)
+    async with manager.reader() as conn:
+        await conn.set_trace_callback(captured.append)
+    try:
+        result = await run()
+    finally:
+        async with manager.writer() as conn:
+            await conn.set_trace_callback(None)
+        async with manager.reader() as conn:
+            await conn.set_trace_callback(None)
+    statements = [sql for sql in captured if PLANNABLE.match(sql) and not FTS_INTERNAL.search(sql)]
+    return result, statements
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+async def test_tool_queries_use_indexes(seeded_brain, name):
+    result, statements = await traced(seeded_brain, SCENARIOS[name])
+    if isinstance(result, dict):
+        assert result.get("success") is not False, result.get("error")
+
+    problems = []
+    async with seeded_brain.reader() as conn:
+        for sql in statements:
+            cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}")
+            details = [row[3] for row in await cursor.fetchall()]
+            problems.extend(f"{detail}: {' '.join(sql.split())[:200]}" for detail in plan_problems(details))
+    assert not problems
+
+
+def test_plan_problems_flags_scans_and_temp_sorts():
+    assert plan_problems(["SCAN indexed_messages"]) == ["SCAN indexed_messages"]
+    assert plan_problems(["USE TEMP B-TREE FOR ORDER BY"]) == ["USE TEMP B-TREE FOR ORDER BY"]
+    assert plan_problems([
+        "SCAN indexed_messages USING INDEX idx_messages_time",
+        "SCAN messages_fts VIRTUAL TABLE INDEX 0:M1",
+        "CO-ROUTINE hits",
+        "SCAN hits",
+        "SCAN (subquery-1)",
+    ]) == []
@@ -0,0 +1,103 @@
+"""Response executor: priorities, deadlines, concurrency caps and shutdown."""
+
+import asyncio
+
+import pytest
+
+from discord_puppy.response_executor import ExecutorConfig, JobPriority, ResponseExecutor
+
+
+@pytest.fixture
+def make_executor(stop_after):
+    def make(**overrides) -> ResponseExecutor:
+        return stop_after(ResponseExecutor(ExecutorConfig(**overrides)))
+
+    return make
+
+
+def job(log, name, seconds=0.0):
+    async def run():
+        log.append(name)
+        await asyncio.sleep(seconds)
+    return run
+
+
+async def test_runs_by_priority_then_arrival(make_executor):
+    executor = make_executor(max_concurrency=1)
+    log = []
+    executor.submit(JobPriority.SPONTANEOUS, 1, job(log, "spontaneous"))
+    executor.submit(JobPriority.RESPONSE, 2, job(log, "response 1"))
+    executor.submit(JobPriority.MENTION, 3, job(log, "mention"))
+    executor.submit(JobPriority.RESPONSE, 4, job(log, "response 2"))
+    executor.start()
+    await executor.stop(drain=True)
+
+    assert log == ["mention", "response 1", "response 2", "spontaneous"]
+
+
+async def test_stale_jobs_are_dropped(make_executor):
+    executor = make_executor(max_concurrency=1)
+    log = []
+    executor.submit(JobPriority.RESPONSE, 1, job(log, "slow", 0.1))
+    executor.submit(JobPriority.RESPONSE, 2, job(log, "stale"), deadline_seconds=0.05)
+    executor.start()
+    await executor.stop(drain=True)
+
+    assert log == ["slow"]
+    assert executor.stats()["dropped_expired"] == 1
+
+
+async def test_one_job_per_channel_at_a_time(make_executor):
+    executor = make_executor(max_concurrency=4, per_channel_concurrency=1)
+    running = {1: 0, 2: 0}
+    peak = {1: 0, 2: 0}
+
+    def tracked(channel_id):
+        async def run():
+            running[channel_id] += 1
+            peak[channel_id] = max(peak[channel_id], running[channel_id])
+            await asyncio.sleep(0.02)
+            running[channel_id] -= 1
+        return run
+
+    executor.start()
+    for _ in range(3):
+        executor.submit(JobPriority.RESPONSE, 1, tracked(1))
+        executor.submit(JobPriority.RESPONSE, 2, tracked(2))
+    await executor.stop(drain=True)
+
+    assert peak == {1: 1, 2: 1}
+    assert executor.stats()["completed"] == 6
+
+
+async def test_full_queue_evicts_least_urgent(make_executor):
+    executor = make_executor(max_queue_size=2)
+    log = []
+    assert executor.submit(JobPriority.SPONTANEOUS, 1, job(log, "spontaneous"))
+    assert executor.submit(JobPriority.RESPONSE, 2, job(log, "response"))
+    assert executor.submit(JobPriority.MENTION, 3, job(log, "mention"))
+    assert not executor.submit(JobPriority.SPONTANEOUS, 4, job(log, "late spontaneous"))
+    executor.start()
+    await executor.stop(drain=True)
+
+    assert log == ["mention", "response"]
+    assert executor.stats()["dropped_full"] == 2
+
+
+async def test_runs_over_the_limit_time_out(make_executor):
+    executor = make_executor(max_run_seconds=0.05)
+    executor.start()
+    executor.submit(JobPriority.RESPONSE, 1, job([], "hangs", 10.0))
+    await executor.stop(drain=True, timeout=1.0)
+    assert executor.stats()["timed_out"] == 1
+
+
+async def test_stop_without_drain_cancels(make_executor):
+    executor = make_executor()
+    executor.start()
+    executor.submit(JobPriority.RESPONSE, 1, job([], "hangs", 10.0))
+    await asyncio.sleep(0)
+    await executor.stop(drain=False)
+
+    assert executor.in_flight == 0
+    assert not executor.submit(JobPriority.MENTION, 1, job([], "too late"))
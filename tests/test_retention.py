@@ -0,0 +1,109 @@
+"""Retention: age and row policies, archiving and incremental vacuum."""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from discord_puppy.memory.database import upsert_users
+from discord_puppy.memory.retention import (
+    RetentionConfig,
+    RetentionEngine,
+    RetentionPolicy,
+    compress_content,
+    decompress_content,
+)
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+async def seed(brain, channel_id, days_old, guild_id="1", text="woof " * 50):
+    """One message per entry in days_old, in channel_id."""
+    async with brain.writer() as conn:
+        await upsert_users(conn, [("42", "user", "User", "curious", 1, "2024-01-01 00:00:00")])
+        await conn.executemany("""
+            INSERT INTO indexed_messages (
+                message_hash, message_id, channel_id, guild_id, user_id,
+                content_preview, message_timestamp
+            )
+            VALUES (?, ?, ?, ?, '42', ?, ?)
+        """, [
+            (f"{channel_id}-{n}", f"{channel_id}{n}", channel_id, guild_id,
+             f"{text}{n}", (NOW - timedelta(days=days)).isoformat())
+            for n, days in enumerate(days_old)
+        ])
+
+
+async def remaining(brain, channel_id):
+    async with brain.reader() as conn:
+        cursor = await conn.execute(
+            "SELECT message_hash FROM indexed_messages WHERE channel_id = ? ORDER BY message_timestamp",
+            (channel_id,),
+        )
+        return [row[0] for row in await cursor.fetchall()]
+
+
+def test_compression_round_trip():
+    text = "puppies " * 100
+    blob = compress_content(text)
+    assert len(blob) < len(text)
+    assert decompress_content(blob) == text
+    assert compress_content(None) is None and decompress_content(None) is None
+
+
+async def test_old_messages_move_to_the_archive(brain):
+    await seed(brain, "10", [200, 100, 5, 1])
+    engine = RetentionEngine(RetentionConfig(default=RetentionPolicy(max_age_days=90, max_rows=None)))
+
+    assert (await engine.run_once(NOW))["moved"] == 2
+    assert await remaining(brain, "10") == ["10-2", "10-3"]
+
+    with sqlite3.connect(engine.archive_path) as archive:
+        rows = archive.execute(
+            "SELECT message_hash, content_zlib FROM archived_messages ORDER BY message_timestamp"
+        ).fetchall()
+    assert [row[0] for row in rows] == ["10-0", "10-1"]
+    assert decompress_content(rows[0][1]).endswith("woof 0")
+
+    # Nothing left to do - a second pass is a no-op
+    assert (await engine.run_once(NOW))["moved"] == 0
+
+
+async def test_row_cap_and_overrides(brain):
+    await seed(brain, "10", [5, 4, 3, 2, 1])
+    await seed(brain, "20", [5, 4, 3, 2, 1])
+    await seed(brain, "30", [5, 4, 3, 2, 1], guild_id="2")
+    engine = RetentionEngine(RetentionConfig(
+        default=RetentionPolicy(max_age_days=None, max_rows=3),
+        channels={"20": RetentionPolicy(max_age_days=None, max_rows=None)},
+        guilds={"2": RetentionPolicy(max_age_days=None, max_rows=1)},
+        batch_size=1,
+    ))
+
+    assert await engine.enforce(NOW) == 6
+    assert await remaining(brain, "10") == ["10-2", "10-3", "10-4"]
+    assert len(await remaining(brain, "20")) == 5
+    assert await remaining(brain, "30") == ["30-4"]
+
+
+async def test_delete_without_archive(brain):
+    await seed(brain, "10", [200, 1])
+    engine = RetentionEngine(RetentionConfig(
+        default=RetentionPolicy(max_age_days=90, max_rows=None), archive=False,
+    ))
+
+    assert await engine.enforce(NOW) == 1
+    assert not engine.archive_path.exists()
+    assert engine.stats()["deleted"] == 1
+
+
+async def test_freed_pages_are_vacuumed(brain):
+    await seed(brain, "10", [200] * 2000 + [1], text="woof " * 200)
+    engine = RetentionEngine(RetentionConfig(
+        default=RetentionPolicy(max_age_days=90, max_rows=None), archive=False,
+    ))
+
+    result = await engine.run_once(NOW)
+    assert result["moved"] == 2000
+    assert result["pages_freed"] > 0
+    async with brain.reader() as conn:
+        cursor = await conn.execute("PRAGMA freelist_count")
+        assert (await cursor.fetchone())[0] == 0
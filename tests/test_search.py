@@ -0,0 +1,144 @@
+"""FTS5 message search: query building, filters, ranking and index sync."""
+
+import pytest
+
+from discord_puppy.memory.search import build_fts_query, search_indexed_messages
+
+USERS = [("101", "alice", "Alice"), ("102", "bob", "Bobby")]
+
+# (message_id, channel_id, user_id, content, timestamp)
+MESSAGES = [
+    ("1", "10", "101", "pizza party tonight", "2024-05-01T12:00:00"),
+    ("2", "10", "102", "the party was great", "2024-05-02T12:00:00"),
+    ("3", "20", "101", "pizzeria down the street", "2024-05-03T12:00:00"),
+    ("4", "20", "102", "cats are better than dogs", "2024-05-04T12:00:00"),
+    ("5", "10", "101", "dogs dogs dogs everywhere", "2024-05-05T12:00:00"),
+    ("6", "20", "102", 'she said "NEAR" the end: a-ok', "2024-05-06T12:00:00"),
+]
+
+
+async def insert(conn, message_id, channel_id, user_id, content, timestamp):
+    await conn.execute(
+        """
+        INSERT INTO indexed_messages (
+            message_hash, message_id, channel_id, guild_id,
+            user_id, content_preview, message_timestamp
+        ) VALUES (?, ?, ?, '1', ?, ?, ?)
+        """,
+        (f"hash-{message_id}", message_id, channel_id, user_id, content, timestamp),
+    )
+
+
+@pytest.fixture
+async def archive(brain):
+    async with brain.writer() as conn:
+        await conn.executemany(
+            "INSERT INTO user_notes (user_id, discord_username, display_name) VALUES (?, ?, ?)",
+            USERS,
+        )
+        for row in MESSAGES:
+            await insert(conn, *row)
+    return brain
+
+
+async def search(manager, query="", **filters):
+    async with manager.reader() as conn:
+        rows = await search_indexed_messages(conn, query, **filters)
+    return [row["content_preview"] for row in rows]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("pizza party", '"pizza" "party"'),
+    ('"pizza party"', '"pizza party"'),
+    ("pizz*", '"pizz"*'),
+    ("cats OR dogs", '"cats" OR "dogs"'),
+    ("OR cats OR", '"cats"'),
+    ("cats OR OR dogs", '"cats" OR "dogs"'),
+    ('say "NEAR"', '"say" "NEAR"'),
+    ("NEAR(cats dogs)", '"NEAR" "cats" "dogs"'),
+    ("channel:general", '"channel" "general"'),
+    ("-dogs +cats ^x {y}", '"dogs" "cats" "x" "y"'),
+    ('unbalanced "quote', '"unbalanced" "quote"'),
+    ('* - : "" ()', ""),
+    ("", ""),
+])
+def test_build_fts_query(query, expected):
+    assert build_fts_query(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    '"', '""', "*", "-", ":", "NEAR", "NEAR(", 'a"b', "col:pizza", "pizza -", "AND", "NOT dogs",
+])
+async def test_special_characters_never_raise(archive, query):
+    await search(archive, query)
+
+
+async def test_plain_terms_match_all_words(archive):
+    assert await search(archive, "pizza party") == ["pizza party tonight"]
+
+
+async def test_phrase_query(archive):
+    assert await search(archive, '"party tonight"') == ["pizza party tonight"]
+    assert await search(archive, '"tonight party"') == []
+
+
+async def test_prefix_query(archive):
+    assert set(await search(archive, "pizz*")) == {"pizza party tonight", "pizzeria down the street"}
+    assert await search(archive, "pizz") == []
+
+
+async def test_or_query(archive):
+    assert set(await search(archive, "cats OR pizzeria")) == {
+        "cats are better than dogs",
+        "pizzeria down the street",
+    }
+
+
+async def test_quoted_syntax_words_are_searched_literally(archive):
+    assert await search(archive, '"NEAR" end:') == ['she said "NEAR" the end: a-ok']
+
+
+async def test_results_are_ranked_by_bm25(archive):
+    # Three mentions of "dogs" beat one in a message of similar length
+    assert await search(archive, "dogs") == ["dogs dogs dogs everywhere", "cats are better than dogs"]
+
+
+async def test_filters(archive):
+    assert await search(archive, "dogs", channel_id="20") == ["cats are better than dogs"]
+    assert set(await search(archive, "party", user="bobby")) == {"the party was great"}
+    assert set(await search(archive, "party", user="101")) == {"pizza party tonight"}
+    assert await search(archive, "party", user="nobody") == []
+    assert await search(archive, "pizz*", since="2024-05-02") == ["pizzeria down the street"]
+    assert await search(archive, "pizz*", until="2024-05-02") == ["pizza party tonight"]
+    assert await search(archive, "", since="2024-05-02", until="2024-05-04") == [
+        "pizzeria down the street",
+        "the party was great",
+    ]
+
+
+async def test_no_terms_falls_back_to_most_recent(archive):
+    assert await search(archive, "*", limit=2) == [
+        'she said "NEAR" the end: a-ok',
+        "dogs dogs dogs everywhere",
+    ]
+
+
+async def test_triggers_keep_the_index_in_sync(archive):
+    async with archive.writer() as conn:
+        await insert(conn, "7", "10", "101", "brand new zeppelin", "2024-05-07T12:00:00")
+    assert await search(archive, "zeppelin") == ["brand new zeppelin"]
+
+    async with archive.writer() as conn:
+        await conn.execute(
+            "UPDATE indexed_messages SET content_preview = 'renamed blimp' WHERE message_id = '7'"
+        )
+    assert await search(archive, "zeppelin") == []
+    assert await search(archive, "blimp") == ["renamed blimp"]
+
+    async with archive.writer() as conn:
+        await conn.execute("DELETE FROM indexed_messages WHERE message_id = '7'")
+    assert await search(archive, "blimp") == []
+
+    # The index itself agrees with its content table
+    async with archive.writer() as conn:
+        await conn.execute("INSERT INTO messages_fts(messages_fts, rank) VALUES ('integrity-check', 1)")
@@ -0,0 +1,73 @@
+"""Per-note storage: top-N reads, note caps and budgeted rollups."""
+
+from discord_puppy.memory.database import ensure_user_exists
+from discord_puppy.memory.user_notes import (
+    MAX_NOTE_CHARS,
+    NotesBudget,
+    add_user_note,
+    rollup_user_notes,
+    top_user_notes,
+)
+
+
+async def add_users(brain, count):
+    async with brain.writer() as conn:
+        for n in range(count):
+            await ensure_user_exists(conn, str(n), f"user{n}", f"User {n}")
+    return [str(n) for n in range(count)]
+
+
+async def test_top_notes_best_first_per_user(brain):
+    user_ids = await add_users(brain, 2)
+    async with brain.writer() as conn:
+        await add_user_note(conn, "0", "likes cats", importance=2)
+        await add_user_note(conn, "0", "allergic to cats", importance=5)
+        await add_user_note(conn, "0", "owns a bike", importance=2)
+        await add_user_note(conn, "1", "plays bass")
+
+    async with brain.reader() as conn:
+        notes = await top_user_notes(conn, user_ids, limit=2)
+
+    assert [n["note"] for n in notes["0"]] == ["allergic to cats", "owns a bike"]
+    assert [n["note"] for n in notes["1"]] == ["plays bass"]
+
+
+async def test_top_notes_handles_many_users(brain):
+    # One compound SELECT term per user used to fail past ~500 users
+    user_ids = await add_users(brain, 1200)
+    async with brain.writer() as conn:
+        for user_id in user_ids:
+            await add_user_note(conn, user_id, f"note for {user_id}")
+
+    async with brain.reader() as conn:
+        notes = await top_user_notes(conn, user_ids, limit=3)
+
+    assert len(notes) == 1200
+    assert all(len(rows) == 1 for rows in notes.values())
+
+
+async def test_add_note_is_capped(brain):
+    await add_users(brain, 1)
+    async with brain.writer() as conn:
+        await add_user_note(conn, "0", "x" * (MAX_NOTE_CHARS * 3))
+    async with brain.reader() as conn:
+        [note] = (await top_user_notes(conn, ["0"]))["0"]
+    assert len(note["note"]) == MAX_NOTE_CHARS
+
+
+async def test_rollup_skips_notes_that_do_not_fit(brain):
+    await add_users(brain, 1)
+    budget = NotesBudget(max_notes=3, max_chars=10_000, keep_notes=1, rollup_max_chars=40)
+    async with brain.writer() as conn:
+        await add_user_note(conn, "0", "short one", importance=2)
+        await add_user_note(conn, "0", "a very long note " * 5, importance=4)
+        await add_user_note(conn, "0", "short two", importance=3)
+        await add_user_note(conn, "0", "the keeper", importance=5)
+        removed = await rollup_user_notes(conn, "0", budget)
+
+    async with brain.reader() as conn:
+        notes = (await top_user_notes(conn, ["0"], limit=10))["0"]
+
+    assert removed == 2
+    assert [n["note"] for n in notes] == ["the keeper", "short two; short one"]
+    assert notes[1]["is_rollup"] == 1
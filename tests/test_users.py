@@ -0,0 +1,71 @@
+"""Resolving what the model called someone to user_notes rows."""
+
+import pytest
+
+from discord_puppy.memory.database import upsert_users
+from discord_puppy.memory.users import resolve_user
+
+DAVE = "123456789012345678"
+DAVID = "223456789012345678"
+OTHER_DAVE = "323456789012345678"
+
+
+@pytest.fixture
+async def people(brain):
+    async with brain.writer() as conn:
+        await upsert_users(conn, [
+            (DAVE, "dave", "Dave the Brave", "curious", 1, "2024-01-02 00:00:00"),
+            (DAVID, "david_codes", "David", "curious", 1, "2024-01-01 00:00:00"),
+            (OTHER_DAVE, "dave2", "dave", "curious", 1, "2024-01-03 00:00:00"),
+        ])
+    return brain
+
+
+async def resolve(brain, query, **kwargs):
+    async with brain.reader() as conn:
+        return await resolve_user(conn, query, **kwargs)
+
+
+async def test_mentions_and_ids_resolve_by_key(people):
+    for query, method in ((f"<@{DAVE}>", "mention"), (f"<@!{DAVE}>", "mention"), (DAVE, "id")):
+        resolution = await resolve(people, query)
+        assert resolution.method == method
+        assert resolution.unique["user_id"] == DAVE
+
+
+async def test_unknown_mention_matches_nobody(people):
+    resolution = await resolve(people, "<@999999999999999999>")
+    assert resolution.method == "none"
+    assert resolution.unique is None
+
+
+async def test_exact_name_is_case_insensitive(people):
+    resolution = await resolve(people, "@DAVID_CODES")
+    assert resolution.method == "exact"
+    assert resolution.unique["user_id"] == DAVID
+
+
+async def test_ambiguous_exact_name_is_not_unique(people):
+    # "dave" is one user's username and another's display name
+    resolution = await resolve(people, "Dave")
+    assert resolution.method == "exact"
+    assert [row["user_id"] for row in resolution.matches] == [OTHER_DAVE, DAVE]
+    assert resolution.unique is None
+
+
+async def test_fuzzy_match_is_never_unique(people):
+    resolution = await resolve(people, "davd_codes")
+    assert resolution.method == "fuzzy"
+    assert resolution.matches[0]["user_id"] == DAVID
+    assert resolution.unique is None
+
+
+async def test_short_queries_use_prefixes(people):
+    resolution = await resolve(people, "Da")
+    assert resolution.method == "fuzzy"
+    assert {row["user_id"] for row in resolution.matches} == {DAVE, DAVID, OTHER_DAVE}
+
+
+async def test_nothing_close_matches_nobody(people):
+    assert (await resolve(people, "zzzzzz")).method == "none"
+    assert (await resolve(people, "   ")).method == "none"